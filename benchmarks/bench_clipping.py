@@ -0,0 +1,74 @@
+"""
+Per frame cost of ObjectRenderer.draw with and without the clipping stage while the window pans over a large scene.
+Every frame moves the window, so every visible drawable is rebuilt.
+
+Runs headless through EGL, Mesa's llvmpipe is enough: python benchmarks/bench_clipping.py
+"""
+import argparse
+import os
+import sys
+import time
+import numpy as np
+import pyglet
+
+pyglet.options['headless'] = True
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from drawable import Line, ObjectRenderer, Wireframe  # noqa: E402
+from event_system import EventSystem  # noqa: E402
+from igs_math import Vector2  # noqa: E402
+from viewport import Viewport  # noqa: E402
+from window import Window  # noqa: E402
+
+
+def build_scene(renderer: ObjectRenderer, objects: int, extent: float, rng: np.random.Generator) -> list:
+    """
+    Mix of long lines and big polygons, most of them cross the window border
+    """
+    drawables = []
+    for i in range(objects):
+        center = rng.uniform(-extent, extent, 2)
+        if i % 2:
+            angles = np.sort(rng.uniform(0, 2 * np.pi, 32))
+            radius = rng.uniform(0.5, 4.0) * extent
+            points = center + np.stack((np.cos(angles), np.sin(angles)), axis=1) * radius
+            drawable = Wireframe(points)
+        else:
+            direction = rng.normal(size=2) * extent * 50
+            drawable = Line(Vector2(*(center - direction)), Vector2(*(center + direction)))
+        renderer.addObject(drawable)
+        drawables.append(drawable)
+    return drawables
+
+
+def run(objects: int, frames: int, clipping: bool) -> float:
+    pyglet_window = pyglet.window.Window(800, 600)
+    window = Window(Vector2(-400, -300), Vector2(400, 300),
+                    Viewport(Vector2(0, 0), Vector2(800, 600)))
+    renderer = ObjectRenderer(window, EventSystem(), clipping=clipping)
+    scene = build_scene(renderer, objects, 400.0, np.random.default_rng(0))
+    pyglet_window.clear()
+    renderer.draw()
+    times = []
+    for frame in range(frames):
+        window.move(Vector2(1.0 if frame % 2 else -1.0, 0.0))
+        start = time.perf_counter()
+        pyglet_window.clear()
+        renderer.draw()
+        pyglet.gl.glFinish()
+        times.append(time.perf_counter() - start)
+    pyglet_window.close()
+    del scene
+    return float(np.median(times))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--objects', type=int, nargs='+', default=[1000, 5000])
+    parser.add_argument('--frames', type=int, default=20)
+    args = parser.parse_args()
+    print(f'{"objects":>8}{"no clipping (ms)":>20}{"clipping (ms)":>16}')
+    for amount in args.objects:
+        off = run(amount, args.frames, False)
+        on = run(amount, args.frames, True)
+        print(f'{amount:>8}{off * 1e3:>20.2f}{on * 1e3:>16.2f}')
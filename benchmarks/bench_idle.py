@@ -0,0 +1,84 @@
+"""
+CPU used by the main window while nothing happens, with damage tracking on and off. The window runs the real event
+loop over a scene of wireframes for --seconds and the CPU time of the process is compared to the wall time.
+
+python benchmarks/bench_idle.py
+"""
+import argparse
+import multiprocessing
+import os
+import sys
+import time
+import numpy as np
+import pyglet
+
+pyglet.options['headless'] = True
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from drawable import ObjectRenderer, Wireframe  # noqa: E402
+from event_system import EventSystem  # noqa: E402
+from igs_math import Vector2  # noqa: E402
+from main_window import MainWindow  # noqa: E402
+from peripheral_manager import PeripheralManager  # noqa: E402
+from profiler import Profiler  # noqa: E402
+from scene_mirror import SceneMirrorWriter  # noqa: E402
+from system import SystemManager  # noqa: E402
+from viewport import Viewport  # noqa: E402
+from window import Window  # noqa: E402
+
+
+def idle_cpu(objects: int, seconds: float) -> dict[bool, tuple[float, float]]:
+    """
+    Fraction of a core used and frames flipped per second while the scene sits still, by damage_tracking value
+    """
+    viewport = Viewport(Vector2(0, 0), Vector2(800, 600))
+    window = Window(Vector2(-400, -300), Vector2(400, 300), viewport)
+    event_system = EventSystem(queued=True)
+    renderer = ObjectRenderer(window, event_system)
+    scene_mirror = SceneMirrorWriter(event_system)
+    _, conn = multiprocessing.Pipe()
+    main_window = MainWindow(800, 600, PeripheralManager(), PeripheralManager(), event_system, viewport, window,
+                             SystemManager(), renderer, scene_mirror, conn, Profiler())
+    angles = np.linspace(0, 2 * np.pi, 8, endpoint=False)
+    ring = np.stack((np.cos(angles), np.sin(angles)), axis=1) * 5
+    renderer.add_many(Wireframe(center + ring) for center in np.random.default_rng(0).uniform(-400, 400, (objects, 2)))
+
+    flips = 0
+    flip = main_window.flip
+
+    def counted_flip():
+        nonlocal flips
+        flips += 1
+        flip()
+
+    main_window.flip = counted_flip
+    # the first second builds the scene and publishes it, only the runs after it are measured
+    pyglet.clock.schedule_once(lambda dt: pyglet.app.exit(), 1.0)
+    pyglet.app.run()
+    results = dict()
+    for damage_tracking in (False, True):
+        main_window.damage_tracking = damage_tracking
+        flips = 0
+        wall, cpu = time.perf_counter(), time.process_time()
+        pyglet.clock.schedule_once(lambda dt: pyglet.app.exit(), seconds)
+        pyglet.app.run()
+        wall, cpu = time.perf_counter() - wall, time.process_time() - cpu
+        results[damage_tracking] = (cpu / wall, flips / wall)
+    main_window.close()
+    scene_mirror.close()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--objects', type=int, default=10_000)
+    parser.add_argument('--seconds', type=float, default=5.0)
+    args = parser.parse_args()
+
+    for damage_tracking, (usage, flips) in idle_cpu(args.objects, args.seconds).items():
+        print(f'damage tracking {"on " if damage_tracking else "off"}: {usage:6.1%} of a core, '
+              f'{flips:5.1f} frames/s flipped')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,123 @@
+"""
+Micro benchmark of the igs_math hot paths against the numpy backed implementation they replaced.
+
+Run from the repository root with: python benchmarks/bench_igs_math.py
+"""
+from __future__ import annotations
+import os
+import sys
+import timeit
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from igs_math import Matrix3x3, Vector2  # noqa: E402
+
+
+class LegacyMatrix3x3:
+
+    def __init__(self):
+        self.identity()
+
+    def identity(self):
+        self.__np_mat: np.ndarray = np.array([[1, 0, 0], [0, 1, 0], [0, 0, 1]])
+
+    def translate(self, offset: LegacyVector2):
+        trans_mat = np.array([[1, 0, 0], [0, 1, 0], [offset.x, offset.y, 1]])
+        self.__np_mat = self.__np_mat @ trans_mat
+
+    def rotate(self, angle: float):
+        cos, sin = np.cos(angle), np.sin(angle)
+        rot_mat = np.array([[cos, -sin, 0], [sin, cos, 0], [0, 0, 1]])
+        self.__np_mat = self.__np_mat @ rot_mat
+
+    def scale(self, scale: LegacyVector2):
+        scale_mat = np.array([[scale.x, 0, 0], [0, scale.y, 0], [0, 0, 1]])
+        self.__np_mat = self.__np_mat @ scale_mat
+
+    def invert(self):
+        self.__np_mat = np.linalg.inv(self.__np_mat)
+
+    @property
+    def np_mat(self) -> np.ndarray:
+        return np.copy(self.__np_mat)
+
+
+class LegacyVector2:
+
+    def __init__(self, x: float, y: float):
+        self.__np_vec: np.ndarray = np.array([[x, y, 1.0]])
+
+    @property
+    def x(self) -> float:
+        return self.__np_vec[0, 0]
+
+    @property
+    def y(self) -> float:
+        return self.__np_vec[0][1]
+
+    def __add__(self, other: LegacyVector2) -> LegacyVector2:
+        return LegacyVector2(self.x + other.x, self.y + other.y)
+
+    def __iadd__(self, other: LegacyVector2) -> LegacyVector2:
+        self.__np_vec += np.array([[other.x, other.y, 0.0]])
+        return self
+
+    def __sub__(self, other: LegacyVector2) -> LegacyVector2:
+        return LegacyVector2(self.x - other.x, self.y - other.y)
+
+    def __mul__(self, other: LegacyMatrix3x3 | float) -> LegacyVector2:
+        if isinstance(other, LegacyMatrix3x3):
+            result = self.__np_vec @ other.np_mat
+        elif isinstance(other, float):
+            result = self.__np_vec * other
+        return LegacyVector2(result[0, 0], result[0, 1])
+
+    def __truediv__(self, other: float) -> LegacyVector2:
+        return LegacyVector2(self.x/other, self.y/other)
+
+
+def legacy_trs(pos, rot, scale):
+    mat = LegacyMatrix3x3()
+    mat.scale(scale)
+    mat.rotate(rot)
+    mat.translate(pos)
+    return mat
+
+
+def build_cases(vec_cls, mat_cls, trs) -> dict[str, callable]:
+    a, b = vec_cls(1.5, -2.0), vec_cls(0.25, 4.0)
+    mat = trs(vec_cls(10.0, 5.0), 0.3, vec_cls(2.0, 2.0))
+    acc = vec_cls(0.0, 0.0)
+
+    def iadd():
+        nonlocal acc
+        acc += a
+
+    return {
+        'vector + vector': lambda: a + b,
+        'vector - vector': lambda: a - b,
+        'vector * float': lambda: a * 2.0,
+        'vector / float': lambda: a / 2.0,
+        'vector += vector': iadd,
+        'vector * matrix': lambda: a * mat,
+        'matrix from t/r/s': lambda: trs(vec_cls(10.0, 5.0), 0.3, vec_cls(2.0, 2.0)),
+        'np_mat access': lambda: mat.np_mat,
+    }
+
+
+def run(number: int = 20000, repeat: int = 5) -> list[tuple[str, float, float]]:
+    legacy = build_cases(LegacyVector2, LegacyMatrix3x3, legacy_trs)
+    current = build_cases(Vector2, Matrix3x3, Matrix3x3.from_trs)
+    results = []
+    for name in legacy:
+        old = min(timeit.repeat(legacy[name], number=number, repeat=repeat)) / number
+        new = min(timeit.repeat(current[name], number=number, repeat=repeat)) / number
+        results.append((name, old, new))
+    return results
+
+
+if __name__ == '__main__':
+    print(f'{"operation":<20}{"legacy (ns)":>14}{"current (ns)":>14}{"speedup":>10}')
+    for name, old, new in run():
+        print(f'{name:<20}{old * 1e9:>14.0f}{new * 1e9:>14.0f}{old / new:>9.1f}x')
@@ -0,0 +1,73 @@
+"""
+Throughput of the pipe between the pyglet window and the control window: the old pickled (Event, DrawableObject)
+tuples, one send per message, against ipc_protocol frames of REMOVE_DRAWALBE messages at a few batch sizes.
+A forked process receives, decodes and acks every send so both ends are measured.
+
+python benchmarks/bench_ipc.py
+"""
+import argparse
+import multiprocessing
+import os
+import sys
+import time
+import pyglet
+
+pyglet.options['headless'] = True
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import ipc_protocol  # noqa: E402
+from drawable import Line  # noqa: E402
+from event_system import Event  # noqa: E402
+from igs_math import Vector2  # noqa: E402
+
+
+def pickled_receiver(conn, sends: int):
+    for _ in range(sends):
+        conn.recv()
+    conn.send(None)
+
+
+def binary_receiver(conn, sends: int):
+    for _ in range(sends):
+        ipc_protocol.decode(conn.recv_bytes())
+    conn.send(None)
+
+
+def run(receiver, sends: int, send) -> float:
+    parent, child = multiprocessing.Pipe()
+    process = multiprocessing.get_context('fork').Process(target=receiver, args=(child, sends))
+    process.start()
+    start = time.perf_counter()
+    send(parent)
+    parent.recv()
+    elapsed = time.perf_counter() - start
+    process.join()
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--messages', type=int, default=20000)
+    args = parser.parse_args()
+
+    drawables = [Line(Vector2(i, 0), Vector2(i, 10)) for i in range(args.messages)]
+
+    def send_pickled(conn):
+        for drawable in drawables:
+            conn.send((Event.REMOVE_DRAWALBE, drawable))
+
+    elapsed = run(pickled_receiver, len(drawables), send_pickled)
+    print(f'pickled          {len(drawables) / elapsed:12.0f} msg/s')
+
+    for batch in (1, 100):
+        def send_binary(conn):
+            for i in range(0, len(drawables), batch):
+                conn.send_bytes(ipc_protocol.encode(
+                    (Event.REMOVE_DRAWALBE, d.id) for d in drawables[i:i + batch]))
+
+        elapsed = run(binary_receiver, -(-len(drawables) // batch), send_binary)
+        print(f'binary batch {batch:<3} {len(drawables) / elapsed:12.0f} msg/s')
+
+
+if __name__ == '__main__':
+    main()
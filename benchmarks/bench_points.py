@@ -0,0 +1,98 @@
+"""
+Frame times of a point cloud drawn by the point layer: the frame that uploads it, idle and panning frames, and frames
+after adding or removing a batch of points. --compare also runs the same scene with a vertex list per point.
+
+python benchmarks/bench_points.py --points 1000000
+"""
+import argparse
+import os
+import sys
+import time
+import numpy as np
+import pyglet
+
+pyglet.options['headless'] = True
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from drawable import DrawableObject, ObjectRenderer, Point  # noqa: E402
+from event_system import EventSystem  # noqa: E402
+from igs_math import Vector2  # noqa: E402
+from viewport import Viewport  # noqa: E402
+from window import Window  # noqa: E402
+
+
+def make_points(amount: int, rng: np.random.Generator) -> list[DrawableObject]:
+    slots = DrawableObject.geometry_buffer.allocate_many(rng.uniform(-400, 400, (amount, 2)), np.ones(amount))
+    return [Point.from_slot(slot) for slot in slots.tolist()]
+
+
+def run(pyglet_window: pyglet.window.Window, amount: int, batch: int, frames: int, point_layer: bool):
+    rng = np.random.default_rng(0)
+    points = make_points(amount, rng)
+    extra = make_points(batch, rng)
+    window = Window(Vector2(-400, -300), Vector2(400, 300), Viewport(Vector2(0, 0), Vector2(800, 600)))
+    renderer = ObjectRenderer(window, EventSystem(), point_layer=point_layer)
+
+    def frame() -> float:
+        start = time.perf_counter()
+        pyglet_window.clear()
+        renderer.draw()
+        pyglet.gl.glFinish()
+        return (time.perf_counter() - start) * 1e3
+
+    def median(function) -> float:
+        return float(np.median([function() for _ in range(frames)]))
+
+    start = time.perf_counter()
+    renderer.add_many(points)
+    add_many = (time.perf_counter() - start) * 1e3
+    first = frame()
+    idle = median(frame)
+
+    def pan() -> float:
+        window.move(Vector2(rng.uniform(-1, 1), 0.0))
+        return frame()
+
+    def add_batch() -> float:
+        renderer.add_many(extra)
+        elapsed = frame()
+        renderer.remove_many(extra)
+        frame()
+        return elapsed
+
+    def remove_batch() -> float:
+        renderer.remove_many(extra)
+        elapsed = frame()
+        renderer.add_many(extra)
+        frame()
+        return elapsed
+
+    panning = median(pan)
+    adding = median(add_batch)
+    renderer.add_many(extra)
+    frame()
+    removing = median(remove_batch)
+    label = 'point layer' if point_layer else 'vertex list per point'
+    print(f'{label}, {amount} points')
+    print(f'  add_many {add_many:9.1f} ms   first frame {first:9.1f} ms')
+    print(f'  idle frame {idle:7.2f} ms   pan frame {panning:7.2f} ms')
+    print(f'  frame after adding {batch} points {adding:7.2f} ms, after removing them {removing:7.2f} ms')
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--points', type=int, default=1_000_000)
+    parser.add_argument('--batch', type=int, default=1000, help='points added and removed between frames')
+    parser.add_argument('--frames', type=int, default=10)
+    parser.add_argument('--compare', action='store_true', help='also draw every point with its own vertex list')
+    args = parser.parse_args()
+
+    pyglet_window = pyglet.window.Window(800, 600)
+    run(pyglet_window, args.points, args.batch, args.frames, True)
+    if args.compare:
+        run(pyglet_window, args.points, args.batch, args.frames, False)
+    pyglet_window.close()
+
+
+if __name__ == '__main__':
+    main()
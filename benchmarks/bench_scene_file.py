@@ -0,0 +1,64 @@
+"""
+Save and load time of a scene file holding 10M vertices spread over polygons, plus the time to hand the loaded
+drawables to an ObjectRenderer.
+
+python benchmarks/bench_scene_file.py
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+import numpy as np
+import pyglet
+
+pyglet.options['headless'] = True
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import scene_file  # noqa: E402
+from drawable import DrawableObject, ObjectRenderer, Wireframe  # noqa: E402
+from event_system import EventSystem  # noqa: E402
+from igs_math import Vector2  # noqa: E402
+from viewport import Viewport  # noqa: E402
+from window import Window  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--vertices', type=int, default=10_000_000)
+    parser.add_argument('--per-object', type=int, default=100)
+    args = parser.parse_args()
+
+    objects = args.vertices // args.per_object
+    rng = np.random.default_rng(0)
+    vertices = rng.uniform(-1e4, 1e4, (objects * args.per_object, 2))
+    slots = DrawableObject.geometry_buffer.allocate_many(vertices, np.full(objects, args.per_object)).tolist()
+    drawables = [Wireframe.from_slot(slot) for slot in slots]
+    del vertices
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'scene.igs')
+        start = time.perf_counter()
+        scene_file.save(path, drawables)
+        saved = time.perf_counter() - start
+        size = os.path.getsize(path)
+        del drawables
+
+        start = time.perf_counter()
+        loaded = scene_file.load(path)
+        load_time = time.perf_counter() - start
+
+        viewport = Viewport(Vector2(0, 0), Vector2(800, 600))
+        renderer = ObjectRenderer(Window(Vector2(-400, -400), Vector2(400, 400), viewport), EventSystem())
+        start = time.perf_counter()
+        renderer.add_many(loaded)
+        add_time = time.perf_counter() - start
+
+    print(f'{objects} objects, {objects * args.per_object} vertices, {size / 2**20:.0f} MiB')
+    print(f'save      {saved * 1000:8.1f} ms')
+    print(f'load      {load_time * 1000:8.1f} ms')
+    print(f'add_many  {add_time * 1000:8.1f} ms')
+
+
+if __name__ == '__main__':
+    main()
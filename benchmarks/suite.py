@@ -0,0 +1,249 @@
+"""
+Benchmark suite for the math, transform, event and rendering hot paths.
+
+Runs headless through EGL (Mesa's llvmpipe is enough), writes every measurement to a JSON file and, given a baseline
+written by an earlier run, fails when a metric got worse than the threshold allows:
+
+    python benchmarks/suite.py --output results.json
+    python benchmarks/suite.py --baseline results.json --threshold 0.15
+
+Scene benchmarks run for every drawable type at each --sizes amount of objects and measure add_many, a panning
+frame (every visible object rebuilt), an idle frame and remove_many, then a panning frame again with the viewport
+transform in the shader. Every figure is a median, on a noisy machine
+raise --repeat/--frames or the threshold
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+from typing import Callable, Dict, List, NamedTuple
+import numpy as np
+import pyglet
+
+pyglet.options['headless'] = True
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from drawable import DrawableObject, Line, ObjectRenderer, Point, Wireframe  # noqa: E402
+from event_system import Event, EventSystem  # noqa: E402
+from igs_math import Matrix3x3, Vector2  # noqa: E402
+from viewport import Viewport  # noqa: E402
+from window import Window  # noqa: E402
+
+
+class Result(NamedTuple):
+    name: str
+    value: float
+    unit: str
+    higher_is_better: bool
+
+
+def timed(function: Callable[[], None], repeat: int) -> float:
+    """
+    Median wall time of repeat calls, in seconds
+    """
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    return float(np.median(times))
+
+
+def throughput(name: str, function: Callable[[], None], operations: int, repeat: int) -> Result:
+    return Result(name, operations / timed(function, repeat), 'ops/s', True)
+
+
+def math_benchmarks(repeat: int) -> List[Result]:
+    vector = Vector2(3.0, 4.0)
+    matrix = Matrix3x3.from_trs(Vector2(10, 20), 0.5, Vector2(2, 2))
+    points = np.random.default_rng(0).uniform(-1e3, 1e3, (1_000_000, 2))
+    operations = 10_000
+
+    def vector_ops():
+        for _ in range(operations):
+            (vector + vector) * 2.0
+
+    def vector_matrix():
+        for _ in range(operations):
+            vector * matrix
+
+    def from_trs():
+        for _ in range(operations):
+            Matrix3x3.from_trs(vector, 0.5, vector)
+
+    return [
+        throughput('math.vector_add_scale', vector_ops, operations, repeat),
+        throughput('math.vector_times_matrix', vector_matrix, operations, repeat),
+        throughput('math.matrix_from_trs', from_trs, operations, repeat),
+        throughput('math.apply_many_1m', lambda: matrix.apply_many(points), len(points), repeat),
+    ]
+
+
+def window_benchmarks(repeat: int) -> List[Result]:
+    window = Window(Vector2(-400, -300), Vector2(400, 300), Viewport(Vector2(0, 0), Vector2(800, 600)))
+    vector = Vector2(12.0, 34.0)
+    points = np.random.default_rng(0).uniform(-1e3, 1e3, (1_000_000, 2))
+    operations = 10_000
+
+    def single():
+        for _ in range(operations):
+            window.world_to_viewport(vector)
+
+    return [
+        throughput('window.world_to_viewport', single, operations, repeat),
+        throughput('window.world_to_viewport_many_1m', lambda: window.world_to_viewport_many(points),
+                   len(points), repeat),
+    ]
+
+
+def event_benchmarks(repeat: int) -> List[Result]:
+    operations = 10_000
+    immediate = EventSystem()
+    immediate.register_callback(Event.MOUSE_MOVE, lambda position, delta: None)
+    queued = EventSystem(queued=True)
+    queued.register_callback(Event.MOUSE_MOVE, lambda position, delta: None)
+    queued.register_callback(Event.ADD_DRAWABLE, lambda drawable: None)
+    position, delta = Vector2(1, 2), Vector2(1, 1)
+
+    def fire():
+        for _ in range(operations):
+            immediate.fire(Event.MOUSE_MOVE, position, delta)
+
+    def coalesced():
+        for _ in range(operations):
+            queued.fire(Event.MOUSE_MOVE, position, delta)
+        queued.drain()
+
+    def queued_drain():
+        for _ in range(operations):
+            queued.fire(Event.ADD_DRAWABLE, None)
+        queued.drain()
+
+    return [
+        throughput('events.fire_immediate', fire, operations, repeat),
+        throughput('events.fire_coalesced', coalesced, operations, repeat),
+        throughput('events.queue_and_drain', queued_drain, operations, repeat),
+    ]
+
+
+def make_drawables(kind: type, amount: int, extent: float, rng: np.random.Generator) -> List[DrawableObject]:
+    centers = rng.uniform(-extent, extent, (amount, 2))
+    if kind is Point:
+        return [Point(Vector2(x, y)) for x, y in centers.tolist()]
+    if kind is Line:
+        ends = centers + rng.normal(scale=extent / 20, size=(amount, 2))
+        return [Line(Vector2(*a), Vector2(*b)) for a, b in zip(centers.tolist(), ends.tolist())]
+    angles = np.linspace(0, 2 * np.pi, 8, endpoint=False)
+    ring = np.stack((np.cos(angles), np.sin(angles)), axis=1) * extent / 40
+    return [Wireframe(center + ring) for center in centers]
+
+
+def scene_benchmarks(sizes: List[int], frames: int, cycles: int) -> List[Result]:
+    results = []
+    pyglet_window = pyglet.window.Window(800, 600)
+    for kind in (Point, Line, Wireframe):
+        for amount in sizes:
+            prefix = f'scene.{kind.__name__.lower()}.{amount}'
+            # the scene is spread so that about a tenth of it is inside the window
+            extent = 400 * np.sqrt(10)
+            drawables = make_drawables(kind, amount, extent, np.random.default_rng(0))
+            window = Window(Vector2(-400, -300), Vector2(400, 300), Viewport(Vector2(0, 0), Vector2(800, 600)))
+            renderer = ObjectRenderer(window, EventSystem())
+
+            add_times, remove_times = [], []
+            for _ in range(cycles):
+                add_times.append(timed(lambda: renderer.add_many(drawables), 1))
+                remove_times.append(timed(lambda: renderer.remove_many(drawables), 1))
+            results.append(Result(f'{prefix}.add_many', float(np.median(add_times)) * 1e3, 'ms', False))
+            results.append(Result(f'{prefix}.remove_many', float(np.median(remove_times)) * 1e3, 'ms', False))
+            renderer.add_many(drawables)
+
+            def frame():
+                pyglet_window.clear()
+                renderer.draw()
+                pyglet.gl.glFinish()
+
+            frame()
+            pan_times = []
+            for i in range(frames):
+                window.move(Vector2(1.0 if i % 2 else -1.0, 0.0))
+                pan_times.append(timed(frame, 1))
+            results.append(Result(f'{prefix}.pan_frame', float(np.median(pan_times)) * 1e3, 'ms', False))
+            results.append(Result(f'{prefix}.idle_frame', timed(frame, frames) * 1e3, 'ms', False))
+
+            renderer.shader_transform = True
+            frame()
+            pan_times = []
+            for i in range(frames):
+                window.move(Vector2(1.0 if i % 2 else -1.0, 0.0))
+                pan_times.append(timed(frame, 1))
+            results.append(Result(f'{prefix}.pan_frame_shader', float(np.median(pan_times)) * 1e3, 'ms', False))
+    pyglet_window.close()
+    return results
+
+
+def compare(results: Dict[str, dict], baseline: Dict[str, dict], threshold: float) -> List[str]:
+    """
+    Names and ratios of the metrics that are worse than the baseline by more than threshold
+    """
+    regressions = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        old, new = baseline[name]['value'], result['value']
+        slowdown = old / new if result['higher_is_better'] else new / old
+        if slowdown > 1 + threshold:
+            regressions.append(f'{name}: {old:.4g} -> {new:.4g} {result["unit"]} ({slowdown:.2f}x worse)')
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000])
+    parser.add_argument('--frames', type=int, default=10)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--cycles', type=int, default=3, help='add_many/remove_many rounds per scene')
+    parser.add_argument('--output', default='benchmark_results.json')
+    parser.add_argument('--baseline')
+    parser.add_argument('--threshold', type=float, default=0.10,
+                        help='allowed slowdown as a fraction of the baseline')
+    args = parser.parse_args()
+
+    results: List[Result] = []
+    for group in (lambda: math_benchmarks(args.repeat), lambda: window_benchmarks(args.repeat),
+                  lambda: event_benchmarks(args.repeat), lambda: scene_benchmarks(args.sizes, args.frames, args.cycles)):
+        for result in group():
+            print(f'{result.name:<45}{result.value:>16.4g} {result.unit}')
+            results.append(result)
+
+    report = {
+        'meta': {
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'pyglet': pyglet.version,
+            'machine': platform.machine(),
+            'renderer': pyglet.gl.gl_info.get_renderer(),
+            'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        },
+        'results': {r.name: {'value': r.value, 'unit': r.unit, 'higher_is_better': r.higher_is_better}
+                    for r in results},
+    }
+    with open(args.output, 'w') as file:
+        json.dump(report, file, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as file:
+            baseline = json.load(file)['results']
+        regressions = compare(report['results'], baseline, args.threshold)
+        for regression in regressions:
+            print(f'REGRESSION {regression}')
+        if regressions:
+            return 1
+        print(f'no regression over {args.threshold:.0%} against {args.baseline}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,101 @@
+import numpy as np
+from spatial_index import Bounds
+
+
+def clip_segments(segments: np.ndarray, region: Bounds) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Liang–Barsky over a N×2×2 array of segments. Returns the clipped segments and a mask telling which of them are
+    at least partially inside the region, clipped segments that are fully outside hold garbage
+    """
+    x_min, y_min, x_max, y_max = region
+    start = segments[:, 0]
+    delta = segments[:, 1] - start
+    p = np.stack((-delta[:, 0], delta[:, 0], -delta[:, 1], delta[:, 1]), axis=1)
+    q = np.stack((start[:, 0] - x_min, x_max - start[:, 0],
+                  start[:, 1] - y_min, y_max - start[:, 1]), axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        r = q / p
+    t0 = np.where(p < 0, r, 0.0).max(axis=1)
+    t1 = np.where(p > 0, r, 1.0).min(axis=1)
+    visible = (t0 <= t1) & ~((p == 0) & (q < 0)).any(axis=1)
+    clipped = np.empty_like(segments, dtype=np.float64)
+    clipped[:, 0] = start + t0[:, None] * delta
+    clipped[:, 1] = start + t1[:, None] * delta
+    return clipped, visible
+
+
+def previous_vertices(lengths: np.ndarray) -> np.ndarray:
+    """
+    For closed polygons concatenated in one array, the index of the vertex that comes before each vertex
+    """
+    previous = np.arange(int(lengths.sum())) - 1
+    starts = np.cumsum(lengths) - lengths
+    filled = lengths > 0
+    previous[starts[filled]] = (starts + lengths - 1)[filled]
+    return previous
+
+
+def polygon_edges(vertices: np.ndarray, lengths: np.ndarray) -> np.ndarray:
+    """
+    N×2×2 array with the edges of closed polygons concatenated in one array, polygon i has lengths[i] edges
+    """
+    return np.stack((vertices[previous_vertices(lengths)], vertices), axis=1)
+
+
+def clip_polygons(vertices: np.ndarray, lengths: np.ndarray, region: Bounds) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Sutherland–Hodgman of many polygons at once, each of the four passes is vectorized over every vertex of every
+    polygon. Polygons are concatenated in one N×2 array and lengths holds their vertex counts
+    """
+    vertices, lengths, _ = clip_polygons_marked(vertices, lengths, region)
+    return vertices, lengths
+
+
+def clip_polygons_marked(vertices: np.ndarray, lengths: np.ndarray,
+                         region: Bounds) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    clip_polygons that also returns, for every clipped vertex, whether the edge that ends at it was inserted by the
+    clipping along the region border rather than being part of an original edge
+    """
+    lengths = np.asarray(lengths, dtype=np.int64)
+    inserted = np.zeros(len(vertices), dtype=np.bool_)
+    owners = np.arange(len(lengths))
+    x_min, y_min, x_max, y_max = region
+    for axis, bound, keep_greater in ((0, x_min, True), (0, x_max, False), (1, y_min, True), (1, y_max, False)):
+        if len(vertices) == 0:
+            break
+        previous = previous_vertices(lengths)
+        cur_in = vertices[:, axis] >= bound if keep_greater else vertices[:, axis] <= bound
+        crossing = cur_in != cur_in[previous]
+        p, c = vertices[previous[crossing]], vertices[crossing]
+        t = (bound - p[:, axis]) / (c[:, axis] - p[:, axis])
+        intersections = p + t[:, None] * (c - p)
+        intersections[:, axis] = bound
+
+        counts = cur_in.astype(np.int64) + crossing
+        starts = np.cumsum(counts) - counts
+        clipped = np.empty((int(counts.sum()), 2))
+        clipped[starts[crossing]] = intersections
+        clipped[(starts + crossing)[cur_in]] = vertices[cur_in]
+        # the edge into an entry point runs along the border from the previous exit point, every other edge is a
+        # piece of the edge that ended at the original vertex
+        clipped_inserted = np.empty(len(clipped), dtype=np.bool_)
+        clipped_inserted[starts[crossing]] = cur_in[crossing] | inserted[crossing]
+        clipped_inserted[(starts + crossing)[cur_in]] = inserted[cur_in]
+        lengths = np.bincount(np.repeat(owners, lengths), weights=counts,
+                              minlength=len(lengths)).astype(np.int64)
+        vertices, inserted = clipped, clipped_inserted
+    return vertices, lengths, inserted
+
+
+def clip_polygon_edges(vertices: np.ndarray, lengths: np.ndarray, region: Bounds) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Clips polygon outlines and returns their edges plus the edge count of each polygon. The edges Sutherland–Hodgman
+    adds along the region border are dropped since a wireframe has no fill that would need them, original edges that
+    lie on the border are kept
+    """
+    vertices, lengths, inserted = clip_polygons_marked(vertices, lengths, region)
+    edges = polygon_edges(vertices, lengths)
+    owners = np.repeat(np.arange(len(lengths)), lengths)
+    counts = np.bincount(owners[~inserted], minlength=len(lengths))
+    return edges[~inserted], counts
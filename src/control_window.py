@@ -1,95 +1,130 @@
 import multiprocessing
 import multiprocessing.connection
 from event_system import Event
+import ipc_protocol
+import object_batch
+from scene_mirror import SceneMirrorReader
+from scene_list_model import SceneListModel
 import sys
-from PyQt5.QtCore import Qt, QThread, pyqtSignal, QTimer
-from PyQt5.QtWidgets import QApplication, QMainWindow, QWidget, QGridLayout, QListWidget, QPushButton, QInputDialog, QDialog, QLabel, QLineEdit, QVBoxLayout, QComboBox, QMessageBox, QListWidgetItem
+from PyQt5.QtCore import Qt, QSocketNotifier
+from PyQt5.QtWidgets import QApplication, QMainWindow, QWidget, QGridLayout, QListView, QPushButton, QDialog, QLabel, QPlainTextEdit, QVBoxLayout, QMessageBox, QFileDialog, QProgressBar
 from event_system import EventSystem
 from igs_math import Vector2
 
 
 class ObjectDialog(QDialog):
 
+    """
+    Creates many objects at once: one per line, an optional name followed by x, y pairs. One pair makes a point, two a
+    line and more a polygon. A file (text, CSV or a .npy array) can be sent instead of the text. Everything goes to the
+    main window in a single CREATE_DRAWABLES message
+    """
+
+    batch_file_filter = 'Coordinates (*.csv *.txt *.npy);;All files (*)'
+
     def __init__(self, conn: multiprocessing.connection.Connection):
         super().__init__()
         self.__conn = conn
-        label = QLabel('Create new object:')
-        self.obj_coords_input = QLineEdit()
-        self.obj_coords_input.setPlaceholderText('Object coordinates')
-        self.obj_name = QLineEdit()
-        self.obj_name.setPlaceholderText('Object name')
+        self.setWindowTitle('Create objects')
+        label = QLabel('One object per line: [name,] x1, y1, x2, y2, ...\n'
+                       'one pair makes a point, two a line, more a polygon')
+        self.obj_coords_input = QPlainTextEdit()
+        self.obj_coords_input.setPlaceholderText('house, 0, 0, 100, 0, 100, 100, 0, 100\n50, 50')
 
         ok_button = QPushButton('OK')
+        file_button = QPushButton('From file...')
         cancel_button = QPushButton('Cancel')
         ok_button.clicked.connect(self.createObject)
+        file_button.clicked.connect(self.create_from_file)
         cancel_button.clicked.connect(self.reject)
 
-        self.obj_type = QComboBox()
-        self.obj_type.addItem("Point")
-        self.obj_type.addItem("Line")
-        self.obj_type.addItem("Polygon")
-
         layout = QVBoxLayout(self)
         layout.addWidget(label)
-        layout.addWidget(self.obj_type)
-        layout.addWidget(self.obj_name)
         layout.addWidget(self.obj_coords_input)
         layout.addWidget(ok_button)
+        layout.addWidget(file_button)
         layout.addWidget(cancel_button)
 
     def createObject(self):
-        obj_type = self.obj_type.currentText()
-
-        coords: str = self.obj_coords_input.text()
-        coords.split(',')
-        match obj_type:
-            case 'Line':
-                pass
-            case 'Polygon':
-                pass
-            case 'Point':
-                pass
+        try:
+            batch = object_batch.parse_text(self.obj_coords_input.toPlainText())
+        except ValueError as error:
+            QMessageBox.warning(self, 'Create objects', str(error))
+            return
+        self.send(batch)
 
+    def create_from_file(self):
+        path, _ = QFileDialog.getOpenFileName(self, 'Create objects from file', '', self.batch_file_filter)
+        if not path:
+            return
+        try:
+            batch = object_batch.load(path)
+        except (OSError, ValueError) as error:
+            QMessageBox.warning(self, 'Create objects', str(error))
+            return
+        self.send(batch)
+
+    def send(self, batch: ipc_protocol.DrawableBatch):
+        if len(batch.lengths):
+            self.__conn.send_bytes(ipc_protocol.encode([(Event.CREATE_DRAWABLES, batch)]))
         self.accept()
 
 
 class ControlWindow(QMainWindow):
 
+    scene_file_filter = 'igs scenes (*.igs);;All files (*)'
+    text_file_filter = 'Wavefront OBJ (*.obj);;CSV (*.csv);;All files (*)'
+
     def poll_conn(self):
-        if self.__conn.poll():
-            message = self.__conn.recv()
-            match message[0]:
-                case Event.DRAWABLE_ADDED:
-                    item = QListWidgetItem(str(message[1].name))
-                    item.setData(1, message[1])
-                    self.list_widget.addItem(item)
-                case Event.DRAWABLE_REMOVED:
-                    for i in range(self.list_widget.count()):
-                        if self.list_widget.item(i).data(1) == message[1]:
-                            self.list_widget.takeItem(i)
-                            return
+        """
+        Called by the socket notifier when the pipe is readable. Drains every frame waiting in it and resyncs the list
+        from the shared scene table when a new generation of it was published
+        """
+        scene_info = None
+        while self.__conn.poll():
+            for event, payload in ipc_protocol.decode(self.__conn.recv_bytes()):
+                match event:
+                    case Event.SCENE_PUBLISHED:
+                        scene_info = payload
+                    case Event.TRANSFER_PROGRESS:
+                        self.transfer_progress.setValue(0 if payload.finished else int(payload.fraction * 1000))
+                        self.transfer_progress.setVisible(not payload.finished)
+                        self.cancel_button.setEnabled(not payload.finished)
+                    case Event.SHOW_ERROR:
+                        QMessageBox.warning(self, 'Error', payload)
+        if scene_info is not None:
+            records = self.__scene_mirror.snapshot(scene_info)
+            if records is not None:
+                self.scene_model.resync(records)
+
+    def send(self, event: Event, payload):
+        self.__conn.send_bytes(ipc_protocol.encode([(event, payload)]))
 
     def __init__(self, conn: multiprocessing.connection.Connection):
         super().__init__()
         self.__conn = conn
+        self.__scene_mirror = SceneMirrorReader()
         self.setWindowTitle("List Widget Example")
         self.setWindowFlags(Qt.WindowStaysOnTopHint)  # type: ignore
-        self.setFixedSize(200, 600)
-        self.resize(200, 600)
+        self.setFixedSize(200, 800)
+        self.resize(200, 800)
         main_widget = QWidget(self)
         grid = QGridLayout(main_widget)
         self.setCentralWidget(main_widget)
 
-        self.list_widget = QListWidget()
-        self.conn_poll_timer = QTimer()
-        self.conn_poll_timer.start()
-        self.conn_poll_timer.timeout.connect(self.poll_conn)
+        self.scene_model = SceneListModel(self)
+        self.list_view = QListView()
+        self.list_view.setUniformItemSizes(True)
+        self.list_view.setModel(self.scene_model)
+        self.conn_notifier = QSocketNotifier(
+            self.__conn.fileno(), QSocketNotifier.Read, self)
+        self.conn_notifier.activated.connect(self.poll_conn)
         remove_button = QPushButton('remove', self)
         remove_button.clicked.connect(self.remove_item)
 
         first_row = QWidget(self)
         first_row_layout = QGridLayout(first_row)
-        first_row_layout.addWidget(self.list_widget, 0, 0)
+        first_row_layout.addWidget(self.list_view, 0, 0)
         first_row_layout.addWidget(remove_button, 1, 0)
 
         second_row = QWidget(self)
@@ -102,20 +137,20 @@ class ControlWindow(QMainWindow):
         button_movew_down = QPushButton('DOWN', self)
 
         button_zoom_in.clicked.connect(
-            lambda: self.__conn.send((Event.ZOOM_WINDOW, Vector2(125, 125))))
+            lambda: self.send(Event.ZOOM_WINDOW, Vector2(125, 125)))
         button_zoom_out.clicked.connect(
-            lambda: self.__conn.send((Event.ZOOM_WINDOW, Vector2(-125, -125))))
+            lambda: self.send(Event.ZOOM_WINDOW, Vector2(-125, -125)))
         button_movew_up.clicked.connect(
-            lambda: self.__conn.send((Event.MOVE_WINDOW, Vector2(0, 100)))
+            lambda: self.send(Event.MOVE_WINDOW, Vector2(0, 100))
         )
         button_movew_down.clicked.connect(
-            lambda: self.__conn.send((Event.MOVE_WINDOW, Vector2(0, -100)))
+            lambda: self.send(Event.MOVE_WINDOW, Vector2(0, -100))
         )
         button_movew_left.clicked.connect(
-            lambda: self.__conn.send((Event.MOVE_WINDOW, Vector2(-100, 0)))
+            lambda: self.send(Event.MOVE_WINDOW, Vector2(-100, 0))
         )
         button_movew_right.clicked.connect(
-            lambda: self.__conn.send((Event.MOVE_WINDOW, Vector2(100, 0)))
+            lambda: self.send(Event.MOVE_WINDOW, Vector2(100, 0))
         )
 
         second_row_layout.addWidget(button_zoom_in, 0, 0)
@@ -128,31 +163,77 @@ class ControlWindow(QMainWindow):
         third_row = QWidget(self)
         third_row_layout = QGridLayout(third_row)
 
-        add_obj_button = QPushButton('add object', self)
+        add_obj_button = QPushButton('add objects', self)
         add_obj_button.clicked.connect(self.add_item)
         third_row_layout.addWidget(add_obj_button, 0, 0)
+        help_button = QPushButton('help', self)
+        help_button.clicked.connect(self.show_help)
+        third_row_layout.addWidget(help_button, 7, 0)
+        save_button = QPushButton('save scene', self)
+        save_button.clicked.connect(self.save_scene)
+        third_row_layout.addWidget(save_button, 1, 0)
+        load_button = QPushButton('load scene', self)
+        load_button.clicked.connect(self.load_scene)
+        third_row_layout.addWidget(load_button, 2, 0)
+        import_button = QPushButton('import OBJ/CSV', self)
+        import_button.clicked.connect(self.import_file)
+        third_row_layout.addWidget(import_button, 3, 0)
+        export_button = QPushButton('export OBJ/CSV', self)
+        export_button.clicked.connect(self.export_file)
+        third_row_layout.addWidget(export_button, 4, 0)
+        self.transfer_progress = QProgressBar(self)
+        self.transfer_progress.setRange(0, 1000)
+        self.transfer_progress.setVisible(False)
+        third_row_layout.addWidget(self.transfer_progress, 5, 0)
+        self.cancel_button = QPushButton('cancel', self)
+        self.cancel_button.setEnabled(False)
+        self.cancel_button.clicked.connect(lambda: self.send(Event.CANCEL_TRANSFER, None))
+        third_row_layout.addWidget(self.cancel_button, 6, 0)
 
         grid.addWidget(first_row, 0, 0)
         grid.addWidget(second_row, 1, 0)
         grid.addWidget(third_row, 2, 0)
 
     def add_item(self):
+        ObjectDialog(self.__conn).exec()
+
+    def show_help(self):
         message_box = QMessageBox()
         message_box.setWindowTitle("Information")
         message_box.setText(
-            "Not implemented yet. Click on the main window to add a new object, use F1 to change object type.\
+            "Click on the main window to add a new object, use F1 to change object type.\
                 \n You can also use the WASD keys to move around and +- to zoom \
-                \n in order to draw a wireframe/polygon you must place at least 3 points and ctrl+click")
+                \n in order to draw a wireframe/polygon you must place at least 3 points and ctrl+click \
+                \n right click selects an object, arrows/Q/E/PageUp/PageDown transform it and Delete removes it \
+                \n ctrl+Z undoes the last change and ctrl+Y redoes it")
         message_box.setIcon(QMessageBox.Information)
         message_box.exec()
-        return
-        ObjectDialog(self.__conn).exec()
+
+    def save_scene(self):
+        path, _ = QFileDialog.getSaveFileName(self, 'Save scene', '', self.scene_file_filter)
+        if path:
+            self.send(Event.SAVE_SCENE, path)
+
+    def load_scene(self):
+        path, _ = QFileDialog.getOpenFileName(self, 'Load scene', '', self.scene_file_filter)
+        if path:
+            self.send(Event.LOAD_SCENE, path)
+
+    def import_file(self):
+        path, _ = QFileDialog.getOpenFileName(self, 'Import', '', self.text_file_filter)
+        if path:
+            self.send(Event.IMPORT_FILE, path)
+
+    def export_file(self):
+        path, _ = QFileDialog.getSaveFileName(self, 'Export', '', self.text_file_filter)
+        if path:
+            self.send(Event.EXPORT_FILE, path)
 
     def remove_item(self):
-        if self.list_widget.count() == 0 or self.list_widget.currentItem() == None:
+        current = self.list_view.currentIndex()
+        if not current.isValid():
             return
-        selectedItem: QListWidgetItem = self.list_widget.currentItem()
-        self.__conn.send((Event.REMOVE_DRAWALBE, selectedItem.data(1)))
+        self.send(Event.REMOVE_DRAWALBE, self.scene_model.object_id(current.row()))
 
 
 def create_control_window(conn: multiprocessing.connection.Connection):
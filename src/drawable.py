@@ -1,22 +1,50 @@
+import gc
 import pyglet
 import uuid
+import itertools
+import math
 import numpy as np
+from pyglet.gl import GL_LINES, GL_SCISSOR_TEST, GL_TRIANGLES, glDisable, glEnable, glScissor
+from pyglet.graphics.shader import ShaderProgram
+from pyglet.graphics.vertexdomain import VertexList
 from event_system import Event, EventSystem
-from igs_math import Vector2, Matrix3x3
+from ipc_protocol import DrawableBatch
+from igs_math import Vector2, Matrix3x3, to_np_array
+from geometry_buffer import GeometryBuffer
+from spatial_index import Bounds, SpatialGrid, intersects
+from clipping import clip_polygon_edges, clip_segments, polygon_edges
+from picking import SegmentBVH
+from point_layer import PointLayer
+from simplify import douglas_peucker_importance
 from window import Window
-from typing import List
-from copy import deepcopy
+from shaders import create_drawable_program, create_world_program
+from typing import Callable, Dict, Iterable, Iterator, List, Tuple
+
+# position, rotation and scale of a drawable
+Transform = Tuple[Vector2, float, Vector2]
 
 
 class DrawableObject:
 
     obj_count = 0
-
-    def __init__(self, name: str | None = None):
+    geometry_buffer = GeometryBuffer()
+    callback_handles = itertools.count()
+    # set at class level so that __del__ works on objects whose __init__ raised before allocating a slot
+    __slot: int | None = None
+
+    def __init__(self, name: str | None = None, vertices: np.ndarray | None = None, slot: int | None = None):
+        self.__slot: int | None = slot
+        if vertices is not None:
+            self.__slot = DrawableObject.geometry_buffer.allocate(vertices)
         self.__position = Vector2(0, 0)
         self.__rotation = 0.0
         self.__scale = Vector2(1, 1)
-        self.__update_transformation_matrix()
+        self.__change_callbacks: Dict[int, Callable] = dict()
+        self.__transformation_matrix: Matrix3x3 | None = None
+        # the geometry buffer starts every slot with the identity, so a new object has nothing to write to it
+        self.__transform_synced = True
+        self.__world_vertices: np.ndarray | None = None
+        self.__bounds: Bounds | None = None
         self.__id = uuid.uuid4()
         if name is None:
             self.__name = self.__class__.__name__ + " " + \
@@ -25,18 +53,99 @@ class DrawableObject:
             self.__name = name
         DrawableObject.obj_count += 1
 
+    @classmethod
+    def from_slot(cls, slot: int, name: str | None = None) -> "DrawableObject":
+        """
+        Wraps vertices that are already in the geometry buffer, the object takes ownership of the slot.
+        Used with GeometryBuffer.allocate_many to create many objects without copying their vertices one by one
+        """
+        drawable = cls.__new__(cls)
+        DrawableObject.__init__(drawable, name, slot=slot)
+        return drawable
+
+    def __del__(self):
+        if self.__slot is not None and DrawableObject.geometry_buffer is not None:
+            DrawableObject.geometry_buffer.free(self.__slot)
+
     @property
     def name(self) -> str:
         return self.__name
 
-    def __update_transformation_matrix(self):
-        self.__transformation_matrix = Matrix3x3()
-        self.__transformation_matrix.scale(self.__scale)
-        self.__transformation_matrix.rotate(self.__rotation)
-        self.__transformation_matrix.translate(self.__position)
+    @property
+    def slot(self) -> int | None:
+        """
+        Slot that owns the vertices of this object in the geometry buffer
+        """
+        return self.__slot
+
+    @property
+    def vertices(self) -> np.ndarray:
+        """
+        Untransformed vertices as a N×2 array, this is a view into the geometry buffer and must not be kept around
+        """
+        return DrawableObject.geometry_buffer.vertices(self.__slot)
+
+    @property
+    def world_vertices(self) -> np.ndarray:
+        """
+        Vertices multiplied by the transformation matrix as a read only N×2 array.
+        It is computed on first access and cached until the transformation changes
+        """
+        if self.__world_vertices is None:
+            world_vertices = self.transformation.apply_many(self.vertices)
+            world_vertices.flags.writeable = False
+            self.__world_vertices = world_vertices
+        return self.__world_vertices
+
+    @property
+    def bounds(self) -> Bounds:
+        """
+        World space axis aligned bounding box as (x_min, y_min, x_max, y_max), cached like world_vertices
+        """
+        if self.__bounds is None:
+            world_vertices = self.world_vertices
+            self.__bounds = tuple(world_vertices.min(axis=0).tolist() +
+                                  world_vertices.max(axis=0).tolist())
+        return self.__bounds
+
+    def __invalidate_transformation(self):
+        """
+        Drops the cached matrix and world geometry, they are rebuilt the next time they are read
+        """
+        self.__transformation_matrix = None
+        self.__transform_synced = False
+        self.__world_vertices = None
+        self.__bounds = None
+        for callback in tuple(self.__change_callbacks.values()):
+            callback(self)
+
+    def register_change_callback(self, callback: Callable) -> int:
+        """
+        The callback is called with this object every time its transformation changes
+        """
+        callback_id = next(DrawableObject.callback_handles)
+        self.__change_callbacks[callback_id] = callback
+        return callback_id
+
+    def remove_change_callback(self, callback_id: int):
+        if callback_id in self.__change_callbacks:
+            del self.__change_callbacks[callback_id]
+
+    def sync_transform(self):
+        """
+        Writes the transformation to the geometry buffer if it changed since the last write, GeometryBuffer.transformed
+        and transformed_many read the transforms from there
+        """
+        if not self.__transform_synced:
+            self.__transform_synced = True
+            if self.__slot is not None:
+                DrawableObject.geometry_buffer.set_transform(self.__slot, self.transformation.np_mat)
 
     @property
     def transformation(self) -> Matrix3x3:
+        if self.__transformation_matrix is None:
+            self.__transformation_matrix = Matrix3x3.from_trs(
+                self.__position, self.__rotation, self.__scale)
         return self.__transformation_matrix
 
     @property
@@ -54,17 +163,29 @@ class DrawableObject:
     @position.setter
     def position(self, pos: Vector2):
         self.__position = pos
-        self.__update_transformation_matrix()
+        self.__invalidate_transformation()
 
     @rotation.setter
     def rotation(self, rot: float):
         self.__rotation = rot
-        self.__update_transformation_matrix()
+        self.__invalidate_transformation()
 
     @scale.setter
     def scale(self, scale: Vector2):
         self.__scale = scale
-        self.__update_transformation_matrix()
+        self.__invalidate_transformation()
+
+    @property
+    def trs(self) -> Transform:
+        """
+        Position, rotation and scale together, setting them this way invalidates the transformation once
+        """
+        return self.__position, self.__rotation, self.__scale
+
+    @trs.setter
+    def trs(self, trs: Transform):
+        self.__position, self.__rotation, self.__scale = trs
+        self.__invalidate_transformation()
 
     @property
     def id(self):
@@ -73,106 +194,592 @@ class DrawableObject:
     def __eq__(self, other: "DrawableObject") -> bool:
         return self.id == other.id
 
+    def __hash__(self) -> int:
+        return hash(self.__id)
+
 
 class Point(DrawableObject):
 
     def __init__(self, pos: Vector2, name: str | None = None):
-        super().__init__(name)
-        self.__pos = pos
+        super().__init__(name, to_np_array([pos]))
 
     @property
     def point(self) -> Vector2:
-        return self.__pos * self.transformation
+        return Vector2(*self.world_vertices[0].tolist())
 
 
 class Line(DrawableObject):
 
     def __init__(self, start: Vector2, end: Vector2, name: str | None = None):
-        super().__init__(name)
-        self.__start: Vector2 = start
-        self.__end: Vector2 = end
+        super().__init__(name, to_np_array([start, end]))
 
     @property
     def start(self) -> Vector2:
-        return self.__start * self.transformation
+        return Vector2(*self.world_vertices[0].tolist())
 
     @property
     def end(self):
-        return self.__end * self.transformation
+        return Vector2(*self.world_vertices[1].tolist())
 
 
 class Wireframe(DrawableObject):
 
-    def __init__(self, points: list[Vector2], name: str | None = None):
-        super().__init__(name)
+    # level of detail state, built on first use so that wireframes created with from_slot get it too
+    __importance: np.ndarray | None = None
+    __min_importance = 0.0
+    __lod_levels: Dict[int, np.ndarray] | None = None
+
+    def __init__(self, points: list[Vector2] | np.ndarray, name: str | None = None):
         if len(points) < 3:
             raise RuntimeError('A polygon must have at least 3 points')
-        self.__points: list[Vector2] = deepcopy(points)
+        if not isinstance(points, np.ndarray):
+            points = to_np_array(points)
+        super().__init__(name, points)
 
     @property
     def points(self) -> List[Vector2]:
-        transformed_points: List[Vector2] = []
-        for p in self.__points:
-            transformed_points.append(p * self.transformation)
-        return transformed_points
+        return [Vector2(x, y) for x, y in self.world_vertices.tolist()]
+
+    def simplified_world_vertices(self, tolerance: float) -> np.ndarray:
+        """
+        World vertices of the coarsest simplification whose error stays below tolerance world units.
+        The Douglas–Peucker importance of every vertex is computed in object space the first time this is called,
+        levels are tolerances rounded down to a power of two and their vertex indices are cached. The vertices of a
+        wireframe never change, so neither do the levels, the transformation only rescales the tolerance
+        """
+        scale = max(abs(self.scale.x), abs(self.scale.y))
+        if scale == 0 or tolerance <= 0:
+            return self.world_vertices
+        if self.__importance is None:
+            self.__importance = douglas_peucker_importance(self.vertices)
+            self.__min_importance = float(self.__importance.min())
+            self.__lod_levels = dict()
+        local_tolerance = tolerance / scale
+        if local_tolerance < self.__min_importance:
+            return self.world_vertices
+        level = math.floor(math.log2(local_tolerance))
+        indices = self.__lod_levels.get(level)
+        if indices is None:
+            indices = self.__lod_levels[level] = np.flatnonzero(self.__importance > 2.0 ** level)
+        return self.world_vertices[indices]
 
 
 class ObjectRenderer:
 
-    def __init__(self, window: Window, evt_sys: EventSystem):
-        self.__objects: list[DrawableObject] = []
+    """
+    Retained mode renderer, every visible drawable owns a vertex list that lives in the batch until the drawable is
+    removed or leaves the window. Vertex lists are only rewritten when the drawable transformation or the window changes.
+    Visibility is answered by a spatial grid over the drawables bounding boxes, so the cost of a window change scales
+    with what is on screen instead of the whole scene.
+    In shader_transform mode every drawable is uploaded once in world coordinates and the window to viewport matrix is
+    a shader uniform, so panning and zooming cost nothing on the CPU. That mode neither clips, culls nor simplifies:
+    the GPU clips against the viewport and every drawable stays in the batch.
+    With point_layer enabled points do not get vertex lists, they are all drawn by a PointLayer as GL points
+    2 * point_radius pixels wide, which is what makes scenes with millions of points usable
+    """
+
+    point_radius = 2.0
+    point_segments = 12
+    color = (255, 255, 255, 255)
+    selected_color = (255, 80, 80, 255)
+    # wireframes with at least lod_min_vertices vertices are drawn with the coarsest simplification whose error is
+    # below lod_pixel_error viewport pixels
+    lod_pixel_error = 1.0
+    lod_min_vertices = 64
+    # picking queries a hierarchy built over the whole scene plus a small one over the drawables added or moved since,
+    # the large one is only rebuilt once more than this fraction of the scene changed
+    pick_rebuild_fraction = 0.25
+
+    def __init__(self, window: Window, evt_sys: EventSystem, clipping: bool = True, shader_transform: bool = False,
+                 point_layer: bool = True):
+        self.__objects: Dict[uuid.UUID, DrawableObject] = dict()
+        self.__points = PointLayer() if point_layer else None
+        self.__clipping = clipping
+        self.__shader_transform = shader_transform
         self.__window = window
+        self.__window_version = -1
         self.__batch = pyglet.graphics.Batch()
+        self.__program: ShaderProgram | None = None
+        self.__world_program: ShaderProgram | None = None
+        self.__vertex_lists: Dict[uuid.UUID, VertexList] = dict()
+        self.__change_callbacks: Dict[uuid.UUID, int] = dict()
+        self.__dirty: Dict[uuid.UUID, DrawableObject] = dict()
+        self.__moved: Dict[uuid.UUID, DrawableObject] = dict()
+        self.__index = SpatialGrid()
+        self.__bvh: SegmentBVH | None = None
+        self.__bvh_objects: list[DrawableObject | None] = []
+        self.__bvh_owners: Dict[uuid.UUID, int] = dict()
+        self.__bvh_changed: Dict[uuid.UUID, DrawableObject] = dict()
+        self.__changed_bvh: SegmentBVH | None = None
+        self.__changed_bvh_objects: list[DrawableObject] = []
+        self.__selected: DrawableObject | None = None
+        # set when a vertex list is deleted outside of draw, which the moved and dirty sets do not show
+        self.__damaged = True
         self.__evt_sys = evt_sys
         self.__evt_sys.register_callback(
             Event.REMOVE_DRAWALBE, self.removeObject)
         self.__evt_sys.register_callback(
             Event.ADD_DRAWABLE, self.addObject
         )
+        self.__evt_sys.register_callback(
+            Event.REMOVE_DRAWABLES, self.remove_many)
+        self.__evt_sys.register_callback(
+            Event.ADD_DRAWABLES, self.add_many)
+        self.__evt_sys.register_callback(
+            Event.CREATE_DRAWABLES, self.create_many)
+
+    def __len__(self) -> int:
+        return len(self.__objects)
+
+    def __iter__(self) -> Iterator[DrawableObject]:
+        return iter(list(self.__objects.values()))
+
+    def get(self, object_id: uuid.UUID) -> DrawableObject | None:
+        return self.__objects.get(object_id)
 
     def hasObject(self, object: DrawableObject):
-        return object in self.__objects
+        return object.id in self.__objects
 
     def removeObject(self, object: DrawableObject):
-        if self.hasObject(object):
-            self.__objects.remove(object)
+        if self.__detach(object):
             self.__evt_sys.fire(Event.DRAWABLE_REMOVED, object)
 
     def addObject(self, object: DrawableObject):
-        if self.hasObject(object):
+        if self.__attach(object):
+            self.__evt_sys.fire(Event.DRAWABLE_ADDED, object)
+
+    def add_many(self, objects: Iterable[DrawableObject]):
+        """
+        Adds every object that is not in the renderer yet and fires a single DRAWABLES_ADDED with the list of them
+        """
+        added = [o for o in objects if self.__attach(o)]
+        if added:
+            self.__evt_sys.fire(Event.DRAWABLES_ADDED, added)
+
+    def remove_many(self, objects: Iterable[DrawableObject]):
+        """
+        Removes every object that is in the renderer and fires a single DRAWABLES_REMOVED with the list of them
+        """
+        removed = [o for o in objects if self.__detach(o)]
+        if removed:
+            self.__evt_sys.fire(Event.DRAWABLES_REMOVED, removed)
+
+    def create_many(self, batch: DrawableBatch) -> List[DrawableObject]:
+        """
+        Creates the drawables of a batch, all their vertices copied to the geometry buffer at once, and adds them
+        with a single add_many
+        """
+        drawables = create_drawables(batch.kinds, batch.vertices, batch.lengths, batch.names)
+        self.add_many(drawables)
+        return drawables
+
+    def clear(self):
+        self.remove_many(list(self.__objects.values()))
+
+    def __attach(self, object: DrawableObject) -> bool:
+        if object.id in self.__objects:
+            return False
+        self.__objects[object.id] = object
+        self.__change_callbacks[object.id] = object.register_change_callback(
+            self.__mark_moved)
+        self.__mark_moved(object)
+        return True
+
+    def __detach(self, object: DrawableObject) -> bool:
+        if object.id not in self.__objects:
+            return False
+        del self.__objects[object.id]
+        object.remove_change_callback(
+            self.__change_callbacks.pop(object.id))
+        self.__dirty.pop(object.id, None)
+        self.__moved.pop(object.id, None)
+        self.__index.remove(object.id)
+        self.__hide(object.id)
+        if self.__points is not None and isinstance(object, Point):
+            self.__points.remove(object.id)
+        self.__damaged = True
+        self.__forget_pick(object.id)
+        self.__bvh_changed.pop(object.id, None)
+        if self.__selected is not None and self.__selected.id == object.id:
+            self.__selected = None
+        return True
+
+    def __mark_moved(self, drawable: DrawableObject):
+        self.__moved[drawable.id] = drawable
+        self.__forget_pick(drawable.id)
+        self.__bvh_changed[drawable.id] = drawable
+
+    @property
+    def needs_redraw(self) -> bool:
+        """
+        Whether a draw would put something different on screen than the last one did: a drawable was added, removed,
+        transformed or (de)selected, or the window moved
+        """
+        return (self.__damaged or bool(self.__moved) or bool(self.__dirty)
+                or self.__window_version != self.__window.version)
+
+    @property
+    def selected(self) -> DrawableObject | None:
+        """
+        The selected drawable is drawn with selected_color, its vertex list is rebuilt to change the color
+        """
+        return self.__selected
+
+    @selected.setter
+    def selected(self, drawable: DrawableObject | None):
+        for changed in (self.__selected, drawable):
+            if changed is not None and changed.id in self.__change_callbacks:
+                self.__hide(changed.id)
+                self.__moved[changed.id] = changed
+        self.__selected = drawable
+
+    def pick(self, viewport_pos: Vector2, tolerance: float = 5.0) -> DrawableObject | None:
+        """
+        Drawable whose closest segment (or point) lies within tolerance pixels of a viewport position, None if there is
+        no such drawable. The hierarchies used for the query are brought up to date lazily after the scene changes
+        """
+        self.__refresh_bvh()
+        world_pos = self.__window.viewport_to_world(viewport_pos)
+        inverse = self.__window.inverse_viewport_matrix.np_mat
+        world_per_pixel = max(abs(inverse[0, 0]), abs(inverse[1, 1]))
+        closest: tuple[DrawableObject, float] | None = None
+        for bvh, objects in ((self.__bvh, self.__bvh_objects), (self.__changed_bvh, self.__changed_bvh_objects)):
+            if bvh is None:
+                continue
+            hit = bvh.nearest(world_pos.x, world_pos.y, tolerance * world_per_pixel)
+            if hit is not None and (closest is None or hit[1] < closest[1]):
+                closest = (objects[hit[0]], hit[1])
+        return None if closest is None else closest[0]
+
+    def __forget_pick(self, drawable_id: uuid.UUID):
+        """
+        Hides a drawable from the scene wide hierarchy and drops the one over the changed drawables
+        """
+        owner = self.__bvh_owners.pop(drawable_id, None)
+        if owner is not None:
+            self.__bvh.remove(owner)
+            self.__bvh_objects[owner] = None
+        self.__changed_bvh = None
+
+    def __refresh_bvh(self):
+        dropped = len(self.__bvh_objects) - len(self.__bvh_owners)
+        if max(dropped, len(self.__bvh_changed)) > self.pick_rebuild_fraction * len(self.__objects):
+            objects = list(self.__objects.values())
+            self.__bvh = self.__segment_bvh(objects)
+            self.__bvh_objects = objects
+            self.__bvh_owners = {drawable.id: i for i, drawable in enumerate(objects)}
+            self.__bvh_changed.clear()
+            self.__changed_bvh = None
+            self.__changed_bvh_objects = []
+        elif self.__bvh_changed and self.__changed_bvh is None:
+            self.__changed_bvh_objects = list(self.__bvh_changed.values())
+            self.__changed_bvh = self.__segment_bvh(self.__changed_bvh_objects)
+
+    @staticmethod
+    def __segment_bvh(objects: list[DrawableObject]) -> SegmentBVH | None:
+        segments: list[np.ndarray] = []
+        owners: list[np.ndarray] = []
+        polygons: list[np.ndarray] = []
+        polygon_owners: list[int] = []
+        for i, drawable in enumerate(objects):
+            world = drawable.world_vertices
+            if isinstance(drawable, Wireframe):
+                polygons.append(world)
+                polygon_owners.append(i)
+                continue
+            if isinstance(drawable, Point):
+                segments.append(np.stack((world, world), axis=1))
+            else:
+                segments.append(world[None])
+            owners.append(np.full(1, i))
+        if polygons:
+            lengths = np.fromiter((len(p) for p in polygons),
+                                  dtype=np.int64, count=len(polygons))
+            segments.append(polygon_edges(np.concatenate(polygons), lengths))
+            owners.append(np.repeat(polygon_owners, lengths))
+        if not segments:
+            return None
+        return SegmentBVH(np.concatenate(segments), np.concatenate(owners))
+
+    def __hide(self, drawable_id: uuid.UUID):
+        vertex_list = self.__vertex_lists.pop(drawable_id, None)
+        if vertex_list is not None:
+            vertex_list.delete()
+
+    def __visible_region(self) -> Bounds:
+        """
+        Window rectangle padded by the point radius so points on the border are not culled
+        """
+        w_min, w_max = self.__window.w_min, self.__window.w_max
+        vp_width = self.__window.vp.vp_max.x - self.__window.vp.vp_min.x
+        pad = (self.point_radius + 1) * (w_max.x - w_min.x) / vp_width
+        return (w_min.x - pad, w_min.y - pad, w_max.x + pad, w_max.y + pad)
+
+    @property
+    def clipping(self) -> bool:
+        """
+        When enabled lines and wireframes are clipped against the window before the viewport transform
+        """
+        return self.__clipping
+
+    @clipping.setter
+    def clipping(self, clipping: bool):
+        self.__clipping = clipping
+        self.__window_version = -1
+
+    @property
+    def shader_transform(self) -> bool:
+        """
+        Switching the mode uploads every drawable again
+        """
+        return self.__shader_transform
+
+    @shader_transform.setter
+    def shader_transform(self, enabled: bool):
+        if enabled == self.__shader_transform:
+            return
+        self.__shader_transform = enabled
+        for drawable_id in list(self.__vertex_lists):
+            self.__hide(drawable_id)
+        self.__moved.update(self.__objects)
+        self.__window_version = -1
+
+    def visible_objects(self) -> list[DrawableObject]:
+        region = self.__visible_region()
+        visible = list(self.__index.query(region).values())
+        if self.__points is not None:
+            visible.extend(self.__objects[i] for i in self.__points.query(region))
+        return visible
+
+    def __point_vertices(self, center: np.ndarray) -> np.ndarray:
+        angles = np.linspace(0.0, 2*np.pi, self.point_segments + 1)
+        rim = np.stack((np.cos(angles), np.sin(angles)),
+                       axis=1) * self.point_radius
+        triangles = np.empty((self.point_segments, 3, 2))
+        triangles[:, 0] = 0.0
+        triangles[:, 1] = rim[:-1]
+        triangles[:, 2] = rim[1:]
+        return triangles.reshape(-1, 2) + center
+
+    def __world_primitives(self, drawables: list[DrawableObject]) -> list[np.ndarray]:
+        """
+        World space vertices that go through the viewport transform for each drawable: segment end points for lines
+        and wireframes and the center for points. Big wireframes are simplified according to the zoom level. With
+        clipping enabled the segments are clipped against the window, all lines and all wireframes are clipped
+        together in one vectorized pass each. In shader_transform mode the geometry is neither simplified nor clipped,
+        it is uploaded once for every zoom level
+        """
+        w_min, w_max = self.__window.w_min, self.__window.w_max
+        region = (w_min.x, w_min.y, w_max.x, w_max.y)
+        clipping = self.__clipping and not self.__shader_transform
+        primitives: list[np.ndarray] = [np.empty((0, 2))] * len(drawables)
+        lines: list[int] = []
+        polygons: list[int] = []
+        for i, drawable in enumerate(drawables):
+            if isinstance(drawable, Point):
+                primitives[i] = drawable.world_vertices[:1]
+            elif isinstance(drawable, Line):
+                lines.append(i)
+            elif isinstance(drawable, Wireframe):
+                polygons.append(i)
+            else:
+                raise TypeError(
+                    f'Can not draw {drawable.__class__.__name__}')
+
+        if lines:
+            segments = np.stack([drawables[i].world_vertices for i in lines])
+            if clipping:
+                segments, visible = clip_segments(segments, region)
+                segments[~visible] = np.nan
+            for i, segment in zip(lines, segments):
+                if not np.isnan(segment[0, 0]):
+                    primitives[i] = segment
+
+        if polygons:
+            tolerance = self.lod_pixel_error * self.__window.pixel_size
+            lod_min_vertices = math.inf if self.__shader_transform else self.lod_min_vertices
+            world = [drawables[i].simplified_world_vertices(tolerance)
+                     if DrawableObject.geometry_buffer.length(drawables[i].slot) >= lod_min_vertices
+                     else drawables[i].world_vertices for i in polygons]
+            lengths = np.fromiter((len(w) for w in world),
+                                  dtype=np.int64, count=len(world))
+            if clipping:
+                edges, counts = clip_polygon_edges(
+                    np.concatenate(world), lengths, region)
+            else:
+                edges, counts = polygon_edges(
+                    np.concatenate(world), lengths), lengths
+            for i, polygon in zip(polygons, np.split(edges, np.cumsum(counts)[:-1])):
+                primitives[i] = polygon.reshape(-1, 2)
+        return primitives
+
+    def __build_vertices(self, drawable: DrawableObject, points: np.ndarray) -> tuple[int, np.ndarray, np.ndarray | None]:
+        """
+        Returns the drawing mode, the positions and the pixel offsets of a drawable, given its primitives in viewport
+        coordinates. In shader_transform mode the primitives are in world coordinates and the point disc goes in the
+        offsets, otherwise there are no offsets
+        """
+        if isinstance(drawable, Point):
+            disc = self.__point_vertices(np.zeros(2))
+            if self.__shader_transform:
+                return GL_TRIANGLES, np.repeat(points[:1], len(disc), axis=0), disc
+            return GL_TRIANGLES, disc + points[0], None
+        if self.__shader_transform:
+            return GL_LINES, points, np.zeros_like(points)
+        return GL_LINES, points, None
+
+    def __upload(self, drawable: DrawableObject, points: np.ndarray):
+        if len(points) == 0:
+            self.__hide(drawable.id)
+            return
+        mode, positions, offsets = self.__build_vertices(drawable, points)
+        count = len(positions)
+        vertices = positions.ravel().tolist()
+        vertex_list = self.__vertex_lists.get(drawable.id)
+        if vertex_list is not None:
+            if vertex_list.count != count:
+                vertex_list.resize(count)
+                vertex_list.colors[:] = self.__color_of(drawable) * count
+            vertex_list.position[:] = vertices
+            if offsets is not None:
+                vertex_list.offset[:] = offsets.ravel().tolist()
             return
-        self.__objects.append(object)
-        self.__evt_sys.fire(Event.DRAWABLE_ADDED, object)
-
-    def __create_polygon_lines(self, polygon: Wireframe) -> list[pyglet.shapes.ShapeBase]:
-        points = polygon.points
-        points_len = len(points)
-        lines = []
-        for i in range(1, points_len):
-            pi = self.__window.world_to_viewport(points[i])
-            pj = self.__window.world_to_viewport(points[i-1])
-            l = pyglet.shapes.Line(pj.x, pj.y, pi.x, pi.y, batch=self.__batch)
-            lines.append(l)
-        plast = self.__window.world_to_viewport(points[points_len-1])
-        pstart = self.__window.world_to_viewport(points[0])
-        l = pyglet.shapes.Line(plast.x, plast.y, pstart.x,
-                               pstart.y, batch=self.__batch)
-        lines.append(l)
-        return lines
+        if offsets is None:
+            self.__vertex_lists[drawable.id] = self.__program.vertex_list(
+                count, mode, batch=self.__batch,
+                position=('f', vertices), colors=('Bn', self.__color_of(drawable) * count))
+            return
+        self.__vertex_lists[drawable.id] = self.__world_program.vertex_list(
+            count, mode, batch=self.__batch, position=('f', vertices),
+            offset=('f', offsets.ravel().tolist()), colors=('Bn', self.__color_of(drawable) * count))
+
+    def __color_of(self, drawable: DrawableObject) -> tuple[int, int, int, int]:
+        if self.__selected is not None and self.__selected.id == drawable.id:
+            return self.selected_color
+        return self.color
+
+    def __upload_points(self, points: list[DrawableObject]):
+        """
+        World positions of every moved point in one vectorized transform, handed to the point layer
+        """
+        for point in points:
+            point.sync_transform()
+        positions, _ = DrawableObject.geometry_buffer.transformed_many(
+            np.fromiter((p.slot for p in points), dtype=np.int64, count=len(points)))
+        ids = [p.id for p in points]
+        colors = np.empty((len(points), 4), dtype=np.uint8)
+        colors[:] = self.color
+        if self.__selected is not None and self.__selected.id in self.__points:
+            selected_ids = [i for i, point_id in enumerate(ids) if point_id == self.__selected.id]
+            colors[selected_ids] = self.selected_color
+        self.__points.set_many(ids, positions, colors)
+
+    def __upload_dirty(self):
+        """
+        Converts the world geometry of every dirty drawable to viewport coordinates with a single matmul, in
+        shader_transform mode the world geometry is uploaded as it is
+        """
+        dirty = list(self.__dirty.values())
+        world = self.__world_primitives(dirty)
+        if self.__shader_transform:
+            for drawable, points in zip(dirty, world):
+                self.__upload(drawable, points)
+            self.__dirty.clear()
+            return
+        lengths = np.fromiter((len(w) for w in world),
+                              dtype=np.int64, count=len(world))
+        viewport = self.__window.world_to_viewport_many(np.concatenate(world))
+        for drawable, points in zip(dirty, np.split(viewport, np.cumsum(lengths)[:-1])):
+            self.__upload(drawable, points)
+        self.__dirty.clear()
 
     def draw(self):
-        shapes: list[pyglet.shapes.ShapeBase] = list()
-        for drawable in self.__objects:
-            if isinstance(drawable, Line):
-                lsvp = self.__window.world_to_viewport(drawable.start)
-                levp = self.__window.world_to_viewport(drawable.end)
-                shapes.append(pyglet.shapes.Line(
-                    lsvp.x, lsvp.y, levp.x, levp.y, batch=self.__batch))
-            elif isinstance(drawable, Wireframe):
-                lines = self.__create_polygon_lines(drawable)
-                shapes.extend(lines)
-            elif isinstance(drawable, Point):
-                point = self.__window.world_to_viewport(drawable.point)
-                shapes.append(pyglet.shapes.Circle(
-                    point.x, point.y, 2, batch=self.__batch))
+        if self.__program is None:
+            self.__program = create_drawable_program()
+            self.__world_program = create_world_program()
+        region = self.__visible_region()
+        points: list[DrawableObject] = []
+        for drawable in self.__moved.values():
+            if self.__points is not None and isinstance(drawable, Point):
+                points.append(drawable)
+                continue
+            self.__index.insert(drawable.id, drawable, drawable.bounds)
+            if self.__shader_transform or intersects(drawable.bounds, region):
+                self.__dirty[drawable.id] = drawable
+            else:
+                self.__hide(drawable.id)
+        self.__moved.clear()
+        if points:
+            self.__upload_points(points)
+        # Matrix3x3 multiplies row vectors, its row major data read as a column major mat3 is the transpose the
+        # shaders need for column vectors
+        world_to_viewport = self.__window.viewport_matrix.np_mat.ravel().tolist()
+        if self.__window_version != self.__window.version:
+            self.__window_version = self.__window.version
+            if self.__shader_transform:
+                self.__world_program['world_to_viewport'] = world_to_viewport
+            else:
+                visible = self.__index.query(region)
+                for drawable_id in [i for i in self.__vertex_lists if i not in visible]:
+                    self.__hide(drawable_id)
+                self.__dirty.update(visible)
+        if self.__dirty:
+            self.__upload_dirty()
+        self.__damaged = False
+        if not self.__shader_transform and self.__points is None:
+            self.__batch.draw()
+            return
+        # neither the shader transform nor the point layer is clipped on the CPU
+        vp_min, vp_max = self.__window.vp.vp_min, self.__window.vp.vp_max
+        glEnable(GL_SCISSOR_TEST)
+        glScissor(int(vp_min.x), int(vp_min.y), int(vp_max.x - vp_min.x), int(vp_max.y - vp_min.y))
         self.__batch.draw()
+        if self.__points is not None:
+            self.__points.draw(world_to_viewport, 2 * self.point_radius)
+        glDisable(GL_SCISSOR_TEST)
+
+
+# same order as ipc_protocol.KINDS, kinds are passed around as indices into either of them
+KINDS = (Point, Line, Wireframe)
+# vertex count bounds of each kind, the same the constructors enforce
+_min_vertices = np.array([1, 2, 3], dtype=np.int64)
+_max_vertices = np.array([1, 2, np.iinfo(np.int64).max], dtype=np.int64)
+
+
+def check_kinds(kinds: np.ndarray, lengths: np.ndarray):
+    """
+    Raises ValueError unless every kind indexes KINDS and has a vertex count its class accepts
+    """
+    kinds = np.asarray(kinds, dtype=np.int64)
+    lengths = np.asarray(lengths, dtype=np.int64)
+    if kinds.shape != lengths.shape:
+        raise ValueError('There must be one kind for every vertex count')
+    unknown = (kinds < 0) | (kinds >= len(KINDS))
+    if unknown.any():
+        raise ValueError(f'Unknown drawable kind {int(kinds[np.argmax(unknown)])}')
+    bad = (lengths < _min_vertices[kinds]) | (lengths > _max_vertices[kinds])
+    if bad.any():
+        index = int(np.argmax(bad))
+        raise ValueError(f'A {KINDS[kinds[index]].__name__} can not have {int(lengths[index])} vertices')
+
+
+def create_drawables(kinds: np.ndarray, vertices: np.ndarray, lengths: np.ndarray,
+                     names: List[str | None] | None = None) -> List[DrawableObject]:
+    """
+    Creates many drawables at once, kinds holds an index into KINDS for each of them and their vertices are copied to
+    the geometry buffer in a single allocate_many. Raises ValueError when a kind and its vertex count do not agree
+    """
+    check_kinds(kinds, lengths)
+    slots = DrawableObject.geometry_buffer.allocate_many(vertices, lengths).tolist()
+    if names is None:
+        names = [None] * len(slots)
+    classes = [KINDS[kind] for kind in np.asarray(kinds).tolist()]
+    # none of the new objects is garbage, but creating this many of them would trigger a collection over the whole
+    # heap every few hundred allocations
+    collecting = gc.isenabled()
+    gc.disable()
+    try:
+        return [cls.from_slot(slot, name) for cls, slot, name in zip(classes, slots, names)]
+    finally:
+        if collecting:
+            gc.enable()
@@ -1,6 +1,8 @@
-from typing import Dict, Callable
+from typing import Any, Callable, Dict, List, Tuple
 from enum import Enum
-import uuid
+import itertools
+import time
+from profiler import Profiler
 
 
 class Event(Enum):
@@ -11,25 +13,118 @@ class Event(Enum):
     DRAWABLE_ADDED = 4
     REMOVE_DRAWALBE = 5
     DRAWABLE_REMOVED = 6
+    ADD_DRAWABLES = 7
+    DRAWABLES_ADDED = 8
+    REMOVE_DRAWABLES = 9
+    DRAWABLES_REMOVED = 10
+    SCENE_PUBLISHED = 11
+    SAVE_SCENE = 12
+    LOAD_SCENE = 13
+    IMPORT_FILE = 14
+    EXPORT_FILE = 15
+    CANCEL_TRANSFER = 16
+    TRANSFER_PROGRESS = 17
+    CREATE_DRAWABLES = 18
+    DRAWABLE_TRANSFORMED = 19
+    SHOW_ERROR = 20
+
+
+def merge_mouse_move(pending: Tuple, fired: Tuple) -> Tuple:
+    """
+    The latest position wins, the deltas add up
+    """
+    return fired[0], pending[1] + fired[1]
+
+
+def merge_sum(pending: Tuple, fired: Tuple) -> Tuple:
+    return (pending[0] + fired[0],)
+
+
+# events that can be coalesced while they wait in the queue, mapped to the function that merges their arguments
+mergeable_events: Dict[Event, Callable[[Tuple, Tuple], Tuple]] = {
+    Event.MOUSE_MOVE: merge_mouse_move,
+    Event.MOVE_WINDOW: merge_sum,
+    Event.ZOOM_WINDOW: merge_sum,
+}
 
 
 class EventSystem:
 
-    def __init__(self) -> None:
-        self.__callbacks: Dict[Event, Dict[uuid.UUID, Callable]] = dict()
+    """
+    Dispatches events to the registered callbacks.
+    By default fire calls the callbacks right away. In queued mode fire only enqueues the event and drain, called once
+    per frame, dispatches everything that was queued. Mergeable events that are already waiting in the queue are
+    merged with the new one instead of being queued again
+    """
 
-    def register_callback(self, event: Event, callback: Callable) -> uuid.UUID:
-        callback_id = uuid.uuid4()
+    def __init__(self, queued: bool = False, profiler: Profiler | None = None) -> None:
+        self.__callbacks: Dict[Event, Dict[int, Callable]] = dict()
+        self.__handles = itertools.count()
+        self.__queued = queued
+        self.__queue: List[List[Any]] = []
+        self.__pending: Dict[Event, List[Any]] = dict()
+        self.__profiler = profiler
+
+    @property
+    def queued(self) -> bool:
+        return self.__queued
+
+    def register_callback(self, event: Event, callback: Callable) -> int:
+        callback_id = next(self.__handles)
         if event not in self.__callbacks:
             self.__callbacks[event] = dict()
         self.__callbacks[event][callback_id] = callback
         return callback_id
 
-    def remove_callback(self, event: Event, callback_id: uuid.UUID):
+    def remove_callback(self, event: Event, callback_id: int):
         if event in self.__callbacks and callback_id in self.__callbacks[event]:
             del self.__callbacks[event][callback_id]
 
     def fire(self, event: Event, *args, **kwargs):
+        if self.__queued:
+            self.post(event, *args, **kwargs)
+        else:
+            self.dispatch(event, *args, **kwargs)
+
+    def post(self, event: Event, *args, **kwargs):
+        """
+        Enqueues an event until the next drain, no matter the mode
+        """
+        merge = mergeable_events.get(event)
+        if merge is not None and not kwargs:
+            pending = self.__pending.get(event)
+            if pending is not None:
+                pending[1] = merge(pending[1], args)
+                return
+            entry = [event, args, kwargs]
+            self.__pending[event] = entry
+            self.__queue.append(entry)
+            return
+        self.__queue.append([event, args, kwargs])
+
+    def dispatch(self, event: Event, *args, **kwargs):
+        """
+        Calls the callbacks of an event right away, no matter the mode. The time they take is recorded per event
+        type when the profiler is enabled
+        """
         if event in self.__callbacks:
-            for callback_id in self.__callbacks[event]:
-                self.__callbacks[event][callback_id](*args, **kwargs)
+            profiler = self.__profiler
+            if profiler is not None and profiler.enabled:
+                start = time.perf_counter()
+                for callback in tuple(self.__callbacks[event].values()):
+                    callback(*args, **kwargs)
+                profiler.record('event.' + event.name, time.perf_counter() - start)
+                return
+            for callback in tuple(self.__callbacks[event].values()):
+                callback(*args, **kwargs)
+
+    def drain(self):
+        """
+        Dispatches every queued event, events fired by the callbacks are dispatched in the same drain
+        """
+        while self.__queue:
+            queue = self.__queue
+            self.__queue = []
+            self.__pending.clear()
+            for event, args, kwargs in queue:
+                self.dispatch(event, *args, **kwargs)
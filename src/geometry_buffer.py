@@ -0,0 +1,169 @@
+import numpy as np
+
+
+class GeometryBuffer:
+
+    """
+    Scene level structure of arrays holding the vertices of every drawable in one contiguous array.
+    Drawables refer to their geometry through a slot, the slot table maps it to an offset and a length
+    inside the vertex array. Slots stay valid when the vertex array grows or gets compacted, views returned
+    by this class do not, so they should never be stored
+    """
+
+    min_compaction_size = 4096
+
+    def __init__(self, vertex_capacity: int = 1024, slot_capacity: int = 256, dtype=np.float64):
+        self.__vertices = np.empty((vertex_capacity, 2), dtype=dtype)
+        self.__vertex_count = 0
+        self.__garbage = 0
+        self.__offsets = np.zeros(slot_capacity, dtype=np.int64)
+        self.__lengths = np.zeros(slot_capacity, dtype=np.int64)
+        self.__transforms = np.empty((slot_capacity, 3, 3), dtype=dtype)
+        self.__alive = np.zeros(slot_capacity, dtype=np.bool_)
+        self.__slot_count = 0
+        self.__free_slots: list[int] = []
+
+    @property
+    def vertex_count(self) -> int:
+        """
+        Amount of vertices owned by live slots
+        """
+        return self.__vertex_count - self.__garbage
+
+    @property
+    def slot_count(self) -> int:
+        return int(np.count_nonzero(self.__alive[:self.__slot_count]))
+
+    @property
+    def nbytes(self) -> int:
+        return (self.__vertices.nbytes + self.__offsets.nbytes + self.__lengths.nbytes
+                + self.__transforms.nbytes + self.__alive.nbytes)
+
+    def allocate(self, vertices: np.ndarray) -> int:
+        """
+        Copies a N×2 array of vertices into the buffer and returns the slot that owns them
+        """
+        return int(self.allocate_many(vertices, np.array([len(vertices)]))[0])
+
+    def allocate_many(self, vertices: np.ndarray, lengths: np.ndarray) -> np.ndarray:
+        """
+        Copies the vertices of several objects at once, lengths holds the amount of vertices of each object
+        """
+        lengths = np.asarray(lengths, dtype=np.int64)
+        total = int(lengths.sum())
+        if total != len(vertices):
+            raise ValueError('lengths do not add up to the amount of vertices')
+        self.__reserve_vertices(total)
+        start = self.__vertex_count
+        self.__vertices[start:start + total] = vertices
+        self.__vertex_count += total
+
+        slots = self.__take_slots(len(lengths))
+        offsets = np.empty_like(lengths)
+        offsets[0:1] = start
+        np.cumsum(lengths[:-1], out=offsets[1:])
+        offsets[1:] += start
+        self.__offsets[slots] = offsets
+        self.__lengths[slots] = lengths
+        self.__transforms[slots] = np.eye(3)
+        self.__alive[slots] = True
+        return slots
+
+    def free(self, slot: int):
+        if not self.__alive[slot]:
+            return
+        self.__alive[slot] = False
+        self.__garbage += int(self.__lengths[slot])
+        self.__lengths[slot] = 0
+        self.__free_slots.append(slot)
+        if self.__garbage > self.__vertex_count // 2 and self.__vertex_count > self.min_compaction_size:
+            self.compact()
+
+    def vertices(self, slot: int) -> np.ndarray:
+        """
+        View of the untransformed vertices of a slot
+        """
+        offset = self.__offsets[slot]
+        return self.__vertices[offset:offset + self.__lengths[slot]]
+
+    def length(self, slot: int) -> int:
+        return int(self.__lengths[slot])
+
+    def transform(self, slot: int) -> np.ndarray:
+        return self.__transforms[slot]
+
+    def set_transform(self, slot: int, transformation: np.ndarray):
+        self.__transforms[slot] = transformation
+
+    def transformed(self, slot: int) -> np.ndarray:
+        """
+        Vertices of a slot multiplied by its transformation
+        """
+        mat = self.__transforms[slot]
+        return self.vertices(slot) @ mat[:2, :2] + mat[2, :2]
+
+    def transformed_many(self, slots: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Transforms the vertices of several slots at once, returns the concatenated vertices and the length of each slot
+        """
+        slots = np.asarray(slots, dtype=np.int64)
+        lengths = self.__lengths[slots]
+        vertex_slots = np.repeat(slots, lengths)
+        starts = np.repeat(self.__offsets[slots] - np.cumsum(lengths) + lengths, lengths)
+        indices = starts + np.arange(len(vertex_slots))
+        mats = self.__transforms[vertex_slots]
+        vertices = self.__vertices[indices]
+        result = np.einsum('ni,nij->nj', vertices, mats[:, :2, :2]) + mats[:, 2, :2]
+        return result, lengths
+
+    def compact(self):
+        """
+        Moves the vertices of every live slot to the start of the array, dropping the holes left by freed slots
+        """
+        live = np.flatnonzero(self.__alive[:self.__slot_count])
+        live = live[np.argsort(self.__offsets[live], kind='stable')]
+        lengths = self.__lengths[live]
+        new_offsets = np.cumsum(lengths) - lengths
+        indices = np.repeat(self.__offsets[live] - new_offsets, lengths) + \
+            np.arange(int(lengths.sum()))
+        self.__vertices[:len(indices)] = self.__vertices[indices]
+        self.__offsets[live] = new_offsets
+        self.__vertex_count = len(indices)
+        self.__garbage = 0
+
+    def __reserve_vertices(self, amount: int):
+        required = self.__vertex_count + amount
+        if required <= len(self.__vertices):
+            return
+        if self.__garbage > 0:
+            self.compact()
+            required = self.__vertex_count + amount
+            if required <= len(self.__vertices):
+                return
+        capacity = max(required, 2 * len(self.__vertices))
+        vertices = np.empty((capacity, 2), dtype=self.__vertices.dtype)
+        vertices[:self.__vertex_count] = self.__vertices[:self.__vertex_count]
+        self.__vertices = vertices
+
+    def __take_slots(self, amount: int) -> np.ndarray:
+        reused_count = min(amount, len(self.__free_slots))
+        reused = self.__free_slots[len(self.__free_slots) - reused_count:]
+        del self.__free_slots[len(self.__free_slots) - reused_count:]
+        missing = amount - len(reused)
+        if self.__slot_count + missing > len(self.__alive):
+            self.__grow_slots(self.__slot_count + missing)
+        fresh = np.arange(self.__slot_count, self.__slot_count + missing)
+        self.__slot_count += missing
+        return np.concatenate((np.array(reused, dtype=np.int64), fresh))
+
+    def __grow_slots(self, required: int):
+        capacity = max(required, 2 * len(self.__alive))
+        extra = capacity - len(self.__alive)
+        self.__offsets = np.concatenate(
+            (self.__offsets, np.zeros(extra, dtype=np.int64)))
+        self.__lengths = np.concatenate(
+            (self.__lengths, np.zeros(extra, dtype=np.int64)))
+        self.__transforms = np.concatenate(
+            (self.__transforms, np.empty((extra, 3, 3), dtype=self.__transforms.dtype)))
+        self.__alive = np.concatenate(
+            (self.__alive, np.zeros(extra, dtype=np.bool_)))
@@ -0,0 +1,128 @@
+"""
+Undo log of the scene made of deltas instead of snapshots.
+
+An entry stores only what changed: the drawables that were added or removed, or the transform of a drawable before
+and after it changed. Drawables are kept by reference, so their vertices stay where they are in the geometry buffer
+and are never copied, and undoing or redoing an entry costs as much as the change it records, no matter how large
+the scene is. Removed drawables are kept alive by the entries that refer to them, which is what the memory budget
+accounts for: when it is exceeded the oldest entries are dropped and the geometry only they held is freed
+"""
+from collections import deque
+from enum import Enum
+from typing import Deque, List, NamedTuple, Tuple
+from drawable import DrawableObject, Transform
+
+
+class Change(Enum):
+    ADD = 0
+    REMOVE = 1
+    TRANSFORM = 2
+
+
+class Delta(NamedTuple):
+    change: Change
+    drawables: Tuple[DrawableObject, ...]
+    before: Transform | None
+    after: Transform | None
+    nbytes: int
+
+
+class History:
+
+    """
+    Undo and redo stacks of deltas under a memory budget of max_bytes. Recording a delta drops everything that could be
+    redone. The size of an entry is an estimate: a fixed cost per drawable plus the vertices it keeps alive
+    """
+
+    drawable_size = 512
+    vertex_size = 2 * 8
+    transform_size = 256
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024):
+        self.__max_bytes = max_bytes
+        self.__undo: Deque[Delta] = deque()
+        self.__redo: List[Delta] = []
+        self.__nbytes = 0
+
+    @property
+    def max_bytes(self) -> int:
+        return self.__max_bytes
+
+    @max_bytes.setter
+    def max_bytes(self, max_bytes: int):
+        self.__max_bytes = max_bytes
+        self.__evict()
+
+    @property
+    def nbytes(self) -> int:
+        return self.__nbytes
+
+    @property
+    def can_undo(self) -> bool:
+        return bool(self.__undo)
+
+    @property
+    def can_redo(self) -> bool:
+        return bool(self.__redo)
+
+    def __len__(self) -> int:
+        return len(self.__undo) + len(self.__redo)
+
+    def record_add(self, drawables: List[DrawableObject]):
+        self.__record(Change.ADD, drawables)
+
+    def record_remove(self, drawables: List[DrawableObject]):
+        self.__record(Change.REMOVE, drawables)
+
+    def record_transform(self, drawable: DrawableObject, before: Transform, after: Transform):
+        self.__push(Delta(Change.TRANSFORM, (drawable,), before, after, self.transform_size))
+
+    def undo(self) -> Delta | None:
+        """
+        Moves the latest delta to the redo stack and returns it, the caller reverts it
+        """
+        if not self.__undo:
+            return None
+        delta = self.__undo.pop()
+        self.__redo.append(delta)
+        return delta
+
+    def redo(self) -> Delta | None:
+        """
+        Moves the latest undone delta back to the undo stack and returns it, the caller applies it again
+        """
+        if not self.__redo:
+            return None
+        delta = self.__redo.pop()
+        self.__undo.append(delta)
+        return delta
+
+    def clear(self):
+        self.__undo.clear()
+        self.__redo.clear()
+        self.__nbytes = 0
+
+    def __record(self, change: Change, drawables: List[DrawableObject]):
+        if not drawables:
+            return
+        geometry = DrawableObject.geometry_buffer
+        vertices = sum(geometry.length(d.slot) for d in drawables if d.slot is not None)
+        nbytes = len(drawables) * self.drawable_size + vertices * self.vertex_size
+        self.__push(Delta(change, tuple(drawables), None, None, nbytes))
+
+    def __push(self, delta: Delta):
+        for dropped in self.__redo:
+            self.__nbytes -= dropped.nbytes
+        self.__redo.clear()
+        self.__undo.append(delta)
+        self.__nbytes += delta.nbytes
+        self.__evict()
+
+    def __evict(self):
+        """
+        Drops the oldest undo entries first and then the redo entries farthest from the present
+        """
+        while self.__nbytes > self.__max_bytes and self.__undo:
+            self.__nbytes -= self.__undo.popleft().nbytes
+        while self.__nbytes > self.__max_bytes and self.__redo:
+            self.__nbytes -= self.__redo.pop(0).nbytes
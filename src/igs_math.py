@@ -1,105 +1,189 @@
 from __future__ import annotations, division
+import math
 import numpy as np
 
 
 class Matrix3x3:
     """
     Nice interface to encapsulate a numpy matrix
+
+    The matrices are affine and use the row vector convention (v' = v @ M), so the translation lives in the last row.
+    Matrices are immutable: the backing array is float64 and read only, which lets np_mat hand it out without copying,
+    and the builder methods (identity, translate, rotate, scale, invert) return a new matrix, so cached matrices can be
+    shared freely. from_trs, compose, inverse and apply are closed form versions for hot paths
     """
 
-    def __init__(self):
-        self.identity()
+    __slots__ = ('__np_mat', '__coeffs')
+
+    def __init__(self, values: np.ndarray | None = None):
+        self.__set(np.eye(3, dtype=np.float64) if values is None else np.array(values, dtype=np.float64))
 
     def __repr__(self) -> str:
         return self.__np_mat.__repr__()
 
-    def identity(self):
-        self.__np_mat: np.ndarray = np.array([[1, 0, 0], [0, 1, 0], [0, 0, 1]])
-
-    def translate(self, offset: Vector2):
-        trans_mat = np.array([[1, 0, 0], [0, 1, 0], [offset.x, offset.y, 1]])
-        self.__np_mat = self.__np_mat @ trans_mat
-
-    def rotate(self, angle: float):
+    @classmethod
+    def from_affine(cls, a: float, b: float, c: float, d: float, tx: float, ty: float) -> Matrix3x3:
+        """
+        Builds [[a, b, 0], [c, d, 0], [tx, ty, 1]] without any matrix multiplication
+        """
+        mat = cls.__new__(cls)
+        np_mat = np.array([[a, b, 0.0], [c, d, 0.0], [tx, ty, 1.0]])
+        np_mat.flags.writeable = False
+        mat.__np_mat = np_mat
+        mat.__coeffs = (a, b, c, d, tx, ty)
+        return mat
+
+    @classmethod
+    def from_trs(cls, translation: Vector2, rotation: float, scale: Vector2) -> Matrix3x3:
+        """
+        Same result as Matrix3x3.identity().scale(scale).rotate(rotation).translate(translation), in closed form
+        """
+        cos, sin = math.cos(rotation), math.sin(rotation)
+        return cls.from_affine(scale.x * cos, -scale.x * sin, scale.y * sin, scale.y * cos,
+                               translation.x, translation.y)
+
+    def __set(self, np_mat: np.ndarray):
+        np_mat.flags.writeable = False
+        self.__np_mat = np_mat
+        m = np_mat
+        if m[0, 2] == 0.0 and m[1, 2] == 0.0 and m[2, 2] == 1.0:
+            self.__coeffs: tuple[float, ...] | None = (float(m[0, 0]), float(m[0, 1]), float(m[1, 0]),
+                                                       float(m[1, 1]), float(m[2, 0]), float(m[2, 1]))
+        else:
+            self.__coeffs = None
+
+    @classmethod
+    def identity(cls) -> Matrix3x3:
+        return cls()
+
+    def translate(self, offset: Vector2) -> Matrix3x3:
+        trans_mat = np.array([[1, 0, 0], [0, 1, 0], [offset.x, offset.y, 1]], dtype=np.float64)
+        return Matrix3x3(self.__np_mat @ trans_mat)
+
+    def rotate(self, angle: float) -> Matrix3x3:
         cos, sin = np.cos(angle), np.sin(angle)
-        rot_mat = np.array([[cos, -sin, 0], [sin, cos, 0], [0, 0, 1]])
-        self.__np_mat = self.__np_mat @ rot_mat
-
-    def scale(self, scale: Vector2):
-        scale_mat = np.array([[scale.x, 0, 0], [0, scale.y, 0], [0, 0, 1]])
-        self.__np_mat = self.__np_mat @ scale_mat
-
-    def invert(self):
-        self.__np_mat = np.linalg.inv(self.__np_mat)
+        rot_mat = np.array([[cos, -sin, 0], [sin, cos, 0], [0, 0, 1]], dtype=np.float64)
+        return Matrix3x3(self.__np_mat @ rot_mat)
+
+    def scale(self, scale: Vector2) -> Matrix3x3:
+        scale_mat = np.array([[scale.x, 0, 0], [0, scale.y, 0], [0, 0, 1]], dtype=np.float64)
+        return Matrix3x3(self.__np_mat @ scale_mat)
+
+    def invert(self) -> Matrix3x3:
+        return self.inverse()
+
+    def compose(self, other: Matrix3x3) -> Matrix3x3:
+        """
+        Returns self @ other, i.e. self is applied first
+        """
+        if self.__coeffs is None or other.__coeffs is None:
+            return Matrix3x3(self.__np_mat @ other.__np_mat)
+        a, b, c, d, tx, ty = self.__coeffs
+        oa, ob, oc, od, otx, oty = other.__coeffs
+        return Matrix3x3.from_affine(a * oa + b * oc, a * ob + b * od,
+                                     c * oa + d * oc, c * ob + d * od,
+                                     tx * oa + ty * oc + otx, tx * ob + ty * od + oty)
+
+    def inverse(self) -> Matrix3x3:
+        if self.__coeffs is None:
+            return Matrix3x3(np.linalg.inv(self.__np_mat))
+        a, b, c, d, tx, ty = self.__coeffs
+        det = a * d - b * c
+        if det == 0.0:
+            raise np.linalg.LinAlgError('Singular matrix')
+        na, nb, nc, nd = d / det, -b / det, -c / det, a / det
+        return Matrix3x3.from_affine(na, nb, nc, nd,
+                                     -(tx * na + ty * nc), -(tx * nb + ty * nd))
+
+    def apply(self, vec: Vector2) -> Vector2:
+        """
+        Same as vec * self
+        """
+        if self.__coeffs is None:
+            result = np.array([vec.x, vec.y, 1.0]) @ self.__np_mat
+            return Vector2(result[0], result[1])
+        a, b, c, d, tx, ty = self.__coeffs
+        x, y = vec.x, vec.y
+        return Vector2(x * a + y * c + tx, x * b + y * d + ty)
+
+    def apply_many(self, points: np.ndarray) -> np.ndarray:
+        """
+        Transforms a N×2 (or homogeneous N×3) array with a single matmul
+        """
+        mat = self.__np_mat
+        if points.shape[-1] == 3:
+            return points @ mat
+        return points @ mat[:2, :2] + mat[2, :2]
 
     @property
     def np_mat(self) -> np.ndarray:
-        return np.copy(self.__np_mat)
+        """
+        Read only view of the matrix, copy it before modifying
+        """
+        return self.__np_mat
 
 
 class Vector2:
     """
-    This class encapsulates a numpy matrix to provide a nice interface for creating points and transforming them
+    Plain pair of floats with a nice interface for creating points and transforming them
     """
 
-    def __init__(self, x: float, y: float):
-        self.__np_vec: np.ndarray = np.array([[x, y, 1.0]])
-
-    @property
-    def x(self) -> float:
-        return self.__np_vec[0, 0]
+    __slots__ = ('x', 'y')
 
-    @property
-    def y(self) -> float:
-        return self.__np_vec[0][1]
-
-    @x.setter
-    def x(self, value: float):
-        self.__np_vec[0, 0] = value
-
-    @y.setter
-    def y(self, value: float):
-        self.__np_vec[0, 1] = value
+    def __init__(self, x: float, y: float):
+        self.x: float = x
+        self.y: float = y
 
     def __repr__(self) -> str:
-        return self.__np_vec.__repr__()
+        return f'Vector2({self.x!r}, {self.y!r})'
 
     def __add__(self, other: Vector2) -> Vector2:
         return Vector2(self.x + other.x, self.y + other.y)
 
     def __iadd__(self, other: Vector2) -> Vector2:
-        self.__np_vec += np.array([[other.x, other.y, 0.0]])
+        self.x += other.x
+        self.y += other.y
         return self
 
     def __sub__(self, other: Vector2) -> Vector2:
         return Vector2(self.x - other.x, self.y - other.y)
 
     def __isub__(self, other: Vector2) -> Vector2:
-        self.__np_vec -= np.array([[other.x, other.y, 0.0]])
+        self.x -= other.x
+        self.y -= other.y
         return self
 
     @property
-    def np_vec(self):
-        return self.__np_vec
+    def np_vec(self) -> np.ndarray:
+        """
+        Homogeneous 1×3 row vector
+        """
+        return np.array([[self.x, self.y, 1.0]])
 
     def __mul__(self, other: Matrix3x3 | float) -> Vector2:
         if isinstance(other, Matrix3x3):
-            result = self.__np_vec @ other.np_mat
-        elif isinstance(other, float):
-            result = self.__np_vec * other
-        return Vector2(result[0, 0], result[0, 1])
+            return other.apply(self)
+        return Vector2(self.x * other, self.y * other)
 
     def __imul__(self, other: Matrix3x3 | float):
         if isinstance(other, Matrix3x3):
-            self.__np_vec = self.__np_vec @ other.np_mat
-        elif isinstance(other, float):
-            self.__np_vec *= other
+            result = other.apply(self)
+            self.x, self.y = result.x, result.y
+        else:
+            self.x *= other
+            self.y *= other
         return self
 
     def __truediv__(self, other: float) -> Vector2:
         return Vector2(self.x/other, self.y/other)
 
 
+def to_np_array(vectors: list[Vector2]) -> np.ndarray:
+    """
+    Packs a list of vectors into a N×2 float array
+    """
+    return np.array([(v.x, v.y) for v in vectors], dtype=np.float64).reshape(-1, 2)
+
+
 myVec = Vector2(1, 0)
-myMat = Matrix3x3()
-myMat.rotate(np.pi/4)
+myMat = Matrix3x3().rotate(np.pi/4)
@@ -0,0 +1,180 @@
+"""
+Binary protocol spoken over the pipe between the pyglet window and the Qt control window.
+
+Every send is one frame holding a batch of messages:
+
+    header:  magic b'IG' | version u8 | message count u32
+    message: event u8 | payload
+
+The event byte is the Event value, payloads depend on it:
+
+    REMOVE_DRAWALBE                      id 16 bytes
+    MOVE_WINDOW / ZOOM_WINDOW            x f64 | y f64
+    SCENE_PUBLISHED                      generation u64 | name length u8 | ascii shared memory segment name
+    SAVE_SCENE / LOAD_SCENE              path length u16 | utf-8 path
+    IMPORT_FILE / EXPORT_FILE            path length u16 | utf-8 path
+    SHOW_ERROR                           message length u16 | utf-8 message
+    CANCEL_TRANSFER                      nothing
+    TRANSFER_PROGRESS                    fraction f64 | finished u8
+    CREATE_DRAWABLES                     object count u32 | vertex count u32 | kinds u8 × objects |
+                                         lengths u32 × objects | x f64, y f64 × vertices |
+                                         name lengths u16 × objects | utf-8 names
+
+All integers and floats are little endian
+"""
+import struct
+import uuid
+import numpy as np
+from typing import Any, Iterable, List, NamedTuple, Tuple
+from event_system import Event
+from igs_math import Vector2
+
+MAGIC = b'IG'
+VERSION = 7
+KINDS = ('Point', 'Line', 'Wireframe')
+
+_header = struct.Struct('<2sBI')
+_event = struct.Struct('<B')
+_vector = struct.Struct('<dd')
+_scene = struct.Struct('<QB')
+_length = struct.Struct('<H')
+_progress = struct.Struct('<d?')
+_batch = struct.Struct('<II')
+
+
+class SceneInfo(NamedTuple):
+    """
+    Where the scene table lives and which generation of it was just published, see scene_mirror
+    """
+    segment: str
+    generation: int
+
+
+class TransferProgress(NamedTuple):
+    """
+    How much of an import or export is done, as a fraction, and whether it is over
+    """
+    fraction: float
+    finished: bool
+
+
+class DrawableBatch(NamedTuple):
+    """
+    Geometry of many drawables at once: kinds index KINDS, the vertices of each drawable follow the previous one's and
+    lengths holds how many each has. A name may be None
+    """
+    kinds: np.ndarray
+    vertices: np.ndarray
+    lengths: np.ndarray
+    names: List[str | None]
+
+
+Message = Tuple[Event, Any]
+
+
+def encode(messages: Iterable[Message]) -> bytes:
+    """
+    Packs a batch of messages into one frame. REMOVE_DRAWALBE takes an id,
+    the window events take a Vector2, SCENE_PUBLISHED a SceneInfo, the file events a path, SHOW_ERROR a message,
+    TRANSFER_PROGRESS a TransferProgress, CREATE_DRAWABLES a DrawableBatch and CANCEL_TRANSFER nothing
+    """
+    parts: List[bytes] = []
+    count = 0
+    for event, payload in messages:
+        parts.append(_event.pack(event.value))
+        match event:
+            case Event.REMOVE_DRAWALBE:
+                parts.append(payload.bytes)
+            case Event.MOVE_WINDOW | Event.ZOOM_WINDOW:
+                parts.append(_vector.pack(payload.x, payload.y))
+            case Event.SCENE_PUBLISHED:
+                segment = payload.segment.encode('ascii')
+                parts.append(_scene.pack(payload.generation, len(segment)))
+                parts.append(segment)
+            case Event.SAVE_SCENE | Event.LOAD_SCENE | Event.IMPORT_FILE | Event.EXPORT_FILE | Event.SHOW_ERROR:
+                text = payload.encode('utf-8')[:0xFFFF]
+                parts.append(_length.pack(len(text)))
+                parts.append(text)
+            case Event.CANCEL_TRANSFER:
+                pass
+            case Event.TRANSFER_PROGRESS:
+                parts.append(_progress.pack(payload.fraction, payload.finished))
+            case Event.CREATE_DRAWABLES:
+                # every column goes over as raw array bytes, only the names are handled one by one
+                names = [(name or '').encode('utf-8')[:0xFFFF] for name in payload.names]
+                parts.append(_batch.pack(len(payload.lengths), len(payload.vertices)))
+                parts.append(np.asarray(payload.kinds, dtype=np.uint8).tobytes())
+                parts.append(np.asarray(payload.lengths, dtype='<u4').tobytes())
+                parts.append(np.asarray(payload.vertices, dtype='<f8').tobytes())
+                parts.append(np.fromiter(map(len, names), dtype='<u2', count=len(names)).tobytes())
+                parts.append(b''.join(names))
+            case _:
+                raise ValueError(f'{event} can not be sent over the pipe')
+        count += 1
+    return _header.pack(MAGIC, VERSION, count) + b''.join(parts)
+
+
+def _decode_batch(view: memoryview, offset: int) -> Tuple[DrawableBatch, int]:
+    objects, vertex_count = _batch.unpack_from(view, offset)
+    offset += _batch.size
+    kinds = np.frombuffer(view, np.uint8, objects, offset)
+    offset += objects
+    lengths = np.frombuffer(view, '<u4', objects, offset).astype(np.int64)
+    offset += 4 * objects
+    vertices = np.frombuffer(view, '<f8', 2 * vertex_count, offset).reshape(-1, 2)
+    offset += 16 * vertex_count
+    name_lengths = np.frombuffer(view, '<u2', objects, offset)
+    offset += 2 * objects
+    if int(lengths.sum()) != vertex_count or (kinds >= len(KINDS)).any():
+        raise ValueError('Malformed drawable batch')
+    if not name_lengths.any():
+        return DrawableBatch(kinds, vertices, lengths, [None] * objects), offset
+    ends = (np.cumsum(name_lengths) + offset).tolist()
+    starts = [offset] + ends[:-1]
+    names = [bytes(view[start:end]).decode('utf-8') or None for start, end in zip(starts, ends)]
+    return DrawableBatch(kinds, vertices, lengths, names), ends[-1]
+
+
+def decode(frame: bytes) -> List[Message]:
+    magic, version, count = _header.unpack_from(frame, 0)
+    if magic != MAGIC:
+        raise ValueError('Not an igs frame')
+    if version != VERSION:
+        raise ValueError(f'Unsupported protocol version {version}')
+    view = memoryview(frame)
+    offset = _header.size
+    messages: List[Message] = []
+    for _ in range(count):
+        event = Event(view[offset])
+        offset += 1
+        match event:
+            case Event.REMOVE_DRAWALBE:
+                messages.append((event, uuid.UUID(bytes=bytes(view[offset:offset + 16]))))
+                offset += 16
+            case Event.MOVE_WINDOW | Event.ZOOM_WINDOW:
+                x, y = _vector.unpack_from(view, offset)
+                offset += _vector.size
+                messages.append((event, Vector2(x, y)))
+            case Event.SCENE_PUBLISHED:
+                generation, name_length = _scene.unpack_from(view, offset)
+                offset += _scene.size
+                segment = bytes(view[offset:offset + name_length]).decode('ascii')
+                offset += name_length
+                messages.append((event, SceneInfo(segment, generation)))
+            case Event.SAVE_SCENE | Event.LOAD_SCENE | Event.IMPORT_FILE | Event.EXPORT_FILE | Event.SHOW_ERROR:
+                text_length, = _length.unpack_from(view, offset)
+                offset += _length.size
+                messages.append((event, bytes(view[offset:offset + text_length]).decode('utf-8', errors='replace')))
+                offset += text_length
+            case Event.CANCEL_TRANSFER:
+                messages.append((event, None))
+            case Event.TRANSFER_PROGRESS:
+                fraction, finished = _progress.unpack_from(view, offset)
+                offset += _progress.size
+                messages.append((event, TransferProgress(fraction, finished)))
+            case Event.CREATE_DRAWABLES:
+                batch, offset = _decode_batch(view, offset)
+                messages.append((event, batch))
+            case _:
+                raise ValueError(f'{event} can not be received over the pipe')
+    return messages
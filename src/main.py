@@ -12,8 +12,14 @@ from peripheral_manager import PeripheralManager
 from event_system import EventSystem
 from igs_math import Vector2
 from system import SystemManager
+from profiler import Profiler
 from systems.window_system import WindowSystem
+from systems.selection_system import SelectionSystem
+from systems.scene_file_system import SceneFileSystem
+from systems.import_export_system import ImportExportSystem
+from systems.history_system import HistorySystem
 from drawable import ObjectRenderer
+from scene_mirror import SceneMirrorWriter
 from PyQt5.QtWidgets import QApplication
 
 main_window_width = 800
@@ -28,25 +34,45 @@ window: Window = Window(Vector2(-main_window_width/2, -main_window_width/2),
 keyboard_manager: PeripheralManager = PeripheralManager()
 mouse_manager: PeripheralManager = PeripheralManager()
 
-event_system: EventSystem = EventSystem()
+profiler: Profiler = Profiler()
 
-sys_manager: SystemManager = SystemManager()
+event_system: EventSystem = EventSystem(queued=True, profiler=profiler)
+
+sys_manager: SystemManager = SystemManager(profiler)
 
 wireframe_renderer: ObjectRenderer = ObjectRenderer(window, event_system)
 
+scene_mirror: SceneMirrorWriter = SceneMirrorWriter(event_system)
+
 window_sys: WindowSystem = WindowSystem(
     keyboard_manager, mouse_manager, event_system, window)
 
 wireframe_spawner: ObjectSpawner = ObjectSpawner(
     keyboard_manager, mouse_manager, event_system, wireframe_renderer, window)
 
+selection_sys: SelectionSystem = SelectionSystem(
+    keyboard_manager, mouse_manager, event_system, wireframe_renderer)
+
+scene_file_sys: SceneFileSystem = SceneFileSystem(
+    keyboard_manager, mouse_manager, event_system, wireframe_renderer)
+
+import_export_sys: ImportExportSystem = ImportExportSystem(
+    keyboard_manager, mouse_manager, event_system, wireframe_renderer)
+
+history_sys: HistorySystem = HistorySystem(
+    keyboard_manager, mouse_manager, event_system, wireframe_renderer)
+
 sys_manager.add(window_sys)
 sys_manager.add(wireframe_spawner)
+sys_manager.add(selection_sys)
+sys_manager.add(scene_file_sys)
+sys_manager.add(import_export_sys)
+sys_manager.add(history_sys)
 
 control_window_conn, main_window_conn = multiprocessing.Pipe()
 
 main_window: MainWindow = MainWindow(
-    main_window_width, main_window_height, keyboard_manager, mouse_manager, event_system, viewport, window, sys_manager, wireframe_renderer, main_window_conn)
+    main_window_width, main_window_height, keyboard_manager, mouse_manager, event_system, viewport, window, sys_manager, wireframe_renderer, scene_mirror, main_window_conn, profiler)
 
 # control window needs to be a separate process because pyqt cant run in the same thread as pyglet
 # annnd both pyqt and pyglet need to use the 'main' thread
@@ -58,3 +84,4 @@ control_window_process.start()
 
 pyglet.app.run()
 control_window_process.kill()
+scene_mirror.close()
@@ -1,5 +1,7 @@
 import multiprocessing.connection
+import time
 import pyglet
+import pyglet.window.key as key
 import numpy as np
 from drawable import Line, ObjectRenderer
 from igs_math import Vector2
@@ -8,15 +10,30 @@ from window import Window
 from peripheral_manager import PeripheralManager
 from event_system import EventSystem, Event
 from system import SystemManager
-from typing import Any
+from scene_mirror import SceneMirrorWriter
+from profiler import Profiler
+import ipc_protocol
 
 
 class MainWindow(pyglet.window.Window):
 
+    """
+    F2 switches the renderer between the CPU and the shader viewport transform, F3 toggles the profiler and its HUD,
+    F4 dumps its statistics to CSV and JSON. What those keys did is shown in a status line for status_duration seconds.
+    Messages and events are handled on every tick, but the scene is only rendered and flipped when the renderer, a
+    system or the window itself was invalidated since the last frame, otherwise the last frame stays on screen.
+    damage_tracking turns that off for comparison
+    """
+
+    hud_interval = 0.25
+    status_duration = 3.0
+    damage_tracking = True
+
     def __init__(self, width: int, height: int, keyboard_manager: PeripheralManager, mouse_manager: PeripheralManager,
                  event_system: EventSystem, viewport: Viewport, window: Window,
                  sys_manager: SystemManager,
-                 object_renderer: ObjectRenderer, conn: multiprocessing.connection.Connection):
+                 object_renderer: ObjectRenderer, scene_mirror: SceneMirrorWriter,
+                 conn: multiprocessing.connection.Connection, profiler: Profiler):
         super().__init__(width, height)
         self.__viewport: Viewport = viewport
         self.__window: Window = window
@@ -26,22 +43,156 @@ class MainWindow(pyglet.window.Window):
         self.__wireframe_renderer: ObjectRenderer = object_renderer
         self.__sys_manager: SystemManager = sys_manager
         self.__conn: multiprocessing.connection.Connection = conn
+        self.__scene_mirror: SceneMirrorWriter = scene_mirror
+        self.__outbox: list[ipc_protocol.Message] = []
         self.__event_system.register_callback(
-            Event.DRAWABLE_ADDED, lambda drawable: self.__conn.send((Event.DRAWABLE_ADDED, drawable)))
+            Event.TRANSFER_PROGRESS, lambda progress: self.__outbox.append((Event.TRANSFER_PROGRESS, progress)))
         self.__event_system.register_callback(
-            Event.DRAWABLE_REMOVED, lambda drawable: self.__conn.send(
-                (Event.DRAWABLE_REMOVED, drawable))
+            Event.SHOW_ERROR, lambda message: self.__outbox.append((Event.SHOW_ERROR, message)))
+        self.__profiler = profiler
+        self.__update_phases = (
+            ('phase.receive', self.__receive_messages),
+            ('phase.drain', self.__event_system.drain),
+        )
+        self.__render_phases = (
+            ('phase.clear', self.clear),
+            ('phase.render', self.__wireframe_renderer.draw),
+            ('phase.overlay', self.__sys_manager.draw),
+            ('phase.status', self.__draw_status),
+        )
+        self.__send_phases = (
+            ('phase.send', self.__send_messages),
         )
+        self.__damaged = True
+        self.__rendered = False
+        self.__hud = pyglet.text.Label('', font_name='monospace', font_size=9, x=5, y=height - 5,
+                                       width=width - 10, multiline=True, anchor_y='top')
+        self.__hud_updated = 0.0
+        self.__status = pyglet.text.Label('', font_name='monospace', font_size=9, x=5, y=5)
+        self.__keyboard_manager.register_callback(self.toggle_shader_transform, key.F2, 0, True)
+        self.__keyboard_manager.register_callback(self.toggle_profiler, key.F3, 0, True)
+        self.__keyboard_manager.register_callback(self.dump_profile, key.F4, 0, True)
+
+    def __receive_messages(self):
+        """
+        Handles every frame waiting in the pipe, removal requests carry an id that is resolved against the renderer
+        """
+        while self.__conn.poll():
+            for event, payload in ipc_protocol.decode(self.__conn.recv_bytes()):
+                if event == Event.REMOVE_DRAWALBE:
+                    payload = self.__wireframe_renderer.get(payload)
+                    if payload is None:
+                        continue
+                if payload is None:
+                    self.__event_system.fire(event)
+                else:
+                    self.__event_system.fire(event, payload)
+
+    def __send_messages(self):
+        """
+        Everything the control window has to know about this frame goes in a single frame, scene changes are
+        published to the shared table and only announced here
+        """
+        if self.__scene_mirror.publish():
+            self.__outbox.append((Event.SCENE_PUBLISHED, self.__scene_mirror.info))
+        if self.__outbox:
+            self.__conn.send_bytes(ipc_protocol.encode(self.__outbox))
+            self.__outbox.clear()
+
+    def invalidate(self):
+        self.__damaged = True
+
+    @property
+    def needs_redraw(self) -> bool:
+        # the HUD changes on its own and a profiled frame should measure the whole frame, so profiling always renders
+        return (not self.damage_tracking or self.__damaged or self.__profiler.enabled
+                or self.__wireframe_renderer.needs_redraw or self.__sys_manager.damaged)
+
+    def draw(self, dt: float):
+        """
+        Only flips when on_draw rendered, a flip without a render would show whatever the back buffer had
+        """
+        self.switch_to()
+        self.dispatch_event('on_draw')
+        if self.__rendered:
+            self.dispatch_event('on_refresh', dt)
+            self.flip()
 
     def on_draw(self):
-        self.clear()
+        if not self.__profiler.enabled:
+            for _, phase in self.__update_phases:
+                phase()
+            self.__rendered = self.needs_redraw
+            if self.__rendered:
+                self.__damaged = False
+                for _, phase in self.__render_phases:
+                    phase()
+            for _, phase in self.__send_phases:
+                phase()
+            return
+        frame_start = time.perf_counter()
+        self.__damaged = False
+        self.__rendered = True
+        for key, phase in self.__update_phases + self.__render_phases + self.__send_phases:
+            start = time.perf_counter()
+            phase()
+            self.__profiler.record(key, time.perf_counter() - start)
+        self.__profiler.record('phase.frame', time.perf_counter() - frame_start)
+        self.__draw_hud()
+
+    def on_resize(self, width: int, height: int):
+        super().on_resize(width, height)
+        self.invalidate()
+
+    def on_expose(self):
+        self.invalidate()
+
+    def __draw_hud(self):
+        """
+        The text is only rebuilt every hud_interval seconds, laying it out every frame would cost more than most phases
+        """
+        now = time.perf_counter()
+        if now - self.__hud_updated > self.hud_interval:
+            self.__hud_updated = now
+            self.__hud.text = self.__profiler.report()
+            self.__hud.y = self.height - 5
+        self.__hud.draw()
+
+    def show_status(self, text: str):
+        """
+        Shows a line of text at the bottom of the window, it is taken off after status_duration seconds
+        """
+        self.__status.text = text
+        self.invalidate()
+        pyglet.clock.unschedule(self.__clear_status)
+        pyglet.clock.schedule_once(self.__clear_status, self.status_duration)
+
+    def __clear_status(self, dt: float):
+        self.__status.text = ''
+        self.invalidate()
+
+    def __draw_status(self):
+        if self.__status.text:
+            self.__status.draw()
+
+    def toggle_shader_transform(self):
+        renderer = self.__wireframe_renderer
+        renderer.shader_transform = not renderer.shader_transform
+        self.show_status(f'Viewport transform on the {"GPU" if renderer.shader_transform else "CPU"}')
 
-        if self.__conn.poll():
-            message: tuple[Event, Any] = self.__conn.recv()
-            self.__event_system.fire(message[0], message[1])
+    def toggle_profiler(self):
+        self.__profiler.enabled = not self.__profiler.enabled
+        # turning the profiler off has to render once more to take the HUD off the screen
+        self.invalidate()
+        if self.__profiler.enabled:
+            self.__profiler.clear()
+            self.__hud_updated = 0.0
 
-        self.__sys_manager.update()
-        self.__wireframe_renderer.draw()
+    def dump_profile(self):
+        stamp = time.strftime('%Y%m%d-%H%M%S')
+        self.__profiler.dump_json(f'profile-{stamp}.json')
+        self.__profiler.dump_csv(f'profile-{stamp}.csv')
+        self.show_status(f'Profile written to profile-{stamp}.json and profile-{stamp}.csv')
 
     def on_key_press(self, key: int, modifiers: int):
         self.__keyboard_manager.fire(key, modifiers, True)
@@ -0,0 +1,79 @@
+"""
+Builds DrawableBatch payloads for CREATE_DRAWABLES, the command that creates many drawables at once.
+
+Text is read like the CSV import: one drawable per line, an optional name followed by x, y pairs separated by commas.
+One pair makes a point, two a line and more a wireframe. Numbers are converted by numpy in a single call for the whole
+text. This module does not import pyglet, it runs in the control window process
+"""
+import itertools
+import numpy as np
+from typing import List, Sequence
+from ipc_protocol import KINDS, DrawableBatch
+
+POINT = KINDS.index('Point')
+LINE = KINDS.index('Line')
+WIREFRAME = KINDS.index('Wireframe')
+
+
+def kinds_of(lengths: np.ndarray) -> np.ndarray:
+    kinds = np.full(len(lengths), WIREFRAME, dtype=np.uint8)
+    kinds[lengths == 2] = LINE
+    kinds[lengths == 1] = POINT
+    return kinds
+
+
+def parse_text(text: str) -> DrawableBatch:
+    """
+    Raises ValueError naming the first line that can not be read
+    """
+    rows = [line.split(',') for line in text.splitlines() if line.strip()]
+    sizes = np.fromiter(map(len, rows), dtype=np.int64, count=len(rows))
+    named = sizes % 2 == 1
+    lengths = (sizes - named) // 2
+    if (lengths == 0).any():
+        raise ValueError(f'Line {int(np.argmax(lengths == 0)) + 1} has no coordinates')
+    names = [row[0].strip() or None if has_name else None for row, has_name in zip(rows, named.tolist())]
+    fields = list(itertools.chain.from_iterable(
+        row[1:] if has_name else row for row, has_name in zip(rows, named.tolist())))
+    try:
+        vertices = np.array(fields, dtype=np.float64).reshape(-1, 2)
+    except ValueError:
+        # only the error path goes line by line, to say where the bad number is
+        for number, (row, has_name) in enumerate(zip(rows, named.tolist()), 1):
+            try:
+                np.array(row[1:] if has_name else row, dtype=np.float64)
+            except ValueError as error:
+                raise ValueError(f'Line {number}: {error}') from None
+        raise
+    return DrawableBatch(kinds_of(lengths), vertices, lengths, names)
+
+
+def from_arrays(coordinates: np.ndarray | Sequence[np.ndarray],
+                names: Sequence[str | None] | None = None) -> DrawableBatch:
+    """
+    coordinates is either an N×K×2 array, N drawables of K vertices each, an N×2 array of N points or a sequence of
+    K×2 arrays
+    """
+    if isinstance(coordinates, np.ndarray) and coordinates.ndim in (2, 3):
+        lengths = np.full(len(coordinates), coordinates.shape[1] if coordinates.ndim == 3 else 1, dtype=np.int64)
+        vertices = coordinates.reshape(-1, 2)
+    else:
+        arrays = [np.asarray(c, dtype=np.float64).reshape(-1, 2) for c in coordinates]
+        lengths = np.fromiter(map(len, arrays), dtype=np.int64, count=len(arrays))
+        vertices = np.concatenate(arrays) if arrays else np.empty((0, 2))
+    if (lengths == 0).any():
+        raise ValueError('Every drawable needs at least one vertex')
+    names: List[str | None] = [None] * len(lengths) if names is None else list(names)
+    if len(names) != len(lengths):
+        raise ValueError('There must be one name for every drawable')
+    return DrawableBatch(kinds_of(lengths), np.asarray(vertices, dtype=np.float64), lengths, names)
+
+
+def load(path: str) -> DrawableBatch:
+    """
+    .npy files hold arrays for from_arrays, anything else is read as text
+    """
+    if path.lower().endswith('.npy'):
+        return from_arrays(np.load(path, allow_pickle=False))
+    with open(path, encoding='utf-8') as file:
+        return parse_text(file.read())
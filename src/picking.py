@@ -0,0 +1,104 @@
+import numpy as np
+
+
+def point_segment_distances(point: np.ndarray, segments: np.ndarray) -> np.ndarray:
+    """
+    Distance from a point to each segment of a N×2×2 array, degenerate segments behave like points
+    """
+    start = segments[:, 0]
+    delta = segments[:, 1] - start
+    length_sq = (delta * delta).sum(axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        t = ((point - start) * delta).sum(axis=1) / length_sq
+    t = np.clip(np.nan_to_num(t), 0.0, 1.0)
+    closest = start + t[:, None] * delta
+    return np.hypot(*(closest - point).T)
+
+
+class SegmentBVH:
+
+    """
+    Static bounding volume hierarchy over segments for nearest segment queries.
+    The build is fully vectorized: segments are sorted along a Morton curve of their centers, grouped in leaves of
+    leaf_size consecutive segments, and every upper level merges pairs of boxes of the level below, so the tree is
+    implicit (the children of node i are 2i and 2i + 1 one level down).
+    Removing an owner only hides its segments from the queries, the boxes keep their size
+    """
+
+    leaf_size = 16
+
+    def __init__(self, segments: np.ndarray, owners: np.ndarray):
+        """
+        segments is a N×2×2 array and owners holds, for each segment, the index of the object it belongs to
+        """
+        order = self.__morton_order(segments)
+        self.__segments = segments[order]
+        self.__owners = np.asarray(owners)[order]
+        self.__removed = np.zeros(int(self.__owners.max()) + 1, dtype=bool)
+        leaf_count = -(-len(order) // self.leaf_size)
+        padded = np.concatenate((self.__segments, np.repeat(
+            self.__segments[-1:], leaf_count * self.leaf_size - len(order), axis=0)))
+        leaves = padded.reshape(leaf_count, self.leaf_size * 2, 2)
+        level = np.concatenate((leaves.min(axis=1), leaves.max(axis=1)), axis=1)
+        self.__levels: list[np.ndarray] = [level]
+        while len(level) > 1:
+            if len(level) % 2:
+                level = np.concatenate((level, level[-1:]))
+            pairs = level.reshape(-1, 2, 4)
+            level = np.concatenate((pairs[:, :, :2].min(axis=1), pairs[:, :, 2:].max(axis=1)), axis=1)
+            self.__levels.append(level)
+        self.__level_lists = [lvl.tolist() for lvl in self.__levels]
+
+    def __len__(self) -> int:
+        return len(self.__segments)
+
+    def remove(self, owner: int):
+        self.__removed[owner] = True
+
+    @staticmethod
+    def __morton_order(segments: np.ndarray) -> np.ndarray:
+        centers = segments.mean(axis=1)
+        low, high = centers.min(axis=0), centers.max(axis=0)
+        extent = np.where(high > low, high - low, 1.0)
+        cells = ((centers - low) / extent * 65535).astype(np.uint64)
+        codes = np.zeros(len(segments), dtype=np.uint64)
+        for bit in range(16):
+            codes |= ((cells[:, 0] >> np.uint64(bit)) & np.uint64(1)) << np.uint64(2 * bit)
+            codes |= ((cells[:, 1] >> np.uint64(bit)) & np.uint64(1)) << np.uint64(2 * bit + 1)
+        return np.argsort(codes, kind='stable')
+
+    def nearest(self, x: float, y: float, max_distance: float) -> tuple[int, float] | None:
+        """
+        Owner of the segment closest to (x, y) and its distance, or None when nothing is within max_distance.
+        The tree walk only collects the leaves whose box is within max_distance, the exact distances of their
+        segments are then computed in one vectorized pass
+        """
+        limit = max_distance * max_distance
+        leaves: list[int] = []
+        stack = [(len(self.__levels) - 1, 0)]
+        while stack:
+            depth, index = stack.pop()
+            level = self.__level_lists[depth]
+            if index >= len(level):
+                continue
+            x0, y0, x1, y1 = level[index]
+            dx = max(x0 - x, 0.0, x - x1)
+            dy = max(y0 - y, 0.0, y - y1)
+            if dx * dx + dy * dy > limit:
+                continue
+            if depth == 0:
+                leaves.append(index)
+            else:
+                stack.append((depth - 1, 2 * index + 1))
+                stack.append((depth - 1, 2 * index))
+        if not leaves:
+            return None
+        indices = (np.array(leaves)[:, None] * self.leaf_size +
+                   np.arange(self.leaf_size)).ravel()
+        indices = indices[indices < len(self.__segments)]
+        distances = point_segment_distances(np.array([x, y]), self.__segments[indices])
+        distances[self.__removed[self.__owners[indices]]] = np.inf
+        closest = int(np.argmin(distances))
+        if distances[closest] > max_distance:
+            return None
+        return int(self.__owners[indices[closest]]), float(distances[closest])
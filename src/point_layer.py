@@ -0,0 +1,151 @@
+import itertools
+import sys
+import uuid
+import numpy as np
+from pyglet.gl import GL_POINTS, GL_PROGRAM_POINT_SIZE, glDisable, glEnable
+from pyglet.graphics.shader import ShaderProgram
+from pyglet.graphics.vertexdomain import VertexList
+from spatial_index import Bounds
+from shaders import create_point_program
+from typing import Dict, Iterable, List
+
+
+class PointLayer:
+
+    """
+    Every point of the scene packed at the start of a single vertex list and drawn as GL points in one call.
+    Positions are kept in world coordinates and go through a world to viewport uniform, so moving the window does not
+    touch them. A removal moves the last point into the hole, removals are batched until the next draw or change, and
+    only the range of points changed since the last draw is copied to the GL buffer
+    """
+
+    def __init__(self, capacity: int = 1024):
+        self.__positions = np.empty((capacity, 2), dtype=np.float32)
+        self.__colors = np.empty((capacity, 4), dtype=np.uint8)
+        self.__ids: List[uuid.UUID] = []
+        self.__index: Dict[uuid.UUID, int] = dict()
+        self.__removed: List[uuid.UUID] = []
+        self.__dirty_min = sys.maxsize
+        self.__dirty_max = 0
+        self.__program: ShaderProgram | None = None
+        self.__vertex_list: VertexList | None = None
+
+    def __len__(self) -> int:
+        self.__flush_removals()
+        return len(self.__ids)
+
+    def __contains__(self, point_id: uuid.UUID) -> bool:
+        self.__flush_removals()
+        return point_id in self.__index
+
+    def set_many(self, ids: List[uuid.UUID], positions: np.ndarray, colors: np.ndarray):
+        """
+        Adds the points that are not in the layer yet and updates the position and color of the others, ids must not
+        repeat
+        """
+        self.__flush_removals()
+        indices = np.fromiter(map(self.__index.get, ids, itertools.repeat(-1)), dtype=np.int64, count=len(ids))
+        new = np.flatnonzero(indices < 0)
+        count = len(self.__ids)
+        if len(new):
+            new_ids = [ids[i] for i in new.tolist()]
+            indices[new] = np.arange(count, count + len(new))
+            self.__index.update(zip(new_ids, range(count, count + len(new))))
+            self.__ids.extend(new_ids)
+            count += len(new)
+        if count > len(self.__positions):
+            capacity = max(2 * len(self.__positions), count)
+            self.__positions = np.resize(self.__positions, (capacity, 2))
+            self.__colors = np.resize(self.__colors, (capacity, 4))
+        self.__positions[indices] = positions
+        self.__colors[indices] = colors
+        if len(indices):
+            self.__mark_dirty(int(indices.min()), int(indices.max()) + 1)
+
+    def remove(self, point_id: uuid.UUID):
+        self.__removed.append(point_id)
+
+    def remove_many(self, ids: Iterable[uuid.UUID]):
+        self.__removed.extend(ids)
+
+    def query(self, region: Bounds) -> List[uuid.UUID]:
+        """
+        Ids of the points inside a world space region
+        """
+        self.__flush_removals()
+        positions = self.__positions[:len(self.__ids)]
+        x_min, y_min, x_max, y_max = region
+        inside = np.flatnonzero((positions[:, 0] >= x_min) & (positions[:, 0] <= x_max) &
+                                (positions[:, 1] >= y_min) & (positions[:, 1] <= y_max))
+        return [self.__ids[i] for i in inside.tolist()]
+
+    def __mark_dirty(self, first: int, last: int):
+        self.__dirty_min = min(self.__dirty_min, first)
+        self.__dirty_max = max(self.__dirty_max, last)
+
+    def __flush_removals(self):
+        """
+        Fills the holes left by the removed points with the points at the end that are still alive
+        """
+        if not self.__removed:
+            return
+        removed = np.fromiter({self.__index.pop(i) for i in self.__removed if i in self.__index}, dtype=np.int64)
+        self.__removed.clear()
+        count = len(self.__ids)
+        remaining = count - len(removed)
+        alive = np.ones(count, dtype=bool)
+        alive[removed] = False
+        holes = np.sort(removed[removed < remaining])
+        movers = np.flatnonzero(alive[remaining:]) + remaining
+        self.__positions[holes] = self.__positions[movers]
+        self.__colors[holes] = self.__colors[movers]
+        for hole, mover in zip(holes.tolist(), movers.tolist()):
+            point_id = self.__ids[mover]
+            self.__ids[hole] = point_id
+            self.__index[point_id] = hole
+        del self.__ids[remaining:]
+        if len(holes):
+            self.__mark_dirty(int(holes[0]), int(holes[-1]) + 1)
+
+    def __sync(self):
+        """
+        Sizes the vertex list to the amount of points and copies the changed range into it
+        """
+        self.__flush_removals()
+        count = len(self.__ids)
+        if count == 0:
+            if self.__vertex_list is not None:
+                self.__vertex_list.delete()
+                self.__vertex_list = None
+            return
+        if self.__vertex_list is None:
+            self.__vertex_list = self.__program.vertex_list(count, GL_POINTS, position='f', colors='Bn')
+            self.__mark_dirty(0, count)
+        elif self.__vertex_list.count != count:
+            self.__vertex_list.resize(count)
+        first, last = self.__dirty_min, min(self.__dirty_max, count)
+        self.__dirty_min, self.__dirty_max = sys.maxsize, 0
+        if first >= last:
+            return
+        start = self.__vertex_list.start
+        for name, source in (('position', self.__positions), ('colors', self.__colors)):
+            buffer = self.__vertex_list.domain.attrib_name_buffers[name]
+            np.ctypeslib.as_array(buffer.get_region(start + first, last - first))[:] = source[first:last].ravel()
+            buffer.invalidate_region(start + first, last - first)
+
+    def draw(self, world_to_viewport: List[float], point_size: float):
+        """
+        world_to_viewport is a 3×3 row vector matrix flattened in row major order
+        """
+        if self.__program is None:
+            self.__program = create_point_program()
+        self.__sync()
+        if self.__vertex_list is None:
+            return
+        self.__program.use()
+        self.__program['world_to_viewport'] = world_to_viewport
+        self.__program['point_size'] = point_size
+        glEnable(GL_PROGRAM_POINT_SIZE)
+        self.__vertex_list.draw(GL_POINTS)
+        glDisable(GL_PROGRAM_POINT_SIZE)
+        self.__program.stop()
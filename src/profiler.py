@@ -0,0 +1,90 @@
+import csv
+import json
+import time
+import numpy as np
+from typing import Dict, List
+
+
+class RollingStats:
+
+    """
+    Keeps the last window samples of a measurement in a ring buffer
+    """
+
+    def __init__(self, window: int):
+        self.__samples = np.zeros(window)
+        self.__index = 0
+        self.__count = 0
+        self.__total = 0
+
+    @property
+    def count(self) -> int:
+        """
+        Amount of samples ever added, not only the ones still in the window
+        """
+        return self.__total
+
+    def add(self, value: float):
+        self.__samples[self.__index] = value
+        self.__index = (self.__index + 1) % len(self.__samples)
+        self.__count = min(self.__count + 1, len(self.__samples))
+        self.__total += 1
+
+    def percentiles(self, *percents: float) -> List[float]:
+        if self.__count == 0:
+            return [0.0] * len(percents)
+        return np.percentile(self.__samples[:self.__count], percents).tolist()
+
+
+class Profiler:
+
+    """
+    Wall time of the frame phases, systems and events, keyed as 'phase.<name>', 'system.<name>' and 'event.<name>'.
+    Callers only read the clock when enabled is set, so a disabled profiler costs one attribute check per
+    measured section
+    """
+
+    window = 600
+    percents = (50, 95, 99)
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self.__stats: Dict[str, RollingStats] = dict()
+
+    def record(self, key: str, seconds: float):
+        stats = self.__stats.get(key)
+        if stats is None:
+            stats = self.__stats[key] = RollingStats(self.window)
+        stats.add(seconds)
+
+    def clear(self):
+        self.__stats.clear()
+
+    def summary(self) -> Dict[str, dict]:
+        """
+        p50/p95/p99 in milliseconds and the sample count of every key
+        """
+        summary = dict()
+        for key in sorted(self.__stats):
+            stats = self.__stats[key]
+            values = stats.percentiles(*self.percents)
+            summary[key] = {f'p{p}_ms': v * 1e3 for p, v in zip(self.percents, values)}
+            summary[key]['count'] = stats.count
+        return summary
+
+    def report(self) -> str:
+        lines = [f'{"":<28}{"p50":>8}{"p95":>8}{"p99":>8}  ms']
+        for key, stats in self.summary().items():
+            lines.append(f'{key:<28}' + ''.join(f'{stats[f"p{p}_ms"]:>8.2f}' for p in self.percents))
+        return '\n'.join(lines)
+
+    def dump_json(self, path: str):
+        with open(path, 'w') as file:
+            json.dump({'time': time.strftime('%Y-%m-%dT%H:%M:%S'), 'stats': self.summary()}, file, indent=2)
+
+    def dump_csv(self, path: str):
+        with open(path, 'w', newline='') as file:
+            writer = csv.writer(file)
+            writer.writerow(['key'] + [f'p{p}_ms' for p in self.percents] + ['count'])
+            for key, stats in self.summary().items():
+                writer.writerow([key] + [stats[f'p{p}_ms'] for p in self.percents] + [stats['count']])
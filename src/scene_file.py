@@ -0,0 +1,96 @@
+"""
+Native binary scene format.
+
+    header:        magic b'IGSF' | version u16 | reserved u16 | object count u64 | vertex count u64 | vertex offset u64
+    object table:  one object_dtype record per drawable
+    vertices:      vertex count × 2 f64 at vertex offset, the vertices of each object follow the previous object's
+
+Vertices are stored untransformed, the transformation of every object is in its record.
+Loading memory maps the file and hands the whole vertex section to GeometryBuffer.allocate_many, so no vertex goes
+through Python. All integers and floats are little endian
+"""
+import os
+import struct
+import numpy as np
+from typing import Iterable, List
+from drawable import KINDS, DrawableObject, check_kinds, create_drawables
+from igs_math import Vector2
+
+MAGIC = b'IGSF'
+VERSION = 1
+
+_header = struct.Struct('<4sHHQQQ')
+# the vertex section starts on a multiple of this so it can be mapped as aligned f64
+_alignment = 16
+
+object_dtype = np.dtype([
+    ('kind', 'u1'),
+    ('name', 'S47'),
+    ('length', '<u4'),
+    ('position', '<f8', (2,)),
+    ('rotation', '<f8'),
+    ('scale', '<f8', (2,)),
+])
+
+
+def save(path: str, drawables: Iterable[DrawableObject]):
+    """
+    Writes the object table in one go, column by column, and then streams the vertices of each object straight from the geometry buffer
+    """
+    drawables = list(drawables)
+    table = np.zeros(len(drawables), dtype=object_dtype)
+    if drawables:
+        table['kind'] = [KINDS.index(type(d)) for d in drawables]
+        table['name'] = [d.name.encode('utf-8')[:47] for d in drawables]
+        table['length'] = [DrawableObject.geometry_buffer.length(d.slot) for d in drawables]
+        table['position'] = [(d.position.x, d.position.y) for d in drawables]
+        table['rotation'] = [d.rotation for d in drawables]
+        table['scale'] = [(d.scale.x, d.scale.y) for d in drawables]
+    vertex_count = int(table['length'].sum())
+    vertex_offset = -(-(_header.size + table.nbytes) // _alignment) * _alignment
+    with open(path, 'wb') as file:
+        file.write(_header.pack(MAGIC, VERSION, 0, len(table), vertex_count, vertex_offset))
+        file.write(table.tobytes())
+        file.write(bytes(vertex_offset - _header.size - table.nbytes))
+        for drawable in drawables:
+            file.write(np.ascontiguousarray(drawable.vertices, dtype='<f8').data)
+
+
+def load(path: str) -> List[DrawableObject]:
+    """
+    Creates the drawables stored in a scene file, they are not added to any renderer
+    """
+    size = os.path.getsize(path)
+    with open(path, 'rb') as file:
+        header = file.read(_header.size)
+    if len(header) < _header.size:
+        raise ValueError(f'{path} is not an igs scene, it is shorter than the header')
+    magic, version, _, object_count, vertex_count, vertex_offset = _header.unpack(header)
+    if magic != MAGIC:
+        raise ValueError(f'{path} is not an igs scene')
+    if version != VERSION:
+        raise ValueError(f'Unsupported scene version {version}')
+    if object_count == 0:
+        return []
+    if (_header.size + object_count * object_dtype.itemsize > vertex_offset
+            or vertex_offset + vertex_count * 2 * 8 > size):
+        raise ValueError(f'{path} is truncated')
+    table = np.memmap(path, dtype=object_dtype, mode='r', offset=_header.size, shape=(object_count,))
+    lengths = table['length'].astype(np.int64)
+    if int(lengths.sum()) != vertex_count:
+        raise ValueError(f'{path} is corrupted, the object table does not match the vertex section')
+    try:
+        check_kinds(table['kind'], lengths)
+    except ValueError as error:
+        raise ValueError(f'{path} is corrupted: {error}') from None
+    vertices = np.memmap(path, dtype='<f8', mode='r', offset=vertex_offset, shape=(vertex_count, 2))
+    drawables = create_drawables(table['kind'], vertices, lengths,
+                                 [name.decode('utf-8', errors='ignore') or None for name in table['name'].tolist()])
+    moved = ~(np.all(table['position'] == 0, axis=1) & (table['rotation'] == 0) & np.all(table['scale'] == 1, axis=1))
+    for i in np.flatnonzero(moved).tolist():
+        record = table[i]
+        drawable = drawables[i]
+        drawable.position = Vector2(*record['position'].tolist())
+        drawable.rotation = float(record['rotation'])
+        drawable.scale = Vector2(*record['scale'].tolist())
+    return drawables
@@ -0,0 +1,127 @@
+import uuid
+import numpy as np
+from typing import Dict, List
+from PyQt5.QtCore import QAbstractListModel, QModelIndex, Qt
+
+
+class SceneListModel(QAbstractListModel):
+
+    """
+    List of the drawables of the scene for the control window, synced from snapshots of the scene table.
+    Rows are indexed by the raw 16 byte id so lookups are O(1), names are only decoded when a view asks for them and
+    rows are handed to the view fetch_size at a time as it scrolls
+    """
+
+    fetch_size = 256
+    # past this many separate runs of stale rows a resync resets the model instead of removing them run by run
+    max_remove_runs = 64
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.__ids: List[bytes] = []
+        self.__names: List[bytes] = []
+        self.__rows: Dict[bytes, int] = dict()
+        self.__fetched = 0
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        if parent.isValid():
+            return 0
+        return self.__fetched
+
+    def data(self, index: QModelIndex, role: int = Qt.DisplayRole):
+        if not index.isValid() or index.row() >= self.__fetched:
+            return None
+        match role:
+            case Qt.DisplayRole:
+                return self.__names[index.row()].decode('utf-8', errors='ignore')
+            case Qt.UserRole:
+                return self.object_id(index.row())
+        return None
+
+    def canFetchMore(self, parent: QModelIndex) -> bool:
+        return not parent.isValid() and self.__fetched < len(self.__ids)
+
+    def fetchMore(self, parent: QModelIndex):
+        if parent.isValid():
+            return
+        count = min(self.fetch_size, len(self.__ids) - self.__fetched)
+        if count <= 0:
+            return
+        self.beginInsertRows(QModelIndex(), self.__fetched, self.__fetched + count - 1)
+        self.__fetched += count
+        self.endInsertRows()
+
+    def object_id(self, row: int) -> uuid.UUID:
+        return uuid.UUID(bytes=self.__ids[row])
+
+    def row(self, object_id: uuid.UUID) -> int | None:
+        return self.__rows.get(object_id.bytes)
+
+    def __len__(self) -> int:
+        return len(self.__ids)
+
+    def resync(self, records: np.ndarray):
+        """
+        Makes the model match a snapshot of the scene table. Stale rows are removed one contiguous run at a time and
+        new objects are appended in a single block
+        """
+        ids: List[bytes] = records['id'].tolist()
+        names: List[bytes] = records['name'].tolist()
+        current = set(ids)
+        stale = [row for row, object_id in enumerate(self.__ids) if object_id not in current]
+        if stale:
+            runs = self.__runs(stale)
+            if len(runs) > self.max_remove_runs:
+                self.__reset(ids, names)
+                return
+            for first, last in reversed(runs):
+                self.__remove_rows(first, last)
+            self.__reindex(stale[0])
+        added = [row for row, object_id in enumerate(ids) if object_id not in self.__rows]
+        if added:
+            start = len(self.__ids)
+            self.__ids.extend(ids[row] for row in added)
+            self.__names.extend(names[row] for row in added)
+            self.__reindex(start)
+            if self.__fetched == start:
+                self.fetchMore(QModelIndex())
+
+    @staticmethod
+    def __runs(rows: List[int]) -> List[tuple[int, int]]:
+        """
+        Groups sorted row numbers in (first, last) runs of consecutive rows
+        """
+        runs = []
+        first = last = rows[0]
+        for row in rows[1:]:
+            if row != last + 1:
+                runs.append((first, last))
+                first = row
+            last = row
+        runs.append((first, last))
+        return runs
+
+    def __remove_rows(self, first: int, last: int):
+        for object_id in self.__ids[first:last + 1]:
+            del self.__rows[object_id]
+        visible = first < self.__fetched
+        if visible:
+            visible_last = min(last, self.__fetched - 1)
+            self.beginRemoveRows(QModelIndex(), first, visible_last)
+            self.__fetched -= visible_last - first + 1
+        del self.__ids[first:last + 1]
+        del self.__names[first:last + 1]
+        if visible:
+            self.endRemoveRows()
+
+    def __reindex(self, start: int):
+        for row in range(start, len(self.__ids)):
+            self.__rows[self.__ids[row]] = row
+
+    def __reset(self, ids: List[bytes], names: List[bytes]):
+        self.beginResetModel()
+        self.__ids = ids
+        self.__names = names
+        self.__rows = {object_id: row for row, object_id in enumerate(ids)}
+        self.__fetched = min(self.fetch_size, len(ids))
+        self.endResetModel()
@@ -0,0 +1,239 @@
+"""
+Scene table shared between the pyglet window and the control window through a shared memory segment.
+
+The segment holds a header followed by one record per drawable:
+
+    header:  sequence u64 | generation u64 | count u64 | capacity u64
+    record:  id 16 bytes | kind u8 | utf-8 name 47 bytes | bounds 4 × f64
+
+Updates use a seqlock: the writer makes the sequence odd, writes the records, bumps the generation and makes the
+sequence even again. A reader copies the table and retries when the sequence was odd or changed meanwhile, so
+neither side ever blocks the other
+"""
+import time
+import uuid
+import numpy as np
+from multiprocessing import shared_memory
+from typing import Any, Dict, List, Set
+from event_system import Event, EventSystem
+from ipc_protocol import KINDS, SceneInfo
+
+SEQUENCE, GENERATION, COUNT, CAPACITY = range(4)
+HEADER_SIZE = 4 * 8
+
+record_dtype = np.dtype([
+    ('id', 'V16'),
+    ('kind', 'u1'),
+    ('name', 'S47'),
+    ('bounds', '<f8', (4,)),
+])
+
+
+def _header(segment: shared_memory.SharedMemory) -> np.ndarray:
+    return np.ndarray((4,), dtype='<u8', buffer=segment.buf)
+
+
+def _records(segment: shared_memory.SharedMemory, capacity: int) -> np.ndarray:
+    return np.ndarray((capacity,), dtype=record_dtype, buffer=segment.buf, offset=HEADER_SIZE)
+
+
+class SceneMirrorWriter:
+
+    """
+    Keeps the scene table of the pyglet process up to date from the renderer events.
+    Changes are staged in a local table and copied to the segment by publish, once per frame.
+    Removals swap the last record into the freed row so the table stays packed
+    """
+
+    def __init__(self, evt_system: EventSystem, capacity: int = 1024):
+        self.__capacity = capacity
+        self.__table = np.zeros(capacity, dtype=record_dtype)
+        self.__count = 0
+        self.__rows: Dict[uuid.UUID, int] = dict()
+        self.__drawables: List[Any] = []
+        self.__change_callbacks: Dict[uuid.UUID, int] = dict()
+        self.__dirty_rows: Set[int] = set()
+        self.__moved: Dict[uuid.UUID, Any] = dict()
+        self.__generation = 0
+        self.__segment = self.__create_segment(capacity)
+        self.__resized = False
+        evt_system.register_callback(Event.DRAWABLE_ADDED, self.add)
+        evt_system.register_callback(Event.DRAWABLE_REMOVED, self.remove)
+        evt_system.register_callback(
+            Event.DRAWABLES_ADDED, lambda drawables: [self.add(d) for d in drawables])
+        evt_system.register_callback(
+            Event.DRAWABLES_REMOVED, lambda drawables: [self.remove(d) for d in drawables])
+
+    @property
+    def info(self) -> SceneInfo:
+        return SceneInfo(self.__segment.name, self.__generation)
+
+    def __len__(self) -> int:
+        return self.__count
+
+    @staticmethod
+    def __create_segment(capacity: int) -> shared_memory.SharedMemory:
+        segment = shared_memory.SharedMemory(create=True, size=HEADER_SIZE + capacity * record_dtype.itemsize)
+        header = _header(segment)
+        header[:] = 0
+        header[CAPACITY] = capacity
+        return segment
+
+    def __grow(self):
+        self.__capacity *= 2
+        table = np.zeros(self.__capacity, dtype=record_dtype)
+        table[:self.__count] = self.__table[:self.__count]
+        self.__table = table
+        self.__resized = True
+
+    def add(self, drawable: Any):
+        if drawable.id in self.__rows:
+            return
+        if self.__count == self.__capacity:
+            self.__grow()
+        row = self.__count
+        self.__count += 1
+        record = self.__table[row]
+        record['id'] = drawable.id.bytes
+        record['kind'] = KINDS.index(drawable.__class__.__name__)
+        record['name'] = drawable.name.encode('utf-8')[:47]
+        self.__rows[drawable.id] = row
+        self.__drawables.append(drawable)
+        self.__change_callbacks[drawable.id] = drawable.register_change_callback(self.__mark_moved)
+        self.__mark_moved(drawable)
+
+    def remove(self, drawable: Any):
+        row = self.__rows.pop(drawable.id, None)
+        if row is None:
+            return
+        drawable.remove_change_callback(self.__change_callbacks.pop(drawable.id))
+        self.__moved.pop(drawable.id, None)
+        self.__count -= 1
+        last = self.__drawables.pop()
+        if row != self.__count:
+            self.__table[row] = self.__table[self.__count]
+            self.__drawables[row] = last
+            self.__rows[last.id] = row
+            self.__dirty_rows.add(row)
+        self.__dirty_rows.discard(self.__count)
+        self.__resized = True
+
+    def __mark_moved(self, drawable: Any):
+        self.__moved[drawable.id] = drawable
+
+    def publish(self) -> bool:
+        """
+        Copies the staged changes to the segment, returns whether anything changed.
+        The bounds of the objects that moved during the frame are only computed here
+        """
+        for object_id, drawable in self.__moved.items():
+            row = self.__rows[object_id]
+            self.__table[row]['bounds'] = drawable.bounds
+            self.__dirty_rows.add(row)
+        self.__moved.clear()
+        if not self.__dirty_rows and not self.__resized:
+            return False
+        header = _header(self.__segment)
+        if header[CAPACITY] < self.__count:
+            old = self.__segment
+            self.__segment = self.__create_segment(self.__capacity)
+            self.__dirty_rows = set(range(self.__count))
+            old.close()
+            old.unlink()
+            header = _header(self.__segment)
+        records = _records(self.__segment, int(header[CAPACITY]))
+        header[SEQUENCE] += 1
+        if len(self.__dirty_rows) * 2 > self.__count:
+            records[:self.__count] = self.__table[:self.__count]
+        else:
+            rows = np.fromiter(self.__dirty_rows, dtype=np.int64, count=len(self.__dirty_rows))
+            records[rows] = self.__table[rows]
+        self.__generation += 1
+        header[COUNT] = self.__count
+        header[GENERATION] = self.__generation
+        header[SEQUENCE] += 1
+        self.__dirty_rows.clear()
+        self.__resized = False
+        return True
+
+    def close(self):
+        self.__segment.close()
+        self.__segment.unlink()
+
+
+class SceneMirrorReader:
+
+    """
+    Read only view of the scene table, used by the control window
+    """
+
+    max_retries = 1000
+
+    def __init__(self):
+        self.__segment: shared_memory.SharedMemory | None = None
+        self.__generation = -1
+
+    @property
+    def generation(self) -> int:
+        """
+        Generation of the last snapshot that was read
+        """
+        return self.__generation
+
+    def attach(self, name: str) -> bool:
+        """
+        Maps the segment with the given name, False when it can not be opened. A reader that fell behind can be told
+        about a segment the writer already replaced and unlinked, or one that is still being created, the current
+        segment is kept until the next SCENE_PUBLISHED names one that exists
+        """
+        if self.__segment is not None and self.__segment.name == name:
+            return True
+        # attaching only maps the segment, the writer owns it and is the one that unlinks it
+        try:
+            segment = shared_memory.SharedMemory(name=name)
+        except (FileNotFoundError, ValueError):
+            return False
+        if self.__segment is not None:
+            self.__segment.close()
+        self.__segment = segment
+        self.__generation = -1
+        return True
+
+    def snapshot(self, info: SceneInfo | None = None) -> np.ndarray | None:
+        """
+        Copy of the table, or None when nothing changed since the last snapshot.
+        info is the SceneInfo announced by the writer, it switches segments when the table was reallocated
+        """
+        if info is not None:
+            if info.generation == self.__generation or not self.attach(info.segment):
+                return None
+        if self.__segment is None:
+            return None
+        header = _header(self.__segment)
+        for _ in range(self.max_retries):
+            sequence = int(header[SEQUENCE])
+            if sequence & 1:
+                time.sleep(0)
+                continue
+            generation = int(header[GENERATION])
+            if generation == self.__generation:
+                return None
+            count = int(header[COUNT])
+            records = _records(self.__segment, int(header[CAPACITY]))[:count].copy()
+            if int(header[SEQUENCE]) == sequence:
+                self.__generation = generation
+                return records
+        return None
+
+    def close(self):
+        if self.__segment is not None:
+            self.__segment.close()
+            self.__segment = None
+
+
+def record_id(record: np.void) -> uuid.UUID:
+    return uuid.UUID(bytes=record['id'].tobytes())
+
+
+def record_name(record: np.void) -> str:
+    return record['name'].decode('utf-8', errors='ignore')
@@ -0,0 +1,113 @@
+from pyglet.graphics.shader import Shader, ShaderProgram
+
+
+drawable_vertex_source = """#version 150 core
+    in vec2 position;
+    in vec4 colors;
+    out vec4 vertex_colors;
+
+    uniform WindowBlock
+    {
+        mat4 projection;
+        mat4 view;
+    } window;
+
+    void main()
+    {
+        gl_Position = window.projection * window.view * vec4(position, 0.0, 1.0);
+        vertex_colors = colors;
+    }
+"""
+
+world_vertex_source = """#version 150 core
+    in vec2 position;
+    in vec2 offset;
+    in vec4 colors;
+    out vec4 vertex_colors;
+
+    uniform WindowBlock
+    {
+        mat4 projection;
+        mat4 view;
+    } window;
+
+    uniform mat3 world_to_viewport;
+
+    void main()
+    {
+        vec2 viewport_position = (world_to_viewport * vec3(position, 1.0)).xy + offset;
+        gl_Position = window.projection * window.view * vec4(viewport_position, 0.0, 1.0);
+        vertex_colors = colors;
+    }
+"""
+
+drawable_fragment_source = """#version 150 core
+    in vec4 vertex_colors;
+    out vec4 final_color;
+
+    void main()
+    {
+        final_color = vertex_colors;
+    }
+"""
+
+
+point_vertex_source = """#version 150 core
+    in vec2 position;
+    in vec4 colors;
+    out vec4 vertex_colors;
+
+    uniform WindowBlock
+    {
+        mat4 projection;
+        mat4 view;
+    } window;
+
+    uniform mat3 world_to_viewport;
+    uniform float point_size;
+
+    void main()
+    {
+        vec2 viewport_position = (world_to_viewport * vec3(position, 1.0)).xy;
+        gl_Position = window.projection * window.view * vec4(viewport_position, 0.0, 1.0);
+        gl_PointSize = point_size;
+        vertex_colors = colors;
+    }
+"""
+
+point_fragment_source = """#version 150 core
+    in vec4 vertex_colors;
+    out vec4 final_color;
+
+    void main()
+    {
+        if (length(gl_PointCoord - vec2(0.5)) > 0.5)
+            discard;
+        final_color = vertex_colors;
+    }
+"""
+
+
+def create_drawable_program() -> ShaderProgram:
+    """
+    Shader used by the object renderer, vertices are already in viewport coordinates
+    """
+    return ShaderProgram(Shader(drawable_vertex_source, 'vertex'),
+                         Shader(drawable_fragment_source, 'fragment'))
+
+
+def create_world_program() -> ShaderProgram:
+    """
+    Shader used by the object renderer in shader_transform mode, vertices are in world coordinates and go through the
+    world_to_viewport uniform, offset is added afterwards in viewport pixels
+    """
+    return ShaderProgram(Shader(world_vertex_source, 'vertex'),
+                         Shader(drawable_fragment_source, 'fragment'))
+
+
+def create_point_program() -> ShaderProgram:
+    """
+    Shader used by the point layer, world coordinates drawn as round GL points point_size pixels wide
+    """
+    return ShaderProgram(Shader(point_vertex_source, 'vertex'),
+                         Shader(point_fragment_source, 'fragment'))
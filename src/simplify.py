@@ -0,0 +1,43 @@
+import numpy as np
+
+
+def douglas_peucker_importance(points: np.ndarray) -> np.ndarray:
+    """
+    Douglas–Peucker over a closed polygon, run once for every tolerance at the same time: the importance of a vertex
+    is the largest tolerance at which it survives. Importances never grow down the recursion, so keeping the vertices
+    whose importance is above a tolerance gives the same polygon as running Douglas–Peucker with that tolerance, and
+    coarser levels are always subsets of finer ones.
+    The first vertex and the one farthest from it anchor the polygon and are always kept
+    """
+    count = len(points)
+    importance = np.full(count, np.inf)
+    if count <= 3:
+        return importance
+    farthest = int(np.argmax(np.hypot(*(points - points[0]).T)))
+    ring = np.concatenate((points, points[:1]))
+    # every pending split of a recursion level is handled in the same vectorized pass
+    first = np.array([0, farthest])
+    last = np.array([farthest, count])
+    parent = np.full(2, np.inf)
+    while len(first):
+        open_spans = last - first >= 2
+        first, last, parent = first[open_spans], last[open_spans], parent[open_spans]
+        if not len(first):
+            break
+        interior = last - first - 1
+        starts = np.cumsum(interior) - interior
+        owner = np.repeat(np.arange(len(first)), interior)
+        indices = first[owner] + 1 + np.arange(len(owner)) - starts[owner]
+        start, delta = ring[first][owner], (ring[last] - ring[first])[owner]
+        length_sq = (delta * delta).sum(axis=1)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            t = np.clip(np.nan_to_num(((ring[indices] - start) * delta).sum(axis=1) / length_sq), 0.0, 1.0)
+        distances = np.hypot(*(start + t[:, None] * delta - ring[indices]).T)
+        maxima = np.maximum.reduceat(distances, starts)
+        hits = np.flatnonzero(distances == maxima[owner])
+        _, first_hits = np.unique(owner[hits], return_index=True)
+        split = indices[hits[first_hits]]
+        value = np.minimum(maxima, parent)
+        importance[split] = value
+        first, last, parent = np.concatenate((first, split)), np.concatenate((split, last)), np.tile(value, 2)
+    return importance
@@ -0,0 +1,96 @@
+import math
+from typing import Any, Dict, Hashable, Tuple
+
+Bounds = Tuple[float, float, float, float]
+
+
+def intersects(a: Bounds, b: Bounds) -> bool:
+    return a[0] <= b[2] and b[0] <= a[2] and a[1] <= b[3] and b[1] <= a[3]
+
+
+class SpatialGrid:
+
+    """
+    Uniform grid over axis aligned bounding boxes (x_min, y_min, x_max, y_max).
+    Every item is registered in each cell its box touches, items that would touch more than max_cells_per_item cells
+    are kept in a separate list that is always tested, so huge objects do not flood the grid
+    """
+
+    max_cells_per_item = 64
+
+    def __init__(self, cell_size: float = 256.0):
+        self.__cell_size = cell_size
+        self.__cells: Dict[Tuple[int, int], Dict[Hashable, Any]] = dict()
+        self.__items: Dict[Hashable,
+                           Tuple[Any, Bounds, Tuple[int, int, int, int] | None]] = dict()
+        self.__oversized: Dict[Hashable, Any] = dict()
+
+    def __len__(self) -> int:
+        return len(self.__items)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self.__items
+
+    def bounds(self, key: Hashable) -> Bounds:
+        return self.__items[key][1]
+
+    def __cell_range(self, bounds: Bounds) -> Tuple[int, int, int, int]:
+        cs = self.__cell_size
+        return (math.floor(bounds[0] / cs), math.floor(bounds[1] / cs),
+                math.floor(bounds[2] / cs), math.floor(bounds[3] / cs))
+
+    def insert(self, key: Hashable, item: Any, bounds: Bounds):
+        """
+        Adds an item or moves it if the key is already in the grid
+        """
+        if key in self.__items:
+            self.remove(key)
+        x0, y0, x1, y1 = cell_range = self.__cell_range(bounds)
+        if (x1 - x0 + 1) * (y1 - y0 + 1) > self.max_cells_per_item:
+            self.__oversized[key] = item
+            self.__items[key] = (item, bounds, None)
+            return
+        for ix in range(x0, x1 + 1):
+            for iy in range(y0, y1 + 1):
+                cell = self.__cells.get((ix, iy))
+                if cell is None:
+                    cell = self.__cells[(ix, iy)] = dict()
+                cell[key] = item
+        self.__items[key] = (item, bounds, cell_range)
+
+    def remove(self, key: Hashable):
+        if key not in self.__items:
+            return
+        _, _, cell_range = self.__items.pop(key)
+        if cell_range is None:
+            del self.__oversized[key]
+            return
+        x0, y0, x1, y1 = cell_range
+        for ix in range(x0, x1 + 1):
+            for iy in range(y0, y1 + 1):
+                cell = self.__cells[(ix, iy)]
+                del cell[key]
+                if not cell:
+                    del self.__cells[(ix, iy)]
+
+    def query(self, region: Bounds) -> Dict[Hashable, Any]:
+        """
+        Returns every item whose bounding box intersects the region, keyed like they were inserted
+        """
+        x0, y0, x1, y1 = self.__cell_range(region)
+        if (x1 - x0 + 1) * (y1 - y0 + 1) > len(self.__cells):
+            cells = [cell for (ix, iy), cell in self.__cells.items()
+                     if x0 <= ix <= x1 and y0 <= iy <= y1]
+        else:
+            cells = [self.__cells[(ix, iy)] for ix in range(x0, x1 + 1) for iy in range(y0, y1 + 1)
+                     if (ix, iy) in self.__cells]
+        result: Dict[Hashable, Any] = dict()
+        items = self.__items
+        for cell in cells:
+            for key, item in cell.items():
+                if key not in result and intersects(items[key][1], region):
+                    result[key] = item
+        for key, item in self.__oversized.items():
+            if intersects(items[key][1], region):
+                result[key] = item
+        return result
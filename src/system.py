@@ -1,26 +1,73 @@
-from abc import ABC, abstractmethod
-from typing import Dict
+from typing import Callable, Dict
+from functools import partial
 from peripheral_manager import PeripheralManager
 from event_system import EventSystem
+from profiler import Profiler
+import time
 import uuid
+import pyglet
 
 
-class System(ABC):
+class System:
 
     """
-    A system is an abstraction that executes arbitray code every frame
+    A system is an abstraction that executes arbitray code on the ticks of the scheduler.
+    update runs tick_rate times per second, or at the manager's default rate when it is None, and gets the seconds
+    since the previous tick. A fixed_timestep system always gets dt == 1 / tick_rate and catches up with extra steps
+    when ticks come late. Paused systems are not ticked at all, draw is called on every rendered frame either way.
+    Systems that only react to callbacks set scheduled to False and are never put on the clock.
+    A system that draws calls invalidate when its drawing changed, frames nothing invalidated are not rendered
     """
 
+    tick_rate: float | None = None
+    fixed_timestep: bool = False
+    max_catch_up_steps = 5
+    scheduled = True
+
     def __init__(self, key_manager: PeripheralManager, mouse_manager: PeripheralManager, evt_system: EventSystem) -> None:
         super().__init__()
         self.__key_manager = key_manager
         self.__mouse_manager = mouse_manager
         self.__evt_system = evt_system
+        self.__manager: SystemManager | None = None
+        self.__paused = False
+        self.__damaged = False
+
+    def update(self, dt: float):
+        pass
 
-    @abstractmethod
-    def update(self):
+    def draw(self):
         pass
 
+    @property
+    def damaged(self) -> bool:
+        return self.__damaged
+
+    def invalidate(self):
+        self.__damaged = True
+
+    def validate(self):
+        self.__damaged = False
+
+    def attach(self, manager: "SystemManager"):
+        self.__manager = manager
+
+    @property
+    def paused(self) -> bool:
+        return self.__paused
+
+    def pause(self):
+        if not self.__paused:
+            self.__paused = True
+            if self.__manager is not None:
+                self.__manager.unschedule(self)
+
+    def resume(self):
+        if self.__paused:
+            self.__paused = False
+            if self.__manager is not None:
+                self.__manager.schedule(self)
+
     @property
     def key_manager(self) -> PeripheralManager:
         return self.__key_manager
@@ -36,18 +83,75 @@ class System(ABC):
 
 class SystemManager:
 
-    def __init__(self):
+    """
+    Schedules the systems on a pyglet clock, each one at its own rate
+    """
+
+    default_tick_rate = 60.0
+
+    def __init__(self, profiler: Profiler | None = None, clock: pyglet.clock.Clock | None = None):
         self.__systems: Dict[uuid.UUID, System] = dict()
+        self.__scheduled: Dict[System, Callable[[float], None]] = dict()
+        self.__profiler = profiler
+        self.__clock = clock if clock is not None else pyglet.clock.get_default()
 
     def add(self, system: System) -> uuid.UUID:
         sys_id = uuid.uuid4()
         self.__systems[sys_id] = system
+        system.attach(self)
+        if not system.paused:
+            self.schedule(system)
         return sys_id
 
     def remove(self, sys_id: uuid.UUID):
         if sys_id in self.__systems:
+            self.unschedule(self.__systems[sys_id])
             del self.__systems[sys_id]
 
-    def update(self):
-        for sys_key in self.__systems:
-            self.__systems[sys_key].update()
+    def schedule(self, system: System):
+        if not system.scheduled or system in self.__scheduled:
+            return
+        rate = system.tick_rate if system.tick_rate is not None else self.default_tick_rate
+        tick = self.__fixed_tick(system, rate) if system.fixed_timestep else partial(self.__run, system)
+        self.__scheduled[system] = tick
+        self.__clock.schedule_interval(tick, 1.0 / rate)
+
+    def unschedule(self, system: System):
+        tick = self.__scheduled.pop(system, None)
+        if tick is not None:
+            self.__clock.unschedule(tick)
+
+    def __fixed_tick(self, system: System, rate: float) -> Callable[[float], None]:
+        step = 1.0 / rate
+        accumulator = 0.0
+
+        def tick(dt: float):
+            nonlocal accumulator
+            accumulator += dt
+            steps = 0
+            while accumulator >= step and steps < system.max_catch_up_steps:
+                self.__run(system, step)
+                accumulator -= step
+                steps += 1
+            if steps == system.max_catch_up_steps:
+                # too far behind, the backlog is dropped instead of stalling every following tick
+                accumulator = 0.0
+        return tick
+
+    def __run(self, system: System, dt: float):
+        profiler = self.__profiler
+        if profiler is not None and profiler.enabled:
+            start = time.perf_counter()
+            system.update(dt)
+            profiler.record('system.' + system.__class__.__name__, time.perf_counter() - start)
+            return
+        system.update(dt)
+
+    @property
+    def damaged(self) -> bool:
+        return any(system.damaged for system in self.__systems.values())
+
+    def draw(self):
+        for system in self.__systems.values():
+            system.draw()
+            system.validate()
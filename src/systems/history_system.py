@@ -0,0 +1,91 @@
+from collections import deque
+from typing import Deque, List, Tuple
+from event_system import EventSystem, Event
+from peripheral_manager import PeripheralManager
+from system import System
+from drawable import DrawableObject, ObjectRenderer
+from history import Change, Delta, History
+import pyglet.window.key as key
+
+
+class HistorySystem(System):
+
+    """
+    Records the drawables added, removed and transformed from the renderer events and reverts them: CTRL+Z undoes,
+    CTRL+Y or CTRL+SHIFT+Z redoes.
+    Undo and redo change the renderer directly, the events it fires for those changes come back later (the event
+    system may be queued) and are skipped instead of being recorded as new changes
+    """
+
+    scheduled = False
+
+    def __init__(self, key_manager: PeripheralManager, mouse_manager: PeripheralManager,
+                 evt_system: EventSystem, object_renderer: ObjectRenderer, max_bytes: int = 64 * 1024 * 1024):
+        super().__init__(key_manager, mouse_manager, evt_system)
+        self.__object_renderer = object_renderer
+        self.__history = History(max_bytes)
+        self.__echoes: Deque[Tuple[Event, List[DrawableObject]]] = deque()
+        self.evt_system.register_callback(
+            Event.DRAWABLE_ADDED, lambda drawable: self.__added(Event.DRAWABLE_ADDED, [drawable]))
+        self.evt_system.register_callback(
+            Event.DRAWABLES_ADDED, lambda drawables: self.__added(Event.DRAWABLES_ADDED, drawables))
+        self.evt_system.register_callback(
+            Event.DRAWABLE_REMOVED, lambda drawable: self.__removed(Event.DRAWABLE_REMOVED, [drawable]))
+        self.evt_system.register_callback(
+            Event.DRAWABLES_REMOVED, lambda drawables: self.__removed(Event.DRAWABLES_REMOVED, drawables))
+        self.evt_system.register_callback(
+            Event.DRAWABLE_TRANSFORMED, self.__history.record_transform)
+        self.key_manager.register_callback(self.undo, key.Z, key.MOD_CTRL, True)
+        self.key_manager.register_callback(self.redo, key.Y, key.MOD_CTRL, True)
+        self.key_manager.register_callback(self.redo, key.Z, key.MOD_CTRL | key.MOD_SHIFT, True)
+
+    @property
+    def history(self) -> History:
+        return self.__history
+
+    def undo(self):
+        delta = self.__history.undo()
+        if delta is not None:
+            self.__apply(delta, True)
+
+    def redo(self):
+        delta = self.__history.redo()
+        if delta is not None:
+            self.__apply(delta, False)
+
+    def __apply(self, delta: Delta, revert: bool):
+        match delta.change:
+            case Change.TRANSFORM:
+                delta.drawables[0].trs = delta.before if revert else delta.after
+            case Change.ADD if revert:
+                self.__remove(delta.drawables)
+            case Change.REMOVE if not revert:
+                self.__remove(delta.drawables)
+            case _:
+                self.__add(delta.drawables)
+
+    def __add(self, drawables: Tuple[DrawableObject, ...]):
+        missing = [d for d in drawables if not self.__object_renderer.hasObject(d)]
+        if missing:
+            self.__echoes.append((Event.DRAWABLES_ADDED, missing))
+            self.__object_renderer.add_many(missing)
+
+    def __remove(self, drawables: Tuple[DrawableObject, ...]):
+        present = [d for d in drawables if self.__object_renderer.hasObject(d)]
+        if present:
+            self.__echoes.append((Event.DRAWABLES_REMOVED, present))
+            self.__object_renderer.remove_many(present)
+
+    def __is_echo(self, event: Event, drawables: List[DrawableObject]) -> bool:
+        if self.__echoes and self.__echoes[0] == (event, drawables):
+            self.__echoes.popleft()
+            return True
+        return False
+
+    def __added(self, event: Event, drawables: List[DrawableObject]):
+        if not self.__is_echo(event, drawables):
+            self.__history.record_add(drawables)
+
+    def __removed(self, event: Event, drawables: List[DrawableObject]):
+        if not self.__is_echo(event, drawables):
+            self.__history.record_remove(drawables)
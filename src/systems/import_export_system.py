@@ -0,0 +1,151 @@
+import queue
+import threading
+import numpy as np
+from event_system import EventSystem, Event
+from peripheral_manager import PeripheralManager
+from system import System
+from drawable import KINDS, DrawableObject, ObjectRenderer, create_drawables
+from ipc_protocol import TransferProgress
+import text_formats
+
+
+class Transfer:
+
+    """
+    An import or export running on a worker thread. Imports hand their parsed chunks over through a bounded queue so
+    the reader never gets too far ahead of the frames that turn them into drawables
+    """
+
+    max_pending_chunks = 8
+
+    def __init__(self, target, *args):
+        self.cancel = threading.Event()
+        self.chunks: queue.Queue = queue.Queue(self.max_pending_chunks)
+        self.progress = 0.0
+        self.error: Exception | None = None
+        self.__thread = threading.Thread(target=self.__run, args=(target, *args), daemon=True)
+        self.__thread.start()
+
+    def __run(self, target, *args):
+        try:
+            target(self, *args)
+        except Exception as error:
+            self.error = error
+
+    @property
+    def done(self) -> bool:
+        return not self.__thread.is_alive() and self.chunks.empty()
+
+    def put(self, chunk: text_formats.TextChunk):
+        """
+        Blocks while the queue is full, gives up when the transfer is cancelled
+        """
+        while not self.cancel.is_set():
+            try:
+                self.chunks.put(chunk, timeout=0.1)
+                return
+            except queue.Full:
+                pass
+
+
+def _read(transfer: Transfer, path: str):
+    for chunk in text_formats.read_text(path, transfer.cancel):
+        transfer.put(chunk)
+
+
+def _write(transfer: Transfer, path: str, kinds, vertices, lengths, names):
+    for progress in text_formats.write_text(path, kinds, vertices, lengths, names, transfer.cancel):
+        transfer.progress = progress
+
+
+class ImportExportSystem(System):
+
+    """
+    Imports and exports OBJ and CSV files without stalling the frame. Files are parsed or written on a worker thread,
+    every tick at most objects_per_frame imported drawables are created and added to the renderer, and the progress
+    is reported through TRANSFER_PROGRESS. Only one transfer runs at a time and the system is paused between them,
+    failures and requests made while a transfer runs are reported through SHOW_ERROR
+    """
+
+    objects_per_frame = 2000
+
+    def __init__(self, key_manager: PeripheralManager, mouse_manager: PeripheralManager,
+                 evt_system: EventSystem, object_renderer: ObjectRenderer):
+        super().__init__(key_manager, mouse_manager, evt_system)
+        self.__object_renderer = object_renderer
+        self.__transfer: Transfer | None = None
+        self.__reported = -1.0
+        # chunk being turned into drawables, with the first object and vertex that were not created yet
+        self.__pending: tuple[text_formats.TextChunk, int, int] | None = None
+        self.evt_system.register_callback(Event.IMPORT_FILE, self.import_file)
+        self.evt_system.register_callback(Event.EXPORT_FILE, self.export_file)
+        self.evt_system.register_callback(Event.CANCEL_TRANSFER, self.cancel)
+        self.pause()
+
+    def import_file(self, path: str):
+        if self.__transfer is not None:
+            self.evt_system.fire(Event.SHOW_ERROR, f'Can not import {path}, a transfer is already running')
+            return
+        self.__transfer = Transfer(_read, path)
+        self.resume()
+
+    def export_file(self, path: str):
+        """
+        The world geometry is gathered here, on the main thread, the worker only formats and writes it
+        """
+        if self.__transfer is not None:
+            self.evt_system.fire(Event.SHOW_ERROR, f'Can not export {path}, a transfer is already running')
+            return
+        drawables = list(self.__object_renderer)
+        for drawable in drawables:
+            drawable.sync_transform()
+        vertices, lengths = DrawableObject.geometry_buffer.transformed_many(
+            np.array([d.slot for d in drawables], dtype=np.int64))
+        kinds = np.array([KINDS.index(type(d)) for d in drawables], dtype=np.uint8)
+        names = [d.name for d in drawables]
+        self.__transfer = Transfer(_write, path, kinds, vertices, lengths, names)
+        self.resume()
+
+    def cancel(self):
+        if self.__transfer is not None:
+            self.__transfer.cancel.set()
+
+    def update(self, dt: float):
+        transfer = self.__transfer
+        if transfer is None:
+            self.pause()
+            return
+        if transfer.cancel.is_set():
+            self.__pending = None
+            while not transfer.chunks.empty():
+                transfer.chunks.get_nowait()
+        budget = self.objects_per_frame
+        while budget > 0 and not transfer.cancel.is_set():
+            if self.__pending is None:
+                try:
+                    self.__pending = (transfer.chunks.get_nowait(), 0, 0)
+                except queue.Empty:
+                    break
+            chunk, first, first_vertex = self.__pending
+            last = min(first + budget, len(chunk.lengths))
+            last_vertex = first_vertex + int(chunk.lengths[first:last].sum())
+            if last > first:
+                self.evt_system.fire(Event.ADD_DRAWABLES, create_drawables(
+                    chunk.kinds[first:last], chunk.vertices[first_vertex:last_vertex],
+                    chunk.lengths[first:last], chunk.names[first:last]))
+            budget -= last - first
+            if last == len(chunk.lengths):
+                transfer.progress = chunk.progress
+                self.__pending = None
+            else:
+                self.__pending = (chunk, last, last_vertex)
+        if transfer.done and self.__pending is None:
+            self.__transfer = None
+            self.__reported = -1.0
+            self.pause()
+            self.evt_system.fire(Event.TRANSFER_PROGRESS, TransferProgress(transfer.progress, True))
+            if transfer.error is not None:
+                self.evt_system.fire(Event.SHOW_ERROR, f'Transfer failed: {transfer.error}')
+        elif transfer.progress != self.__reported:
+            self.__reported = transfer.progress
+            self.evt_system.fire(Event.TRANSFER_PROGRESS, TransferProgress(transfer.progress, False))
@@ -6,6 +6,10 @@ from drawable import ObjectRenderer, Line, Wireframe, Point
 from enum import Enum
 from typing import List
 from igs_math import Vector2
+from pyglet.gl import GL_LINE_STRIP
+from pyglet.graphics.shader import ShaderProgram
+from pyglet.graphics.vertexdomain import VertexList
+from shaders import create_world_program
 import pyglet
 
 
@@ -17,6 +21,17 @@ class PlacementMode(Enum):
 
 class ObjectSpawner(System):
 
+    """
+    Left click places the points of the shape being drawn, ctrl + left click finishes a polygon, F1 switches between
+    lines, polygons and points and BACKSPACE takes the last point back.
+    The preview is a line strip through the placed points that ends at the mouse, kept in world coordinates in a vertex
+    list that lives as long as the spawner: placing a point writes one more vertex, moving the mouse rewrites the last
+    one, and the window transform is a shader uniform
+    """
+
+    preview_color = (255, 255, 255, 255)
+    scheduled = False
+
     def __init__(self, key_manager: PeripheralManager, mouse_manager: PeripheralManager,
                  evt_system: EventSystem, object_renderer: ObjectRenderer, window: Window) -> None:
         super().__init__(key_manager, mouse_manager, evt_system)
@@ -25,13 +40,16 @@ class ObjectSpawner(System):
         self.__current_mouse_pos: Vector2 = Vector2(0.0, 0.0)
         self.__placement_mode: PlacementMode = PlacementMode.LINE
         self.__window = window
-        self.__batch = pyglet.graphics.Batch()
+        self.__program: ShaderProgram | None = None
+        self.__preview: VertexList | None = None
         self.__object_renderer = object_renderer
         self.__poly_preview = False
         self.mouse_manager.register_callback(self.add_point, 1, 0, True)
-        self.mouse_manager.register_callback(self.build_shape, 1, 2, True)
+        self.mouse_manager.register_callback(self.build_shape, 1, pyglet.window.key.MOD_CTRL, True)
         self.key_manager.register_callback(
             self.change_mode, pyglet.window.key.F1, 0, True)
+        self.key_manager.register_callback(
+            self.remove_last_point, pyglet.window.key.BACKSPACE, 0, True)
         self.key_manager.register_callback(
             self.toggle_poly_preview, 65507, 0, True)
         self.key_manager.register_callback(
@@ -41,9 +59,12 @@ class ObjectSpawner(System):
 
     def toggle_poly_preview(self):
         self.__poly_preview = not self.__poly_preview
+        if self.__current_points:
+            self.__write_preview_end()
 
     def change_mode(self):
         self.__current_points.clear()
+        self.invalidate()
         match self.__placement_mode:
             case PlacementMode.LINE:
                 self.__placement_mode = PlacementMode.POLYGON
@@ -55,6 +76,9 @@ class ObjectSpawner(System):
     def add_point(self, pos: Vector2):
         world_pos = self.__window.viewport_to_world(pos)
         self.__current_points.append(world_pos)
+        self.__resize_preview()
+        self.__write_preview(len(self.__current_points) - 1, world_pos)
+        self.__write_preview_end()
         if self.__placement_mode == PlacementMode.LINE and len(self.__current_points) == 2:
             self.build_shape()
         elif self.__placement_mode == PlacementMode.POINT and len(self.__current_points) == 1:
@@ -63,6 +87,53 @@ class ObjectSpawner(System):
     def update_mouse_pos(self, pos: Vector2, delta: Vector2):
         world_pos = self.__window.viewport_to_world(pos)
         self.__current_mouse_pos = world_pos
+        if self.__current_points:
+            self.__write_preview_end()
+
+    def remove_last_point(self):
+        if not self.__current_points:
+            return
+        self.__current_points.pop()
+        if self.__current_points:
+            self.__resize_preview()
+            self.__write_preview_end()
+        self.invalidate()
+
+    def __resize_preview(self):
+        """
+        Sizes the preview to the placed points plus the end of the strip, the vertices that were already written stay
+        """
+        count = len(self.__current_points) + 1
+        if self.__preview is None:
+            if self.__program is None:
+                self.__program = create_world_program()
+            self.__preview = self.__program.vertex_list(
+                count, GL_LINE_STRIP, position='f', offset=('f', [0.0] * 2 * count),
+                colors=('Bn', self.preview_color * count))
+            return
+        previous = self.__preview.count
+        if previous == count:
+            return
+        self.__preview.resize(count)
+        if count > previous:
+            added = count - previous
+            self.__preview.domain.attrib_name_buffers['offset'].set_region(
+                self.__preview.start + previous, added, [0.0] * 2 * added)
+            self.__preview.domain.attrib_name_buffers['colors'].set_region(
+                self.__preview.start + previous, added, self.preview_color * added)
+
+    def __write_preview(self, index: int, position: Vector2):
+        self.__preview.domain.attrib_name_buffers['position'].set_region(
+            self.__preview.start + index, 1, [position.x, position.y])
+        self.invalidate()
+
+    def __write_preview_end(self):
+        """
+        The strip ends at the mouse, or back at the first point when previewing the closed polygon
+        """
+        end = self.__current_points[0] if self.__poly_preview and len(
+            self.__current_points) > 1 else self.__current_mouse_pos
+        self.__write_preview(len(self.__current_points), end)
 
     def build_shape(self, *args):
         match self.__placement_mode:
@@ -82,6 +153,7 @@ class ObjectSpawner(System):
                 self.__object_renderer.addObject(
                     Point(self.__current_points[0]))
         self.__current_points.clear()
+        self.invalidate()
 
     def enable(self):
         self.__active = True
@@ -89,31 +161,13 @@ class ObjectSpawner(System):
     def disable(self):
         self.__active = False
         self.__current_points.clear()
+        self.invalidate()
 
-    def update(self):
-        point_amount = len(self.__current_points)
-        if not self.__active or point_amount == 0:
+    def draw(self):
+        if not self.__active or not self.__current_points:
             return
-        m = self.__window.world_to_viewport(self.__current_mouse_pos)
-
-        if point_amount == 1:
-            p = self.__window.world_to_viewport(self.__current_points[0])
-            line = pyglet.shapes.Line(p.x, p.y, m.x, m.y, batch=self.__batch)
-            self.__batch.draw()
-            return
-
-        lines = []  # previne as linhas que foram adicionadas aqui de serem coletadas pelo gc antes de serem desenhadas
-        for i in range(1, point_amount):
-            pi = self.__window.world_to_viewport(self.__current_points[i])
-            pj = self.__window.world_to_viewport(self.__current_points[i-1])
-            l = pyglet.shapes.Line(
-                pj.x, pj.y, pi.x, pi.y, batch=self.__batch)
-            lines.append(l)
-        p = self.__window.world_to_viewport(
-            self.__current_points[point_amount - 1])
-
-        m = self.__window.world_to_viewport(
-            self.__current_points[0]) if self.__poly_preview else m
-        l = pyglet.shapes.Line(p.x, p.y, m.x, m.y, batch=self.__batch)
-        lines.append(l)
-        self.__batch.draw()
+        self.__program.use()
+        # Matrix3x3 multiplies row vectors, read as a column major mat3 it is the transpose the shader needs
+        self.__program['world_to_viewport'] = self.__window.viewport_matrix.np_mat.ravel().tolist()
+        self.__preview.draw(GL_LINE_STRIP)
+        self.__program.stop()
@@ -0,0 +1,37 @@
+from event_system import EventSystem, Event
+from peripheral_manager import PeripheralManager
+from system import System
+from drawable import ObjectRenderer
+import scene_file
+
+
+class SceneFileSystem(System):
+
+    """
+    Saves the scene to and loads it from scene files when the control window asks for it, loading replaces the scene.
+    Failures are reported to the control window through SHOW_ERROR
+    """
+
+    scheduled = False
+
+    def __init__(self, key_manager: PeripheralManager, mouse_manager: PeripheralManager,
+                 evt_system: EventSystem, object_renderer: ObjectRenderer):
+        super().__init__(key_manager, mouse_manager, evt_system)
+        self.__object_renderer = object_renderer
+        self.evt_system.register_callback(Event.SAVE_SCENE, self.save)
+        self.evt_system.register_callback(Event.LOAD_SCENE, self.load)
+
+    def save(self, path: str):
+        try:
+            scene_file.save(path, self.__object_renderer)
+        except OSError as error:
+            self.evt_system.fire(Event.SHOW_ERROR, f'Could not save the scene: {error}')
+
+    def load(self, path: str):
+        try:
+            drawables = scene_file.load(path)
+        except (OSError, ValueError) as error:
+            self.evt_system.fire(Event.SHOW_ERROR, f'Could not load the scene: {error}')
+            return
+        self.__object_renderer.clear()
+        self.evt_system.fire(Event.ADD_DRAWABLES, drawables)
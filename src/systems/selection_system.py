@@ -0,0 +1,82 @@
+from event_system import EventSystem, Event
+from peripheral_manager import PeripheralManager
+from system import System
+from drawable import DrawableObject, ObjectRenderer, Transform
+from igs_math import Vector2
+from functools import partial
+import pyglet.window.key as key
+import pyglet.window.mouse as mouse
+import math
+
+
+class SelectionSystem(System):
+
+    """
+    Right click selects the drawable under the cursor, the selection can then be deleted or transformed from the keyboard:
+    arrows translate, Q/E rotate, PAGEUP/PAGEDOWN scale and DELETE removes it
+    """
+
+    scheduled = False
+    pick_tolerance = 5.0
+    move_step = 10.0
+    rotation_step = math.pi / 12
+    scale_step = 1.1
+
+    def __init__(self, key_manager: PeripheralManager, mouse_manager: PeripheralManager,
+                 evt_system: EventSystem, object_renderer: ObjectRenderer):
+        super().__init__(key_manager, mouse_manager, evt_system)
+        self.__object_renderer = object_renderer
+        self.mouse_manager.register_callback(self.select, mouse.RIGHT, 0, True)
+        self.key_manager.register_callback(self.remove_selected, key.DELETE, 0, True)
+        self.key_manager.register_callback(
+            partial(self.move_selected, Vector2(-1, 0)), key.LEFT, 0, True)
+        self.key_manager.register_callback(
+            partial(self.move_selected, Vector2(1, 0)), key.RIGHT, 0, True)
+        self.key_manager.register_callback(
+            partial(self.move_selected, Vector2(0, 1)), key.UP, 0, True)
+        self.key_manager.register_callback(
+            partial(self.move_selected, Vector2(0, -1)), key.DOWN, 0, True)
+        self.key_manager.register_callback(
+            partial(self.rotate_selected, 1.0), key.Q, 0, True)
+        self.key_manager.register_callback(
+            partial(self.rotate_selected, -1.0), key.E, 0, True)
+        self.key_manager.register_callback(
+            partial(self.scale_selected, self.scale_step), key.PAGEUP, 0, True)
+        self.key_manager.register_callback(
+            partial(self.scale_selected, 1.0 / self.scale_step), key.PAGEDOWN, 0, True)
+
+    def select(self, pos: Vector2):
+        self.__object_renderer.selected = self.__object_renderer.pick(
+            pos, self.pick_tolerance)
+
+    def remove_selected(self):
+        selected = self.__object_renderer.selected
+        if selected is not None:
+            self.evt_system.fire(Event.REMOVE_DRAWALBE, selected)
+
+    def move_selected(self, direction: Vector2):
+        selected = self.__object_renderer.selected
+        if selected is not None:
+            position, rotation, scale = selected.trs
+            self.__transform(selected, (position + direction * self.move_step, rotation, scale))
+
+    def rotate_selected(self, direction: float):
+        selected = self.__object_renderer.selected
+        if selected is not None:
+            position, rotation, scale = selected.trs
+            self.__transform(selected, (position, rotation + direction * self.rotation_step, scale))
+
+    def scale_selected(self, factor: float):
+        selected = self.__object_renderer.selected
+        if selected is not None:
+            position, rotation, scale = selected.trs
+            self.__transform(selected, (position, rotation, scale * factor))
+
+    def __transform(self, drawable: DrawableObject, trs: Transform):
+        """
+        The event carries the transform before and after the change, by the time it is dispatched the drawable may
+        have been transformed again
+        """
+        before = drawable.trs
+        drawable.trs = trs
+        self.evt_system.fire(Event.DRAWABLE_TRANSFORMED, drawable, before, trs)
@@ -9,6 +9,14 @@ import pyglet.window.key as key
 
 class WindowSystem(System):
 
+    """
+    Pans the window with WASD and zooms it with the keypad + and -, at speeds given in world units per second so the
+    camera moves the same however fast the frames come. Pauses itself while no key is held
+    """
+
+    move_speed = 600.0
+    zoom_speed = 600.0
+
     def __init__(self, key_manager: PeripheralManager, mouse_manager: PeripheralManager,
                  evt_system: EventSystem, window: Window):
         super().__init__(key_manager, mouse_manager, evt_system)
@@ -48,13 +56,22 @@ class WindowSystem(System):
         self.evt_system.register_callback(
             Event.ZOOM_WINDOW, self.__window.zoom
         )
+        self.pause()
 
     def add_to_dir(self, dir: Vector2):
-        self.__direction += dir*10.0
+        self.__direction += dir
+        self.__update_activity()
 
     def set_mul_factor(self, factor: float):
         self.__multiply_factor = factor
+        self.__update_activity()
+
+    def __update_activity(self):
+        if self.__direction.x == 0 and self.__direction.y == 0 and self.__multiply_factor == 0:
+            self.pause()
+        else:
+            self.resume()
 
-    def update(self):
-        self.__window.move(self.__direction)
-        self.__window.zoom(Vector2(-10, -10)*self.__multiply_factor)
+    def update(self, dt: float):
+        self.__window.move(self.__direction*(self.move_speed*dt))
+        self.__window.zoom(Vector2(-1, -1)*(self.__multiply_factor*self.zoom_speed*dt))
@@ -0,0 +1,171 @@
+"""
+Streaming readers and writers for text geometry: Wavefront OBJ and CSV.
+
+Readers are generators that parse a file chunk_bytes at a time and yield TextChunk objects holding the geometry of
+whole drawables as numpy arrays, so they can run on a worker thread while the drawables are created elsewhere.
+
+OBJ:  v records give vertices (z and w are ignored), p makes points, l makes lines (a closed polyline becomes a
+      wireframe, an open one a line per segment) and f makes wireframes. o names the drawables that follow it
+CSV:  one drawable per row, an optional name followed by x, y pairs. One pair is a point, two a line, more a wireframe
+"""
+import csv
+import os
+import threading
+import numpy as np
+from typing import IO, Iterator, List, NamedTuple
+from object_batch import LINE, POINT, kinds_of
+
+chunk_bytes = 1 << 20
+
+
+class TextChunk(NamedTuple):
+    """
+    Drawables parsed from a chunk of a file, kinds index drawable.KINDS. progress is the fraction of the file read
+    """
+    kinds: np.ndarray
+    vertices: np.ndarray
+    lengths: np.ndarray
+    names: List[str | None]
+    progress: float
+
+
+def _chunks(path: str, cancel: threading.Event | None) -> Iterator[tuple[List[bytes], float]]:
+    size = max(os.path.getsize(path), 1)
+    read = 0
+    with open(path, 'rb') as file:
+        while cancel is None or not cancel.is_set():
+            lines = file.readlines(chunk_bytes)
+            if not lines:
+                return
+            read += sum(len(line) for line in lines)
+            yield lines, read / size
+
+
+def read_obj(path: str, cancel: threading.Event | None = None) -> Iterator[TextChunk]:
+    # elements may reference any vertex read before them, so every vertex is kept until the end of the file
+    store = np.empty((1024, 2))
+    stored = 0
+    name: str | None = None
+    for lines, progress in _chunks(path, cancel):
+        records = [line.split() for line in lines]
+        positions = [record[1:3] for record in records if record and record[0] == b'v']
+        if positions:
+            new = np.array(positions, dtype=np.float64)
+            if stored + len(new) > len(store):
+                grown = np.empty((max(2 * len(store), stored + len(new)), 2))
+                grown[:stored] = store[:stored]
+                store = grown
+            store[stored:stored + len(new)] = new
+            stored += len(new)
+
+        names: List[str | None] = []
+        indices: List[int] = []
+        lengths: List[int] = []
+        seen = 0
+        for record in records:
+            if not record:
+                continue
+            match record[0]:
+                case b'v':
+                    seen += 1
+                case b'o':
+                    name = b' '.join(record[1:]).decode('utf-8', errors='ignore') or None
+                case b'p' | b'l' | b'f':
+                    # negative indices count back from the last vertex read so far
+                    base = stored - len(positions) + seen
+                    element = [int(field.split(b'/')[0]) for field in record[1:]]
+                    element = [i - 1 if i > 0 else base + i for i in element]
+                    if record[0] == b'p':
+                        names.extend([name] * len(element))
+                        indices.extend(element)
+                        lengths.extend([1] * len(element))
+                    elif record[0] == b'f' or (len(element) > 3 and element[0] == element[-1]):
+                        if record[0] == b'l':
+                            element.pop()
+                        names.append(name)
+                        indices.extend(element)
+                        lengths.append(len(element))
+                    else:
+                        for start, end in zip(element, element[1:]):
+                            names.append(name)
+                            indices.extend((start, end))
+                            lengths.append(2)
+        if lengths:
+            indices_array = np.array(indices, dtype=np.int64)
+            if indices_array.min() < 0 or indices_array.max() >= stored:
+                raise ValueError(f'{path} references a vertex that was not defined before it')
+            lengths_array = np.array(lengths, dtype=np.int64)
+            yield TextChunk(kinds_of(lengths_array), store[indices_array], lengths_array, names, progress)
+        else:
+            yield TextChunk(np.empty(0, dtype=np.uint8), np.empty((0, 2)), np.empty(0, dtype=np.int64), [], progress)
+
+
+def read_csv(path: str, cancel: threading.Event | None = None) -> Iterator[TextChunk]:
+    for lines, progress in _chunks(path, cancel):
+        names: List[str | None] = []
+        coordinates: List[str] = []
+        lengths: List[int] = []
+        for row in csv.reader(line.decode('utf-8', errors='ignore') for line in lines):
+            if not row:
+                continue
+            name = None
+            if len(row) % 2:
+                name, row = row[0] or None, row[1:]
+            if not row:
+                continue
+            names.append(name)
+            coordinates.extend(row)
+            lengths.append(len(row) // 2)
+        lengths_array = np.array(lengths, dtype=np.int64)
+        yield TextChunk(kinds_of(lengths_array), np.array(coordinates, dtype=np.float64).reshape(-1, 2),
+                        lengths_array, names, progress)
+
+
+def read_text(path: str, cancel: threading.Event | None = None) -> Iterator[TextChunk]:
+    """
+    Picks the reader from the file extension, anything that is not .obj is read as CSV
+    """
+    if path.lower().endswith('.obj'):
+        return read_obj(path, cancel)
+    return read_csv(path, cancel)
+
+
+def _write_obj(file: IO[str], kinds: np.ndarray, vertices: np.ndarray, lengths: np.ndarray, names: List[str],
+               first_vertex: int):
+    offsets = np.cumsum(lengths) - lengths
+    for kind, name, offset, length in zip(kinds.tolist(), names, offsets.tolist(), lengths.tolist()):
+        element = ' '.join(str(first_vertex + offset + i + 1) for i in range(length))
+        file.write(f'o {name}\n')
+        file.write(('v %r %r\n' * length) % tuple(vertices[offset:offset + length].ravel().tolist()))
+        file.write(f"{'p' if kind == POINT else 'l' if kind == LINE else 'f'} {element}\n")
+
+
+def _write_csv(file: IO[str], vertices: np.ndarray, lengths: np.ndarray, names: List[str]):
+    writer = csv.writer(file, lineterminator='\n')
+    offsets = np.cumsum(lengths) - lengths
+    for name, offset, length in zip(names, offsets.tolist(), lengths.tolist()):
+        writer.writerow([name.replace('\n', ' ')] + vertices[offset:offset + length].ravel().tolist())
+
+
+def write_text(path: str, kinds: np.ndarray, vertices: np.ndarray, lengths: np.ndarray, names: List[str],
+               cancel: threading.Event | None = None, objects_per_chunk: int = 4096) -> Iterator[float]:
+    """
+    Writes drawables as OBJ or CSV depending on the extension, a chunk of objects at a time, yielding the fraction of
+    them written. A cancelled export removes the partial file
+    """
+    obj = path.lower().endswith('.obj')
+    offsets = np.cumsum(lengths) - lengths
+    with open(path, 'w', encoding='utf-8') as file:
+        for start in range(0, len(lengths), objects_per_chunk):
+            if cancel is not None and cancel.is_set():
+                break
+            end = min(start + objects_per_chunk, len(lengths))
+            first = int(offsets[start])
+            last = first + int(lengths[start:end].sum())
+            if obj:
+                _write_obj(file, kinds[start:end], vertices[first:last], lengths[start:end], names[start:end], first)
+            else:
+                _write_csv(file, vertices[first:last], lengths[start:end], names[start:end])
+            yield end / len(lengths)
+    if cancel is not None and cancel.is_set():
+        os.remove(path)
@@ -1,5 +1,33 @@
 from igs_math import Vector2
+
+
 class Viewport:
     def __init__(self, vp_min: Vector2, vp_max: Vector2) -> None:
+        self.__version = 0
         self.vp_min = vp_min
-        self.vp_max = vp_max
\ No newline at end of file
+        self.vp_max = vp_max
+
+    @property
+    def version(self) -> int:
+        """
+        Incremented every time the viewport bounds are reassigned
+        """
+        return self.__version
+
+    @property
+    def vp_min(self) -> Vector2:
+        return self.__vp_min
+
+    @vp_min.setter
+    def vp_min(self, value: Vector2):
+        self.__vp_min = value
+        self.__version += 1
+
+    @property
+    def vp_max(self) -> Vector2:
+        return self.__vp_max
+
+    @vp_max.setter
+    def vp_max(self, value: Vector2):
+        self.__vp_max = value
+        self.__version += 1
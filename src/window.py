@@ -1,3 +1,4 @@
+import numpy as np
 from viewport import Viewport
 from igs_math import Vector2, Matrix3x3
 
@@ -5,15 +6,48 @@ from igs_math import Vector2, Matrix3x3
 class Window:
 
     def __init__(self, w_min: Vector2, w_max: Vector2, viewport):
+        self.__version = 0
         self.w_min = w_min
         self.w_max = w_max
         self.vp: Viewport = viewport
+        self.__matrix_version: int | None = None
+        self.__matrix: Matrix3x3 = Matrix3x3()
+        self.__inverse: Matrix3x3 = Matrix3x3()
+
+    @property
+    def version(self) -> int:
+        """
+        Incremented every time the visible region changes, renderers compare it against the last value they saw
+        """
+        return self.__version + self.vp.version
+
+    @property
+    def w_min(self) -> Vector2:
+        return self.__w_min
+
+    @w_min.setter
+    def w_min(self, value: Vector2):
+        self.__w_min = value
+        self.__version += 1
+
+    @property
+    def w_max(self) -> Vector2:
+        return self.__w_max
+
+    @w_max.setter
+    def w_max(self, value: Vector2):
+        self.__w_max = value
+        self.__version += 1
 
     def move(self, direction: Vector2):
+        if direction.x == 0 and direction.y == 0:
+            return
         self.w_min += direction
         self.w_max += direction
 
     def zoom(self, zoom: Vector2):
+        if zoom.x == 0 and zoom.y == 0:
+            return
         pre_min = self.w_min + zoom
         pre_max = self.w_max - zoom
         if pre_max.x <= pre_min.x or pre_max.y <= pre_min.x:
@@ -21,14 +55,49 @@ class Window:
         self.w_max = pre_max
         self.w_min = pre_min
 
+    @property
+    def pixel_size(self) -> float:
+        """
+        World length covered by one viewport pixel, the larger of the two axes when their scales differ
+        """
+        world_dim = self.w_max - self.w_min
+        viewport_dim = self.vp.vp_max - self.vp.vp_min
+        return max(world_dim.x / viewport_dim.x, world_dim.y / viewport_dim.y)
+
     def world_to_viewport(self, worldCoord: Vector2) -> Vector2:
-        transformation = self.__build_viewport_matrix()
-        return worldCoord * transformation
+        return worldCoord * self.viewport_matrix
 
     def viewport_to_world(self, viewportCoord: Vector2) -> Vector2:
-        transformation = self.__build_viewport_matrix()
-        transformation.invert()
-        return viewportCoord * transformation
+        return viewportCoord * self.inverse_viewport_matrix
+
+    def world_to_viewport_many(self, world_coords: np.ndarray) -> np.ndarray:
+        """
+        Transforms a N×2 (or homogeneous N×3) array of world coordinates with a single matmul
+        """
+        return self.viewport_matrix.apply_many(world_coords)
+
+    def viewport_to_world_many(self, viewport_coords: np.ndarray) -> np.ndarray:
+        """
+        Transforms a N×2 (or homogeneous N×3) array of viewport coordinates with a single matmul
+        """
+        return self.inverse_viewport_matrix.apply_many(viewport_coords)
+
+    @property
+    def viewport_matrix(self) -> Matrix3x3:
+        self.__update_matrices()
+        return self.__matrix
+
+    @property
+    def inverse_viewport_matrix(self) -> Matrix3x3:
+        self.__update_matrices()
+        return self.__inverse
+
+    def __update_matrices(self):
+        if self.__matrix_version == self.version:
+            return
+        self.__matrix = self.__build_viewport_matrix()
+        self.__inverse = self.__matrix.inverse()
+        self.__matrix_version = self.version
 
     def __build_viewport_matrix(self) -> Matrix3x3:
         world_dim = self.w_max - self.w_min
@@ -37,7 +106,4 @@ class Window:
                     viewport_dim.y / world_dim.y)
         t = Vector2((self.vp.vp_min.x - self.w_min.x)
                     * s.x, (self.vp.vp_min.y - self.w_min.y) * s.y)
-        transformation = Matrix3x3()
-        transformation.scale(s)
-        transformation.translate(t)
-        return transformation
+        return Matrix3x3.from_affine(s.x, 0.0, 0.0, s.y, t.x, t.y)
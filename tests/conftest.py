@@ -0,0 +1,18 @@
+import os
+import sys
+import pyglet
+import pytest
+
+pyglet.options['headless'] = True
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+
+@pytest.fixture(scope='session')
+def gl_window():
+    """
+    Hidden window whose context the tests that draw share, only one headless window works per process
+    """
+    window = pyglet.window.Window(800, 600, visible=False)
+    yield window
+    window.close()
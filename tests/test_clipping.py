@@ -0,0 +1,50 @@
+import numpy as np
+from clipping import clip_polygon_edges, clip_polygons, clip_segments, polygon_edges
+
+region = (-50.0, -50.0, 50.0, 50.0)
+
+
+def test_clip_segments():
+    segments = np.array([[[-100, 0], [100, 0]], [[0, 0], [10, 10]], [[60, 60], [70, 70]]], dtype=np.float64)
+    clipped, visible = clip_segments(segments, region)
+    assert visible.tolist() == [True, True, False]
+    assert clipped[0].tolist() == [[-50, 0], [50, 0]]
+    assert clipped[1].tolist() == [[0, 0], [10, 10]]
+
+
+def test_polygon_edges_close_every_polygon():
+    vertices = np.array([[0, 0], [1, 0], [1, 1], [5, 5], [6, 5], [6, 6]], dtype=np.float64)
+    edges = polygon_edges(vertices, np.array([3, 3]))
+    assert edges[0].tolist() == [[1, 1], [0, 0]]
+    assert edges[3].tolist() == [[6, 6], [5, 5]]
+
+
+def test_clip_polygons_keeps_inside_polygons_and_drops_outside_ones():
+    inside = [[0, 0], [10, 0], [10, 10]]
+    outside = [[100, 100], [110, 100], [110, 110]]
+    vertices, lengths = clip_polygons(np.array(inside + outside, dtype=np.float64), np.array([3, 3]), region)
+    assert lengths.tolist() == [3, 0]
+    assert vertices.tolist() == inside
+
+
+def test_clip_polygons_cuts_at_the_border():
+    square = np.array([[-100, -100], [100, -100], [100, 100], [-100, 100]], dtype=np.float64)
+    vertices, lengths = clip_polygons(square, np.array([4]), region)
+    assert lengths.tolist() == [4]
+    assert sorted(map(tuple, vertices.tolist())) == [(-50, -50), (-50, 50), (50, -50), (50, 50)]
+
+
+def test_clip_polygon_edges_drops_only_the_edges_clipping_inserted():
+    triangle = np.array([[-80, 0], [0, -80], [0, 0]], dtype=np.float64)
+    edges, counts = clip_polygon_edges(triangle, np.array([3]), region)
+    # every edge is clipped, the two pieces of border that close the clipped polygon are not drawn
+    assert counts.tolist() == [3]
+    assert sorted(sorted(map(tuple, e)) for e in edges.tolist()) == [
+        [(-50, -30), (-30, -50)], [(-50, 0), (0, 0)], [(0, -50), (0, 0)]]
+
+
+def test_clip_polygon_edges_keeps_original_edges_on_the_border():
+    triangle = np.array([[-50, -50], [0, -50], [0, 0]], dtype=np.float64)
+    edges, counts = clip_polygon_edges(triangle, np.array([3]), region)
+    assert counts.tolist() == [3]
+    assert len(edges) == 3
@@ -0,0 +1,62 @@
+import gc
+import sys
+import pytest
+import numpy as np
+import drawable
+import picking
+from drawable import Line, ObjectRenderer, Point, Wireframe, create_drawables
+from event_system import EventSystem
+from igs_math import Vector2
+from viewport import Viewport
+from window import Window
+
+
+def test_invalid_wireframe_is_collected_quietly(monkeypatch, capfd):
+    unraisable = []
+    monkeypatch.setattr(sys, 'unraisablehook', unraisable.append)
+    with pytest.raises(RuntimeError):
+        Wireframe([Vector2(0, 0), Vector2(1, 1)], 'w')
+    gc.collect()
+    assert unraisable == []
+    assert capfd.readouterr().err == ''
+
+
+def test_sync_transform_writes_the_geometry_buffer():
+    wireframe = Wireframe([Vector2(0, 0), Vector2(10, 0), Vector2(10, 10)])
+    buffer = wireframe.geometry_buffer
+    wireframe.position = Vector2(5, -5)
+    assert (buffer.transformed(wireframe.slot) == wireframe.vertices).all()
+    wireframe.sync_transform()
+    assert (buffer.transformed(wireframe.slot) == wireframe.world_vertices).all()
+
+
+def test_create_drawables_checks_kinds_against_lengths():
+    vertices = np.zeros((3, 2))
+    for kinds, lengths in (([2], [2]), ([1], [3]), ([0], [2]), ([3], [3]), ([0, 0], [3])):
+        with pytest.raises(ValueError):
+            create_drawables(np.array(kinds), vertices[:sum(lengths)], np.array(lengths))
+    point, line = create_drawables(np.array([0, 1]), vertices, np.array([1, 2]))
+    assert (type(point), type(line)) == (Point, Line)
+
+
+def test_pick_after_a_move_returns_the_moved_object(monkeypatch):
+    window = Window(Vector2(-400, -300), Vector2(400, 300), Viewport(Vector2(0, 0), Vector2(800, 600)))
+    renderer = ObjectRenderer(window, EventSystem())
+    points = [Point(Vector2(x, y)) for x in range(-290, 300, 20) for y in range(-190, 200, 20)]
+    renderer.add_many(points)
+    square = Wireframe([Vector2(-5, -5), Vector2(5, -5), Vector2(5, 5), Vector2(-5, 5)])
+    renderer.addObject(square)
+    assert renderer.pick(window.world_to_viewport(Vector2(-5, 0))) is square
+    built = []
+    monkeypatch.setattr(drawable, 'SegmentBVH', lambda segments, owners: built.append(len(segments)) or
+                        picking.SegmentBVH(segments, owners))
+
+    square.position = Vector2(200, 100)
+    assert renderer.pick(window.world_to_viewport(Vector2(205, 100))) is square
+    assert renderer.pick(window.world_to_viewport(Vector2(-5, 0))) is None
+    # only the moved wireframe was indexed again
+    assert built == [4]
+
+    renderer.removeObject(square)
+    assert renderer.pick(window.world_to_viewport(Vector2(205, 100))) is None
+    assert renderer.pick(window.world_to_viewport(Vector2(10, 10))) is points[15 * 20 + 10]
@@ -0,0 +1,90 @@
+from event_system import Event, EventSystem
+from igs_math import Vector2
+
+
+def recording(events: EventSystem, *kinds: Event) -> list:
+    log = []
+    for kind in kinds:
+        events.register_callback(kind, lambda *args, kind=kind: log.append((kind, args)))
+    return log
+
+
+def test_immediate_mode_dispatches_on_fire():
+    events = EventSystem()
+    log = recording(events, Event.ZOOM_WINDOW)
+    events.fire(Event.ZOOM_WINDOW, 1.0)
+    assert log == [(Event.ZOOM_WINDOW, (1.0,))]
+    events.drain()
+    assert len(log) == 1
+
+
+def test_coalesced_events_keep_their_first_position():
+    events = EventSystem(queued=True)
+    log = recording(events, Event.MOUSE_MOVE, Event.ZOOM_WINDOW, Event.ADD_DRAWABLE)
+    events.fire(Event.ZOOM_WINDOW, 1.0)
+    events.fire(Event.ADD_DRAWABLE, 'a')
+    events.fire(Event.MOUSE_MOVE, Vector2(1, 1), Vector2(1, 1))
+    events.fire(Event.ZOOM_WINDOW, 2.0)
+    events.fire(Event.ADD_DRAWABLE, 'b')
+    events.fire(Event.MOUSE_MOVE, Vector2(3, 4), Vector2(2, 3))
+    assert log == []
+    events.drain()
+    assert [(kind, args[0]) for kind, args in log if kind != Event.MOUSE_MOVE] == [
+        (Event.ZOOM_WINDOW, 3.0), (Event.ADD_DRAWABLE, 'a'), (Event.ADD_DRAWABLE, 'b')]
+    assert [kind for kind, _ in log] == [
+        Event.ZOOM_WINDOW, Event.ADD_DRAWABLE, Event.MOUSE_MOVE, Event.ADD_DRAWABLE]
+    position, delta = log[2][1]
+    assert (position.x, position.y, delta.x, delta.y) == (3, 4, 3, 4)
+
+
+def test_moves_and_zooms_add_up():
+    events = EventSystem(queued=True)
+    log = recording(events, Event.MOVE_WINDOW, Event.ZOOM_WINDOW)
+    for step in (Vector2(1, 2), Vector2(-3, 5), Vector2(0.5, 0)):
+        events.fire(Event.MOVE_WINDOW, step)
+    for zoom in (0.1, 0.2, -0.05):
+        events.fire(Event.ZOOM_WINDOW, zoom)
+    events.drain()
+    (move_kind, (move,)), (zoom_kind, (zoom,)) = log
+    assert (move_kind, zoom_kind) == (Event.MOVE_WINDOW, Event.ZOOM_WINDOW)
+    assert (move.x, move.y) == (-1.5, 7)
+    assert abs(zoom - 0.25) < 1e-12
+
+
+def test_keyword_arguments_are_never_merged():
+    events = EventSystem(queued=True)
+    log = []
+    events.register_callback(Event.ZOOM_WINDOW, lambda *args, **kwargs: log.append((args, kwargs)))
+    events.fire(Event.ZOOM_WINDOW, 1.0)
+    events.fire(Event.ZOOM_WINDOW, amount=2.0)
+    events.post(Event.ZOOM_WINDOW, 3.0)
+    assert log == []
+    events.drain()
+    assert log == [((4.0,), {}), ((), {'amount': 2.0})]
+
+
+def test_events_fired_while_draining_are_dispatched_in_the_same_drain():
+    events = EventSystem(queued=True)
+    log = recording(events, Event.ADD_DRAWABLE, Event.DRAWABLE_ADDED, Event.ZOOM_WINDOW)
+
+    def added(name):
+        events.fire(Event.DRAWABLE_ADDED, name)
+        events.fire(Event.ZOOM_WINDOW, 10.0)
+    events.register_callback(Event.ADD_DRAWABLE, added)
+    events.fire(Event.ZOOM_WINDOW, 1.0)
+    events.fire(Event.ADD_DRAWABLE, 'a')
+    events.fire(Event.ADD_DRAWABLE, 'b')
+    events.drain()
+    # the zoom queued before the drain was already dispatched, the ones fired from the callbacks are merged together
+    # into a new entry behind the events they came with
+    assert log == [
+        (Event.ZOOM_WINDOW, (1.0,)),
+        (Event.ADD_DRAWABLE, ('a',)),
+        (Event.ADD_DRAWABLE, ('b',)),
+        (Event.DRAWABLE_ADDED, ('a',)),
+        (Event.ZOOM_WINDOW, (20.0,)),
+        (Event.DRAWABLE_ADDED, ('b',)),
+    ]
+    log.clear()
+    events.drain()
+    assert log == []
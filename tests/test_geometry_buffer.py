@@ -0,0 +1,56 @@
+import numpy as np
+from geometry_buffer import GeometryBuffer
+
+
+def test_allocate_and_free_reuse_slots():
+    buffer = GeometryBuffer(vertex_capacity=2, slot_capacity=1)
+    first = buffer.allocate(np.array([[0, 0], [1, 1]]))
+    second = buffer.allocate(np.array([[2, 2], [3, 3], [4, 4]]))
+    assert buffer.vertices(second).tolist() == [[2, 2], [3, 3], [4, 4]]
+    assert (buffer.slot_count, buffer.vertex_count) == (2, 5)
+    buffer.free(first)
+    buffer.free(first)
+    assert (buffer.slot_count, buffer.vertex_count) == (1, 3)
+    assert buffer.allocate(np.array([[5, 5]])) == first
+    assert buffer.vertices(first).tolist() == [[5, 5]]
+
+
+def test_allocate_many_and_transforms():
+    buffer = GeometryBuffer()
+    slots = buffer.allocate_many(np.arange(12, dtype=np.float64).reshape(6, 2), np.array([1, 2, 3]))
+    assert [buffer.length(s) for s in slots.tolist()] == [1, 2, 3]
+    translation = np.eye(3)
+    translation[2, :2] = (10, 20)
+    buffer.set_transform(int(slots[1]), translation)
+    assert buffer.transformed(int(slots[1])).tolist() == [[12, 23], [14, 25]]
+    vertices, lengths = buffer.transformed_many(slots[::-1])
+    assert lengths.tolist() == [3, 2, 1]
+    assert vertices.tolist() == [[6, 7], [8, 9], [10, 11], [12, 23], [14, 25], [0, 1]]
+
+
+def test_compaction_keeps_slots_valid():
+    rng = np.random.default_rng(0)
+    buffer = GeometryBuffer(vertex_capacity=16)
+    expected = dict()
+    for _ in range(200):
+        vertices = rng.uniform(-1, 1, (int(rng.integers(1, 50)), 2))
+        expected[buffer.allocate(vertices)] = vertices
+    for slot in list(expected)[::2]:
+        buffer.free(slot)
+        del expected[slot]
+    buffer.compact()
+    assert buffer.vertex_count == sum(len(v) for v in expected.values())
+    for slot, vertices in expected.items():
+        assert (buffer.vertices(slot) == vertices).all()
+
+
+def test_freeing_most_of_a_large_buffer_compacts_it():
+    buffer = GeometryBuffer()
+    slots = buffer.allocate_many(np.zeros((10 * GeometryBuffer.min_compaction_size, 2)),
+                                 np.full(10, GeometryBuffer.min_compaction_size))
+    kept = int(slots[-1])
+    buffer.vertices(kept)[:] = 7
+    for slot in slots[:-1].tolist():
+        buffer.free(slot)
+    assert buffer.vertex_count == GeometryBuffer.min_compaction_size
+    assert (buffer.vertices(kept) == 7).all()
@@ -0,0 +1,126 @@
+import gc
+import numpy as np
+import pytest
+import pyglet.window.key as key
+from drawable import DrawableObject, ObjectRenderer, Point, Wireframe
+from event_system import Event, EventSystem
+from history import Change, History
+from igs_math import Vector2
+from peripheral_manager import PeripheralManager
+from systems.history_system import HistorySystem
+from systems.selection_system import SelectionSystem
+from viewport import Viewport
+from window import Window
+
+
+def square() -> Wireframe:
+    return Wireframe([Vector2(0, 0), Vector2(10, 0), Vector2(10, 10), Vector2(0, 10)])
+
+
+def test_undo_and_redo_walk_the_log():
+    history = History()
+    drawables = [square(), square()]
+    history.record_add(drawables)
+    history.record_transform(drawables[0], (Vector2(0, 0), 0.0, Vector2(1, 1)), (Vector2(5, 0), 0.0, Vector2(1, 1)))
+    history.record_remove(drawables[1:])
+    assert [history.undo().change for _ in range(3)] == [Change.REMOVE, Change.TRANSFORM, Change.ADD]
+    assert history.undo() is None
+    assert history.redo().drawables == tuple(drawables)
+    assert history.can_redo
+    history.record_remove(drawables[:1])
+    assert not history.can_redo
+    assert len(history) == 2
+
+
+def test_size_counts_the_geometry_kept_alive():
+    history = History()
+    history.record_add([square()])
+    assert history.nbytes == History.drawable_size + 4 * History.vertex_size
+    history.record_add([])
+    assert len(history) == 1
+
+
+def test_oldest_entries_are_evicted_over_budget():
+    entry = History.drawable_size + 4 * History.vertex_size
+    history = History(max_bytes=3 * entry)
+    drawables = [square() for _ in range(5)]
+    for drawable in drawables:
+        history.record_add([drawable])
+    assert len(history) == 3
+    assert history.nbytes == 3 * entry
+    assert [history.undo().drawables[0] for _ in range(3)] == drawables[:1:-1]
+    history.max_bytes = entry
+    # the redo entries farthest from the present go first
+    assert len(history) == 1
+    assert history.redo().drawables[0] == drawables[2]
+
+
+def test_evicted_entries_free_their_geometry():
+    history = History()
+    gc.collect()
+    slots = DrawableObject.geometry_buffer.slot_count
+    history.record_remove([square() for _ in range(10)])
+    gc.collect()
+    assert DrawableObject.geometry_buffer.slot_count == slots + 10
+    history.max_bytes = 0
+    gc.collect()
+    assert DrawableObject.geometry_buffer.slot_count == slots
+
+
+@pytest.fixture
+def scene():
+    events = EventSystem(queued=True)
+    keys = PeripheralManager()
+    window = Window(Vector2(-400, -300), Vector2(400, 300), Viewport(Vector2(0, 0), Vector2(800, 600)))
+    renderer = ObjectRenderer(window, events)
+    history = HistorySystem(keys, PeripheralManager(), events, renderer)
+    selection = SelectionSystem(keys, PeripheralManager(), events, renderer)
+    return events, keys, renderer, history, selection
+
+
+def test_keys_undo_and_redo_scene_changes(scene):
+    events, keys, renderer, history, selection = scene
+    wireframe = square()
+    events.fire(Event.ADD_DRAWABLE, wireframe)
+    events.drain()
+    renderer.selected = wireframe
+    selection.move_selected(Vector2(1, 0))
+    selection.rotate_selected(1.0)
+    events.drain()
+    assert len(history.history) == 3
+
+    keys.fire(key.Z, key.MOD_CTRL, True)
+    keys.fire(key.Z, key.MOD_CTRL, True)
+    events.drain()
+    position, rotation, _ = wireframe.trs
+    assert (position.x, position.y, rotation) == (0, 0, 0)
+    keys.fire(key.Z, key.MOD_CTRL, True)
+    events.drain()
+    assert len(renderer) == 0
+    keys.fire(key.Y, key.MOD_CTRL, True)
+    keys.fire(key.Z, key.MOD_CTRL | key.MOD_SHIFT, True)
+    events.drain()
+    assert len(renderer) == 1
+    assert wireframe.position.x == SelectionSystem.move_step
+    # the changes made by undo and redo were not recorded as new ones
+    assert len(history.history) == 3
+    assert history.history.can_redo
+
+
+def test_batches_undo_as_one_change(scene):
+    events, _, renderer, history, _ = scene
+    points = [Point(Vector2(x, y)) for x, y in np.random.default_rng(4).uniform(-400, 400, (1000, 2)).tolist()]
+    renderer.add_many(points)
+    renderer.remove_many(points[:500])
+    events.drain()
+    history.undo()
+    events.drain()
+    assert len(renderer) == 1000
+    history.undo()
+    events.drain()
+    assert len(renderer) == 0
+    history.redo()
+    history.redo()
+    events.drain()
+    assert len(renderer) == 500
+    assert not history.history.can_redo
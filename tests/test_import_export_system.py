@@ -0,0 +1,72 @@
+import gc
+import time
+import pytest
+from drawable import ObjectRenderer
+from event_system import Event, EventSystem
+from igs_math import Vector2
+from peripheral_manager import PeripheralManager
+from systems.import_export_system import ImportExportSystem
+from viewport import Viewport
+from window import Window
+
+
+@pytest.fixture
+def system():
+    events = EventSystem()
+    window = Window(Vector2(-400, -300), Vector2(400, 300), Viewport(Vector2(0, 0), Vector2(800, 600)))
+    renderer = ObjectRenderer(window, events)
+    system = ImportExportSystem(PeripheralManager(), PeripheralManager(), events, renderer)
+    errors, progress = [], []
+    events.register_callback(Event.SHOW_ERROR, errors.append)
+    events.register_callback(Event.TRANSFER_PROGRESS, progress.append)
+    yield events, renderer, system, errors, progress
+    gc.enable()
+
+
+def finish(system: ImportExportSystem, progress: list):
+    deadline = time.monotonic() + 10
+    while not (progress and progress[-1].finished):
+        assert time.monotonic() < deadline
+        system.update(0.0)
+        time.sleep(0.001)
+
+
+def test_transfers_leave_the_collector_alone(system, tmp_path, monkeypatch):
+    events, renderer, import_export, errors, progress = system
+    freezes = []
+    monkeypatch.setattr(gc, 'freeze', lambda: freezes.append(None))
+    path = tmp_path / 'scene.csv'
+    path.write_text('a, 0, 0\nb, 0, 0, 1, 1\n0, 0, 1, 0, 1, 1\n')
+    events.fire(Event.IMPORT_FILE, str(path))
+    assert gc.isenabled()
+    finish(import_export, progress)
+    assert gc.isenabled()
+    assert len(renderer) == 3
+    assert errors == []
+
+    progress.clear()
+    events.fire(Event.EXPORT_FILE, str(tmp_path / 'out.csv'))
+    finish(import_export, progress)
+    assert gc.isenabled()
+    assert freezes == []
+    assert (tmp_path / 'out.csv').read_text().count('\n') == 3
+
+
+def test_import_keeps_a_disabled_collector_disabled(system, tmp_path):
+    events, _, import_export, _, progress = system
+    path = tmp_path / 'scene.csv'
+    path.write_text('0, 0\n')
+    gc.disable()
+    events.fire(Event.IMPORT_FILE, str(path))
+    finish(import_export, progress)
+    assert not gc.isenabled()
+
+
+def test_failures_and_busy_requests_are_reported(system, tmp_path):
+    events, _, import_export, errors, progress = system
+    events.fire(Event.IMPORT_FILE, str(tmp_path / 'missing.csv'))
+    events.fire(Event.EXPORT_FILE, str(tmp_path / 'out.csv'))
+    finish(import_export, progress)
+    assert len(errors) == 2
+    assert 'already running' in errors[0]
+    assert errors[1].startswith('Transfer failed')
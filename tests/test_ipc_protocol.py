@@ -0,0 +1,50 @@
+import uuid
+import numpy as np
+import pytest
+import ipc_protocol
+from event_system import Event
+from igs_math import Vector2
+from ipc_protocol import DrawableBatch, SceneInfo, TransferProgress
+
+
+def test_round_trip():
+    drawable_id = uuid.uuid4()
+    messages = [
+        (Event.REMOVE_DRAWALBE, drawable_id),
+        (Event.MOVE_WINDOW, Vector2(1.5, -2.0)),
+        (Event.SCENE_PUBLISHED, SceneInfo('psm_scene', 42)),
+        (Event.SAVE_SCENE, '/tmp/cena é.igs'),
+        (Event.CANCEL_TRANSFER, None),
+        (Event.TRANSFER_PROGRESS, TransferProgress(0.25, False)),
+        (Event.SHOW_ERROR, 'Could not load the scene: não existe'),
+    ]
+    decoded = ipc_protocol.decode(ipc_protocol.encode(messages))
+    assert [event for event, _ in decoded] == [event for event, _ in messages]
+    assert decoded[0][1] == drawable_id
+    assert (decoded[1][1].x, decoded[1][1].y) == (1.5, -2.0)
+    assert decoded[2:] == messages[2:]
+
+
+def test_batch_round_trip():
+    batch = DrawableBatch(np.array([0, 1, 2], dtype=np.uint8), np.arange(12, dtype=np.float64).reshape(6, 2),
+                          np.array([1, 2, 3]), ['a', None, 'ção'])
+    [(event, decoded)] = ipc_protocol.decode(ipc_protocol.encode([(Event.CREATE_DRAWABLES, batch)]))
+    assert event == Event.CREATE_DRAWABLES
+    assert decoded.kinds.tolist() == [0, 1, 2]
+    assert decoded.lengths.tolist() == [1, 2, 3]
+    assert (decoded.vertices == batch.vertices).all()
+    assert decoded.names == ['a', None, 'ção']
+
+
+def test_rejects_foreign_frames():
+    frame = bytearray(ipc_protocol.encode([(Event.CANCEL_TRANSFER, None)]))
+    with pytest.raises(ValueError):
+        ipc_protocol.decode(b'XX' + bytes(frame[2:]))
+    frame[2] = ipc_protocol.VERSION + 1
+    with pytest.raises(ValueError):
+        ipc_protocol.decode(bytes(frame))
+
+
+def test_events_that_stay_in_one_process_are_not_encoded():
+    with pytest.raises(ValueError):
+        ipc_protocol.encode([(Event.DRAWABLE_ADDED, None)])
@@ -0,0 +1,38 @@
+import numpy as np
+import pytest
+import object_batch
+
+
+def test_parse_text():
+    batch = object_batch.parse_text('house, 0, 0, 10, 0, 10, 10\n\n5, 5\n 1, 1, 2, 2 \n')
+    assert batch.kinds.tolist() == [object_batch.WIREFRAME, object_batch.POINT, object_batch.LINE]
+    assert batch.lengths.tolist() == [3, 1, 2]
+    assert batch.names == ['house', None, None]
+    assert batch.vertices.tolist() == [[0, 0], [10, 0], [10, 10], [5, 5], [1, 1], [2, 2]]
+
+
+def test_parse_text_names_the_bad_line():
+    with pytest.raises(ValueError, match='Line 2'):
+        object_batch.parse_text('1, 2\n3, x\n')
+    with pytest.raises(ValueError, match='Line 1'):
+        object_batch.parse_text('name\n')
+
+
+def test_from_arrays():
+    batch = object_batch.from_arrays(np.zeros((4, 3, 2)))
+    assert batch.lengths.tolist() == [3] * 4
+    assert (batch.kinds == object_batch.WIREFRAME).all()
+    points = object_batch.from_arrays(np.ones((5, 2)), names=list('abcde'))
+    assert (points.kinds == object_batch.POINT).all()
+    assert points.names == list('abcde')
+    mixed = object_batch.from_arrays([np.zeros((1, 2)), np.zeros((2, 2))])
+    assert mixed.lengths.tolist() == [1, 2]
+    with pytest.raises(ValueError):
+        object_batch.from_arrays(np.ones((2, 2)), names=['a'])
+
+
+def test_load(tmp_path):
+    np.save(tmp_path / 'lines.npy', np.zeros((3, 2, 2)))
+    assert object_batch.load(str(tmp_path / 'lines.npy')).lengths.tolist() == [2, 2, 2]
+    (tmp_path / 'points.csv').write_text('1, 2\n3, 4\n')
+    assert object_batch.load(str(tmp_path / 'points.csv')).lengths.tolist() == [1, 1]
@@ -0,0 +1,63 @@
+import numpy as np
+import pytest
+import drawable
+import shaders
+from drawable import Line, ObjectRenderer, Point, Wireframe
+from event_system import EventSystem
+from igs_math import Vector2
+from viewport import Viewport
+from window import Window
+
+
+def make_window() -> Window:
+    return Window(Vector2(-400, -300), Vector2(400, 300), Viewport(Vector2(0, 0), Vector2(800, 600)))
+
+
+@pytest.mark.parametrize('shader_transform', (False, True))
+def test_only_changes_need_a_redraw(gl_window, shader_transform):
+    window = make_window()
+    renderer = ObjectRenderer(window, EventSystem(), shader_transform=shader_transform)
+    line = Line(Vector2(-50, 0), Vector2(50, 20))
+    renderer.add_many([line, Point(Vector2(10, 10))])
+    assert renderer.needs_redraw
+    renderer.draw()
+    assert not renderer.needs_redraw
+    renderer.draw()
+    assert not renderer.needs_redraw
+
+    window.move(Vector2(15, 0))
+    assert renderer.needs_redraw
+    renderer.draw()
+    assert not renderer.needs_redraw
+
+    renderer.addObject(Wireframe([Vector2(0, 0), Vector2(10, 0), Vector2(10, 10)]))
+    assert renderer.needs_redraw
+    renderer.draw()
+    assert not renderer.needs_redraw
+
+    renderer.selected = line
+    assert renderer.needs_redraw
+    renderer.draw()
+    assert not renderer.needs_redraw
+
+    line.position = Vector2(5, 5)
+    assert renderer.needs_redraw
+    renderer.draw()
+    renderer.removeObject(line)
+    assert renderer.needs_redraw
+    renderer.draw()
+    assert not renderer.needs_redraw
+
+
+def test_shader_transform_uses_the_viewport_matrix(gl_window, monkeypatch):
+    programs = []
+    monkeypatch.setattr(drawable, 'create_world_program',
+                        lambda: programs.append(shaders.create_world_program()) or programs[-1])
+    window = make_window()
+    renderer = ObjectRenderer(window, EventSystem(), shader_transform=True)
+    renderer.addObject(Line(Vector2(-50, 0), Vector2(50, 20)))
+    for change in (lambda: None, lambda: window.move(Vector2(30, -10)), lambda: window.zoom(Vector2(0.5, 0.5))):
+        change()
+        renderer.draw()
+        uniform = np.array(programs[0]['world_to_viewport'])
+        assert np.allclose(uniform, window.viewport_matrix.np_mat.ravel())
@@ -0,0 +1,42 @@
+import numpy as np
+from picking import SegmentBVH, point_segment_distances
+
+
+def test_point_segment_distances():
+    segments = np.array([[[0, 0], [10, 0]], [[5, 5], [5, 5]]], dtype=np.float64)
+    assert point_segment_distances(np.array([5.0, 3.0]), segments).tolist() == [3.0, 2.0]
+    assert point_segment_distances(np.array([-3.0, 4.0]), segments)[0] == 5.0
+
+
+def test_nearest_matches_brute_force():
+    rng = np.random.default_rng(1)
+    starts = rng.uniform(-1000, 1000, (5000, 2))
+    segments = np.stack((starts, starts + rng.uniform(-20, 20, (5000, 2))), axis=1)
+    owners = np.arange(5000) // 3
+    bvh = SegmentBVH(segments, owners)
+    assert len(bvh) == 5000
+    for x, y in rng.uniform(-1000, 1000, (200, 2)).tolist():
+        distances = point_segment_distances(np.array([x, y]), segments)
+        closest = int(np.argmin(distances))
+        found = bvh.nearest(x, y, 50.0)
+        if distances[closest] > 50.0:
+            assert found is None
+        else:
+            assert found is not None
+            assert np.isclose(found[1], distances[closest])
+            assert distances[owners == found[0]].min() == distances[closest]
+
+
+def test_nearest_out_of_range():
+    bvh = SegmentBVH(np.array([[[0, 0], [1, 0]]], dtype=np.float64), np.array([0]))
+    assert bvh.nearest(0.5, 0.5, 1.0) == (0, 0.5)
+    assert bvh.nearest(0.5, 5.0, 1.0) is None
+
+
+def test_removed_owners_are_skipped():
+    segments = np.array([[[0, 0], [1, 0]], [[0, 1], [1, 1]]], dtype=np.float64)
+    bvh = SegmentBVH(segments, np.array([0, 1]))
+    bvh.remove(0)
+    assert bvh.nearest(0.5, 0.1, 2.0) == (1, 0.9)
+    bvh.remove(1)
+    assert bvh.nearest(0.5, 0.1, 2.0) is None
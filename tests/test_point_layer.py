@@ -0,0 +1,77 @@
+import random
+import uuid
+import numpy as np
+from point_layer import PointLayer
+
+everywhere = (-1e9, -1e9, 1e9, 1e9)
+
+
+def add(layer: PointLayer, points: dict):
+    ids = list(points)
+    layer.set_many(ids, np.array([points[i] for i in ids], dtype=np.float32),
+                   np.full((len(ids), 4), 255, dtype=np.uint8))
+
+
+def check(layer: PointLayer, points: dict):
+    """
+    The layer holds exactly the expected points, each one where it was last put
+    """
+    assert len(layer) == len(points)
+    assert sorted(layer.query(everywhere)) == sorted(points)
+    for point_id, (x, y) in points.items():
+        assert point_id in layer
+        assert point_id in layer.query((x - 0.25, y - 0.25, x + 0.25, y + 0.25))
+
+
+def test_removals_move_the_last_points_into_the_holes():
+    layer = PointLayer(capacity=2)
+    a, b, c, d, e = ids = [uuid.uuid4() for _ in range(5)]
+    points = {point_id: (float(i), 0.0) for i, point_id in enumerate(ids)}
+    add(layer, points)
+    assert layer.query(everywhere) == ids
+
+    layer.remove(c)
+    del points[c]
+    assert layer.query(everywhere) == [a, b, e, d]
+    check(layer, points)
+
+    layer.remove(d)
+    del points[d]
+    assert layer.query(everywhere) == [a, b, e]
+    check(layer, points)
+
+    # moving the point that filled the hole must find it at its new index
+    points[e] = (10.0, 10.0)
+    add(layer, {e: points[e]})
+    assert layer.query(everywhere) == [a, b, e]
+    check(layer, points)
+
+    layer.remove_many([a, b, a, uuid.uuid4()])
+    del points[a], points[b]
+    assert layer.query(everywhere) == [e]
+    check(layer, points)
+
+    layer.remove(e)
+    assert len(layer) == 0
+    assert e not in layer
+    assert layer.query(everywhere) == []
+    add(layer, {c: (1.0, 1.0)})
+    check(layer, {c: (1.0, 1.0)})
+
+
+def test_random_edits_match_a_dictionary():
+    rng = random.Random(3)
+    layer = PointLayer(capacity=4)
+    points: dict = {}
+    for _ in range(30):
+        new = {uuid.uuid4(): (rng.uniform(-100, 100), rng.uniform(-100, 100)) for _ in range(rng.randrange(20))}
+        moved = {point_id: (rng.uniform(-100, 100), rng.uniform(-100, 100))
+                 for point_id in rng.sample(sorted(points), len(points) // 4)}
+        points.update(new)
+        points.update(moved)
+        add(layer, {**new, **moved})
+        removed = rng.sample(sorted(points), len(points) // 3)
+        for point_id in removed:
+            del points[point_id]
+        layer.remove_many(removed)
+        check(layer, points)
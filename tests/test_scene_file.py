@@ -0,0 +1,74 @@
+import math
+import numpy as np
+import pytest
+import scene_file
+from drawable import Line, ObjectRenderer, Point, Wireframe
+from event_system import Event, EventSystem
+from igs_math import Vector2
+from peripheral_manager import PeripheralManager
+from systems.scene_file_system import SceneFileSystem
+from viewport import Viewport
+from window import Window
+
+
+def test_save_and_load(tmp_path):
+    wireframe = Wireframe([Vector2(0, 0), Vector2(10, 0), Vector2(10, 10), Vector2(0, 10)], 'square')
+    wireframe.position = Vector2(5, 5)
+    wireframe.rotation = math.pi / 2
+    wireframe.scale = Vector2(2, 3)
+    drawables = [Point(Vector2(1, 2), 'point'), Line(Vector2(0, 0), Vector2(3, 4)), wireframe]
+    path = str(tmp_path / 'scene.igs')
+    scene_file.save(path, drawables)
+    loaded = scene_file.load(path)
+    assert [type(d) for d in loaded] == [Point, Line, Wireframe]
+    assert [d.name for d in loaded] == [d.name for d in drawables]
+    for original, copy in zip(drawables, loaded):
+        assert (copy.vertices == original.vertices).all()
+        assert np.allclose(copy.world_vertices, original.world_vertices)
+
+
+def test_load_rejects_other_files(tmp_path):
+    path = tmp_path / 'scene.igs'
+    path.write_bytes(b'not a scene at all, just some bytes')
+    with pytest.raises(ValueError):
+        scene_file.load(str(path))
+
+
+def test_failures_are_reported_to_the_control_window(tmp_path):
+    events = EventSystem()
+    window = Window(Vector2(-400, -300), Vector2(400, 300), Viewport(Vector2(0, 0), Vector2(800, 600)))
+    SceneFileSystem(PeripheralManager(), PeripheralManager(), events, ObjectRenderer(window, events))
+    errors = []
+    events.register_callback(Event.SHOW_ERROR, errors.append)
+    events.fire(Event.LOAD_SCENE, str(tmp_path / 'missing.igs'))
+    events.fire(Event.SAVE_SCENE, str(tmp_path / 'missing' / 'scene.igs'))
+    assert len(errors) == 2
+    assert errors[0].startswith('Could not load the scene')
+    assert errors[1].startswith('Could not save the scene')
+
+
+def test_load_rejects_truncated_files(tmp_path):
+    path = tmp_path / 'scene.igs'
+    scene_file.save(str(path), [Line(Vector2(0, 0), Vector2(3, 4))])
+    data = path.read_bytes()
+    for size in (0, 10, scene_file._header.size + 8, len(data) - 8):
+        path.write_bytes(data[:size])
+        with pytest.raises(ValueError):
+            scene_file.load(str(path))
+
+
+def test_load_rejects_records_that_do_not_match_their_kind(tmp_path):
+    path = tmp_path / 'scene.igs'
+    scene_file.save(str(path), [Wireframe([Vector2(0, 0), Vector2(1, 0), Vector2(1, 1)])])
+    table = np.memmap(path, dtype=scene_file.object_dtype, mode='r+', offset=scene_file._header.size, shape=(1,))
+    table['kind'] = scene_file.KINDS.index(Line)
+    table.flush()
+    del table
+    with pytest.raises(ValueError, match='Line'):
+        scene_file.load(str(path))
+    table = np.memmap(path, dtype=scene_file.object_dtype, mode='r+', offset=scene_file._header.size, shape=(1,))
+    table['kind'] = 7
+    table.flush()
+    del table
+    with pytest.raises(ValueError):
+        scene_file.load(str(path))
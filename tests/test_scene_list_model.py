@@ -0,0 +1,88 @@
+import uuid
+import numpy as np
+import pytest
+from PyQt5.QtCore import QModelIndex, Qt
+from PyQt5.QtWidgets import QApplication
+from scene_list_model import SceneListModel
+from scene_mirror import record_dtype
+
+
+@pytest.fixture(scope='module')
+def app():
+    yield QApplication.instance() or QApplication([])
+
+
+def records(ids: list) -> np.ndarray:
+    table = np.zeros(len(ids), dtype=record_dtype)
+    table['id'] = [object_id.bytes for object_id in ids]
+    table['name'] = [f'object {i}'.encode() for i in range(len(ids))]
+    return table
+
+
+def fetch_all(model: SceneListModel):
+    while model.canFetchMore(QModelIndex()):
+        model.fetchMore(QModelIndex())
+
+
+def check(model: SceneListModel, ids: list):
+    fetch_all(model)
+    assert model.rowCount() == len(model) == len(ids)
+    assert sorted(model.object_id(row) for row in range(len(ids))) == sorted(ids)
+    for object_id in ids:
+        row = model.row(object_id)
+        assert model.object_id(row) == object_id
+        assert model.data(model.index(row), Qt.UserRole) == object_id
+
+
+def test_rows_are_fetched_a_page_at_a_time(app):
+    model = SceneListModel()
+    model.fetch_size = 10
+    ids = [uuid.uuid4() for _ in range(25)]
+    model.resync(records(ids))
+    assert len(model) == 25
+    assert model.rowCount() == 10
+    assert model.canFetchMore(QModelIndex())
+    model.fetchMore(QModelIndex())
+    assert model.rowCount() == 20
+    model.fetchMore(QModelIndex())
+    assert model.rowCount() == 25
+    assert not model.canFetchMore(QModelIndex())
+    assert [model.object_id(row) for row in range(25)] == ids
+    assert model.data(model.index(3)) == 'object 3'
+    assert model.data(model.index(3, 0, model.index(0))) is None
+
+
+def test_resync_inserts_and_removes_rows(app):
+    model = SceneListModel()
+    model.fetch_size = 8
+    inserted, removed = [], []
+    model.rowsInserted.connect(lambda parent, first, last: inserted.append((first, last)))
+    model.rowsRemoved.connect(lambda parent, first, last: removed.append((first, last)))
+    ids = [uuid.uuid4() for _ in range(20)]
+    model.resync(records(ids))
+    assert model.rowCount() == 8
+    assert inserted == [(0, 7)]
+
+    # two runs of stale rows, one inside the fetched rows and one past them, and new objects appended at the end
+    ids = ids[:2] + ids[5:12] + ids[15:] + [uuid.uuid4() for _ in range(3)]
+    model.resync(records(ids))
+    assert removed == [(2, 4)]
+    assert model.rowCount() == 5
+    check(model, ids)
+
+    model.resync(records(ids[::2]))
+    check(model, ids[::2])
+    model.resync(records([]))
+    assert model.rowCount() == len(model) == 0
+    assert not model.canFetchMore(QModelIndex())
+
+
+def test_many_stale_runs_reset_the_model(app):
+    model = SceneListModel()
+    resets = []
+    model.modelReset.connect(lambda: resets.append(None))
+    ids = [uuid.uuid4() for _ in range(4 * model.max_remove_runs)]
+    model.resync(records(ids))
+    model.resync(records(ids[::2]))
+    assert len(resets) == 1
+    check(model, ids[::2])
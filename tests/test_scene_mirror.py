@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+from drawable import Line, Point
+from event_system import Event, EventSystem
+from igs_math import Vector2
+from scene_mirror import SceneMirrorReader, SceneMirrorWriter, record_id, record_name
+
+
+@pytest.fixture
+def mirror():
+    events = EventSystem()
+    writer = SceneMirrorWriter(events, capacity=4)
+    reader = SceneMirrorReader()
+    yield events, writer, reader
+    reader.close()
+    writer.close()
+
+
+def test_snapshot_follows_the_writer(mirror):
+    events, writer, reader = mirror
+    line = Line(Vector2(0, 0), Vector2(10, 5), 'line')
+    point = Point(Vector2(3, 3))
+    events.fire(Event.DRAWABLES_ADDED, [line, point])
+    assert writer.publish()
+    records = reader.snapshot(writer.info)
+    assert [record_id(r) for r in records] == [line.id, point.id]
+    assert record_name(records[0]) == 'line'
+    assert records[0]['bounds'].tolist() == [0, 0, 10, 5]
+    assert reader.snapshot(writer.info) is None
+
+    events.fire(Event.DRAWABLE_REMOVED, line)
+    writer.publish()
+    assert [record_id(r) for r in reader.snapshot(writer.info)] == [point.id]
+
+
+def test_reader_survives_a_segment_that_was_already_replaced(mirror):
+    events, writer, reader = mirror
+    events.fire(Event.DRAWABLE_ADDED, Point(Vector2(0, 0)))
+    writer.publish()
+    assert len(reader.snapshot(writer.info)) == 1
+    events.fire(Event.DRAWABLES_ADDED, [Point(Vector2(i, i)) for i in range(8)])
+    writer.publish()
+    stale = writer.info
+    events.fire(Event.DRAWABLES_ADDED, [Point(Vector2(i, i)) for i in range(8)])
+    writer.publish()
+    assert stale.segment != writer.info.segment
+    # the reader is told about a segment that was grown over and unlinked before it got to it
+    assert reader.snapshot(stale) is None
+    records = reader.snapshot(writer.info)
+    assert len(records) == 17
+    assert np.unique(records['id']).size == 17
@@ -0,0 +1,53 @@
+import numpy as np
+from picking import point_segment_distances
+from simplify import douglas_peucker_importance
+
+
+def douglas_peucker(points: np.ndarray, tolerance: float) -> set[int]:
+    """
+    Plain recursive Douglas–Peucker over the closed polygon, anchored like douglas_peucker_importance
+    """
+    ring = np.concatenate((points, points[:1]))
+    farthest = int(np.argmax(np.hypot(*(points - points[0]).T)))
+    kept = {0, farthest}
+
+    def split(first: int, last: int):
+        if last - first < 2:
+            return
+        segment = np.array([[ring[first], ring[last]]])
+        distances = [point_segment_distances(ring[i], segment)[0] for i in range(first + 1, last)]
+        index = int(np.argmax(distances))
+        if distances[index] > tolerance:
+            kept.add(first + 1 + index)
+            split(first, first + 1 + index)
+            split(first + 1 + index, last)
+
+    split(0, farthest)
+    split(farthest, len(points))
+    return kept
+
+
+def test_small_polygons_keep_every_vertex():
+    assert np.isinf(douglas_peucker_importance(np.array([[0, 0], [1, 0], [1, 1]], dtype=np.float64))).all()
+
+
+def test_importance_matches_douglas_peucker_at_every_tolerance():
+    rng = np.random.default_rng(2)
+    angles = np.sort(rng.uniform(0, 2 * np.pi, 300))
+    radii = 100 + rng.normal(0, 5, 300)
+    points = np.stack((np.cos(angles) * radii, np.sin(angles) * radii), axis=1)
+    importance = douglas_peucker_importance(points)
+    assert np.isinf(importance[0])
+    for tolerance in (0.5, 2.0, 8.0, 40.0):
+        assert set(np.flatnonzero(importance > tolerance).tolist()) == douglas_peucker(points, tolerance)
+
+
+def test_coarser_levels_are_subsets_of_finer_ones():
+    rng = np.random.default_rng(3)
+    points = rng.uniform(-50, 50, (200, 2))
+    importance = douglas_peucker_importance(points)
+    previous = set(range(len(points)))
+    for tolerance in (0.0, 1.0, 4.0, 16.0, 64.0):
+        kept = set(np.flatnonzero(importance > tolerance).tolist())
+        assert kept <= previous
+        previous = kept
@@ -0,0 +1,63 @@
+import random
+from spatial_index import Bounds, SpatialGrid, intersects
+
+
+def random_box(rng: random.Random) -> Bounds:
+    # sizes from a fraction of a cell to more than max_cells_per_item cells, corners often right on cell borders
+    x, y = rng.uniform(-500, 500), rng.uniform(-500, 500)
+    if rng.random() < 0.3:
+        x, y = round(x / 32) * 32, round(y / 32) * 32
+    width, height = rng.choice((0.0, 5.0, 32.0, 70.0, 300.0)), rng.choice((0.0, 5.0, 32.0, 70.0, 300.0))
+    return x, y, x + width, y + height
+
+
+def check(grid: SpatialGrid, boxes: dict, rng: random.Random):
+    assert len(grid) == len(boxes)
+    for _ in range(50):
+        region = random_box(rng)
+        expected = {key for key, box in boxes.items() if intersects(box, region)}
+        assert set(grid.query(region)) == expected
+    everything = grid.query((-1e4, -1e4, 1e4, 1e4))
+    assert everything == {key: f'item {key}' for key in boxes}
+
+
+def test_queries_match_brute_force():
+    rng = random.Random(7)
+    grid = SpatialGrid(cell_size=32.0)
+    boxes: dict = {}
+    for key in range(400):
+        boxes[key] = random_box(rng)
+        grid.insert(key, f'item {key}', boxes[key])
+    check(grid, boxes, rng)
+
+    for key in rng.sample(sorted(boxes), 150):
+        boxes[key] = random_box(rng)
+        grid.insert(key, f'item {key}', boxes[key])
+        assert grid.bounds(key) == boxes[key]
+    check(grid, boxes, rng)
+
+    for key in rng.sample(sorted(boxes), 200):
+        del boxes[key]
+        grid.remove(key)
+        assert key not in grid
+    grid.remove(-1)
+    check(grid, boxes, rng)
+
+    for key in list(boxes):
+        grid.remove(key)
+    assert len(grid) == 0
+    assert grid.query((-1e4, -1e4, 1e4, 1e4)) == {}
+
+
+def test_moving_across_cell_borders_leaves_nothing_behind():
+    grid = SpatialGrid(cell_size=10.0)
+    grid.insert('a', 1, (5, 5, 15, 15))
+    assert set(grid.query((12, 12, 13, 13))) == {'a'}
+    grid.insert('a', 1, (-25, 5, -15, 15))
+    assert grid.query((12, 12, 13, 13)) == {}
+    assert grid.query((0, 0, 10, 10)) == {}
+    assert set(grid.query((-20, 10, -20, 10))) == {'a'}
+    # a box that ends exactly on a border touches the cell after it, queries on the border itself find it
+    grid.insert('b', 2, (0, 0, 10, 10))
+    assert set(grid.query((10, 10, 11, 11))) == {'b'}
+    assert grid.query((10.5, 10.5, 11, 11)) == {}
@@ -0,0 +1,60 @@
+from event_system import EventSystem
+from peripheral_manager import PeripheralManager
+from system import System, SystemManager
+import pyglet
+
+
+class Counter(System):
+
+    tick_rate = 10.0
+
+    def __init__(self):
+        super().__init__(PeripheralManager(), PeripheralManager(), EventSystem())
+        self.ticks = []
+
+    def update(self, dt: float):
+        self.ticks.append(dt)
+
+
+class Callbacks(Counter):
+
+    scheduled = False
+
+
+class FakeTime:
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def advance(clock: pyglet.clock.Clock, time: FakeTime, seconds: float, step: float = 0.01):
+    for _ in range(round(seconds / step)):
+        time.now += step
+        clock.tick()
+
+
+def test_systems_tick_at_their_rate_until_paused():
+    time = FakeTime()
+    clock = pyglet.clock.Clock(time_function=time)
+    counter = Counter()
+    SystemManager(clock=clock).add(counter)
+    advance(clock, time, 1.0)
+    assert 9 <= len(counter.ticks) <= 11
+    counter.pause()
+    ticks = len(counter.ticks)
+    advance(clock, time, 1.0)
+    assert len(counter.ticks) == ticks
+
+
+def test_unscheduled_systems_are_never_put_on_the_clock():
+    time = FakeTime()
+    clock = pyglet.clock.Clock(time_function=time)
+    system = Callbacks()
+    SystemManager(clock=clock).add(system)
+    system.pause()
+    system.resume()
+    advance(clock, time, 1.0)
+    assert system.ticks == []
@@ -0,0 +1,50 @@
+import numpy as np
+import ipc_protocol
+import object_batch
+import text_formats
+from drawable import KINDS
+
+
+def test_kinds_match_between_processes():
+    assert [kind.__name__ for kind in KINDS] == list(ipc_protocol.KINDS)
+
+
+def read(path) -> text_formats.TextChunk:
+    chunks = list(text_formats.read_text(str(path)))
+    return text_formats.TextChunk(np.concatenate([c.kinds for c in chunks]),
+                                  np.concatenate([c.vertices for c in chunks]),
+                                  np.concatenate([c.lengths for c in chunks]),
+                                  sum((c.names for c in chunks), []), chunks[-1].progress)
+
+
+def test_read_csv(tmp_path):
+    path = tmp_path / 'scene.csv'
+    path.write_text('a, 1, 2\n\n0, 0, 3, 4\nsquare, 0, 0, 1, 0, 1, 1, 0, 1\n')
+    chunk = read(path)
+    assert [KINDS[k].__name__ for k in chunk.kinds] == ['Point', 'Line', 'Wireframe']
+    assert chunk.lengths.tolist() == [1, 2, 4]
+    assert chunk.names == ['a', None, 'square']
+    assert chunk.vertices[:3].tolist() == [[1, 2], [0, 0], [3, 4]]
+    assert chunk.progress == 1.0
+
+
+def test_read_obj(tmp_path):
+    path = tmp_path / 'scene.obj'
+    path.write_text('v 0 0 0\nv 1 0 0\nv 1 1 0\no shape\np 1\nl 1 2 3\nl 1 2 3 1\nf -3 -2 -1\n')
+    chunk = read(path)
+    assert [KINDS[k].__name__ for k in chunk.kinds] == ['Point', 'Line', 'Line', 'Wireframe', 'Wireframe']
+    assert chunk.lengths.tolist() == [1, 2, 2, 3, 3]
+    assert chunk.names == ['shape'] * 5
+
+
+def test_written_text_reads_back(tmp_path):
+    batch = object_batch.parse_text('p, 1, 1\nl, 0, 0, 2, 2\nw, 0, 0, 4, 0, 4, 4\n')
+    for extension in ('csv', 'obj'):
+        path = tmp_path / f'scene.{extension}'
+        for _ in text_formats.write_text(str(path), batch.kinds, batch.vertices, batch.lengths, batch.names):
+            pass
+        chunk = read(path)
+        assert chunk.kinds.tolist() == batch.kinds.tolist()
+        assert chunk.lengths.tolist() == batch.lengths.tolist()
+        assert (chunk.vertices == batch.vertices).all()
+        assert chunk.names == batch.names
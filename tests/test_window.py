@@ -0,0 +1,52 @@
+import numpy as np
+from igs_math import Matrix3x3, Vector2
+from viewport import Viewport
+from window import Window
+
+
+def make_window() -> Window:
+    return Window(Vector2(-400, -300), Vector2(400, 300), Viewport(Vector2(0, 0), Vector2(800, 600)))
+
+
+def test_bulk_transform_matches_the_single_point_one():
+    window = make_window()
+    window.zoom(Vector2(50, 50))
+    window.move(Vector2(30, -10))
+    points = np.random.default_rng(5).uniform(-500, 500, (100, 2))
+    many = window.world_to_viewport_many(points)
+    for point, expected in zip(points.tolist(), many.tolist()):
+        single = window.world_to_viewport(Vector2(*point))
+        assert np.allclose((single.x, single.y), expected)
+    assert np.allclose(window.viewport_to_world_many(many), points)
+
+
+def test_window_corners_map_to_the_viewport_corners():
+    window = make_window()
+    corners = window.world_to_viewport_many(np.array([[-400.0, -300.0], [400.0, 300.0]]))
+    assert np.allclose(corners, [[0, 0], [800, 600]])
+
+
+def test_moving_bumps_the_version():
+    window = make_window()
+    version = window.version
+    window.move(Vector2(1, 0))
+    assert window.version != version
+
+
+def test_from_trs_matches_the_step_by_step_transform():
+    translation, rotation, scale = Vector2(10, -4), 0.7, Vector2(2, 0.5)
+    steps = Matrix3x3.identity().scale(scale).rotate(rotation).translate(translation)
+    assert np.allclose(Matrix3x3.from_trs(translation, rotation, scale).np_mat, steps.np_mat)
+
+
+def test_builders_leave_shared_matrices_alone():
+    window = make_window()
+    cached = window.viewport_matrix
+    before = cached.np_mat.copy()
+    inverse = cached.invert()
+    moved = cached.translate(Vector2(5, 5)).rotate(0.3).scale(Vector2(2, 2))
+    assert window.viewport_matrix is cached
+    assert (cached.np_mat == before).all()
+    assert np.allclose(inverse.np_mat, window.inverse_viewport_matrix.np_mat)
+    assert not np.allclose(moved.np_mat, before)
+    assert (Matrix3x3.identity().np_mat == np.eye(3)).all()